@@ -66,7 +66,17 @@ from .process import (
     UnpublishedInfo,
     UUnpublishedInfos,
 )
-from .request import Get, PathRequest, Post, Put, Request, Subscribe, Unsubscribe
+from .request import (
+    BatchGet,
+    BatchPut,
+    Get,
+    PathRequest,
+    Post,
+    Put,
+    Request,
+    Subscribe,
+    Unsubscribe,
+)
 from .response import Delta, Error, Response, Return, Update
 from .stateset import StateSet
 from .table import Table
@@ -1,7 +1,7 @@
 import logging
 import time
 from threading import get_ident as get_thread_ident
-from typing import Any, Callable, Dict, Tuple, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import cothread
 
@@ -25,13 +25,22 @@ class Spawned:
 
     NO_RESULT = object()
 
-    def __init__(self, func: Callable[..., Any], args: Tuple, kwargs: Dict) -> None:
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        args: Tuple,
+        kwargs: Dict,
+        pool: Optional["WorkerPool"] = None,
+    ) -> None:
         self._result_queue = Queue()
         self._result: Union[Any, Exception] = self.NO_RESULT
         self._function = func
         self._args = args
         self._kwargs = kwargs
-        cothread.Spawn(self.catching_function, stack_size=get_stack_size())
+        if pool is None:
+            cothread.Spawn(self.catching_function, stack_size=get_stack_size())
+        else:
+            pool.submit(self)
 
     def catching_function(self):
         try:
@@ -95,3 +104,42 @@ class Queue:
     def put(self, value):
         # In cothread's thread
         self._event_queue.Signal(value)
+
+
+class WorkerPool:
+    """A fixed number of reusable cothreads that run Spawned functions in the
+    order they are submitted. If max_queued are already waiting for a worker
+    then submit() blocks until one is taken. Functions that wait for other
+    submitted functions can deadlock the pool, so only submit independent
+    work like requests from outside the Process"""
+
+    def __init__(self, workers: int, max_queued: int) -> None:
+        assert workers > 0, f"Need at least one worker, got {workers}"
+        self._queue = cothread.EventQueue()
+        # Signalled each time a worker takes something from the queue
+        self._taken = cothread.Pulse()
+        self._max_queued = max_queued
+        self._workers: List[cothread.Spawn] = [
+            cothread.Spawn(self._worker, stack_size=get_stack_size())
+            for _ in range(workers)
+        ]
+
+    def __len__(self) -> int:
+        """The number of Spawned waiting for a worker"""
+        return len(self._queue)
+
+    def _worker(self) -> None:
+        # Iterating stops when the queue is closed and empty
+        for spawned in self._queue:
+            self._taken.Signal(wake_all=False)
+            spawned.catching_function()
+
+    def submit(self, spawned: Spawned) -> None:
+        """Queue spawned to be run by the next free worker"""
+        while len(self._queue) >= self._max_queued:
+            self._taken.Wait()
+        self._queue.Signal(spawned)
+
+    def close(self) -> None:
+        """Let the workers finish what is queued, then exit"""
+        self._queue.close()
@@ -8,7 +8,7 @@ import cothread
 from .concurrency import Queue
 from .errors import AbortedError, BadValueError, TimeoutError
 from .future import Future
-from .request import Post, Put, Request, Subscribe, Unsubscribe
+from .request import BatchGet, BatchPut, Post, Put, Request, Subscribe, Unsubscribe
 from .response import Error, Return, Update
 
 if TYPE_CHECKING:
@@ -137,6 +137,70 @@ class Context:
         future = self._dispatch_request(request)
         return future
 
+    def batch_get(self, mri, fields, timeout=None, event_timeout=None):
+        """Gets many fields of a Block as one consistent set
+
+        Args:
+            mri (str): The mri of the Block
+            fields (list): Dotted paths within the Block, like attr.value
+            timeout (float): time in seconds to wait for responses, wait
+                forever if None
+            event_timeout: maximum time in seconds to wait between each response
+                event, wait forever if None
+
+        Returns:
+            dict: {field: value} for each of the fields
+        """
+        future = self.batch_get_async(mri, fields)
+        self.wait_all_futures(future, timeout=timeout, event_timeout=event_timeout)
+        return future.result()
+
+    def batch_get_async(self, mri, fields):
+        """Gets many fields of a Block and returns immediately
+
+        Args:
+            mri (str): The mri of the Block
+            fields (list): Dotted paths within the Block, like attr.value
+
+        Returns:
+             Future: A single Future which will resolve to {field: value}
+        """
+        request = BatchGet(self._get_next_id(), [mri], fields)
+        request.set_callback(self._q.put)
+        future = self._dispatch_request(request)
+        return future
+
+    def batch_put(self, mri, values, timeout=None, event_timeout=None):
+        """Puts values to many Attributes of a Block and returns when they
+        complete. Nothing is Put if any of the values are invalid
+
+        Args:
+            mri (str): The mri of the Block
+            values (dict): {attribute_name: value} to put
+            timeout (float): time in seconds to wait for responses, wait
+                forever if None
+            event_timeout: maximum time in seconds to wait between each response
+                event, wait forever if None
+        """
+        future = self.batch_put_async(mri, values)
+        self.wait_all_futures(future, timeout=timeout, event_timeout=event_timeout)
+        return future.result()
+
+    def batch_put_async(self, mri, values):
+        """Puts values to many Attributes of a Block and returns immediately
+
+        Args:
+            mri (str): The mri of the Block
+            values (dict): {attribute_name: value} to put
+
+        Returns:
+             Future: A single Future which will resolve when all are Put
+        """
+        request = BatchPut(self._get_next_id(), [mri], values)
+        request.set_callback(self._q.put)
+        future = self._dispatch_request(request)
+        return future
+
     def post(self, path, params=None, timeout=None, event_timeout=None):
         """Synchronously calls a method
 
@@ -351,6 +415,9 @@ class Context:
                     descriptions.append(f"Unsubscribed({path})")
                 else:
                     descriptions.append(f"Subscribe({path})")
+            elif isinstance(request, BatchPut):
+                path = ".".join(request.path)
+                descriptions.append(f"{path}.batch_put({list(request.values)})")
             elif isinstance(request, Post):
                 path = ".".join(request.path)
                 if request.parameters:
@@ -15,7 +15,16 @@ from .info import Info
 from .models import AttributeModel, BlockModel, MethodLog, MethodModel, Model
 from .notifier import Notifier, freeze
 from .part import FieldRegistry, InfoRegistry, Part, PartRegistrar
-from .request import Get, Post, Put, Request, Subscribe, Unsubscribe
+from .request import (
+    BatchGet,
+    BatchPut,
+    Get,
+    Post,
+    Put,
+    Request,
+    Subscribe,
+    Unsubscribe,
+)
 from .response import Response
 from .tags import method_return_unpacked, version_tag
 from .timestamp import TimeStamp
@@ -106,6 +115,16 @@ class Controller(Hookable):
     def changes_squashed(self):
         return self._notifier.changes_squashed
 
+    @property
+    def frozen_hits(self) -> int:
+        """How many times a frozen snapshot of a Model in our Block was reused"""
+        return self._notifier.frozen_hits
+
+    @property
+    def frozen_misses(self) -> int:
+        """How many times a frozen snapshot of a Model in our Block was made"""
+        return self._notifier.frozen_misses
+
     def block_view(self, context: Context = None) -> Block:
         if context is None:
             assert self.process, "No process for context."
@@ -121,10 +140,14 @@ class Controller(Hookable):
             child_view = make_view(self, context, child)
         return child_view
 
-    def handle_request(self, request: Request) -> Spawned:
-        """Spawn a new thread that handles Request"""
+    def handle_request(self, request: Request, external: bool = False) -> Spawned:
+        """Spawn a new thread that handles Request. ServerComms set external
+        for requests from outside the Process, so they can use request workers
+        """
         assert self.process, "No process to handle request"
-        return self.process.spawn(self._handle_request, request)
+        return self.process.spawn_request(
+            self.mri, self._handle_request, request, external=external
+        )
 
     def _handle_request(self, request: Request) -> None:
         responses = []
@@ -139,6 +162,10 @@ class Controller(Hookable):
                 handler = self._notifier.handle_subscribe
             elif isinstance(request, Unsubscribe):
                 handler = self._notifier.handle_unsubscribe
+            elif isinstance(request, BatchGet):
+                handler = self._handle_batch_get
+            elif isinstance(request, BatchPut):
+                handler = self._handle_batch_put
             else:
                 raise UnexpectedError(f"Unexpected request {request}")
             try:
@@ -152,11 +179,11 @@ class Controller(Hookable):
                 self.log.exception(f"Exception notifying {response}")
                 raise
 
-    def _handle_get(self, request: Get) -> CallbackResponses:
+    def _get_data(self, path: List[str]) -> Any:
         """Called with the lock taken"""
         data = self._block
 
-        for i, endpoint in enumerate(request.path[1:]):
+        for i, endpoint in enumerate(path[1:]):
             try:
                 data = data[endpoint]
             except KeyError:
@@ -164,15 +191,31 @@ class Controller(Hookable):
                     typ = data.typeid
                 else:
                     typ = type(data)
-                path = ".".join(request.path[: i + 1])
+                dotted = ".".join(path[: i + 1])
                 raise UnexpectedError(
-                    f"Object '{path}' of type {typ!r} has no attribute '{endpoint}'"
+                    f"Object '{dotted}' of type {typ!r} has no attribute '{endpoint}'"
                 )
+        return data
+
+    def _handle_get(self, request: Get) -> CallbackResponses:
+        """Called with the lock taken"""
+        data = self._get_data(request.path)
         # Important to freeze now with the lock so we get a consistent set
         serialized = freeze(data)
         ret = [request.return_response(serialized)]
         return ret
 
+    def _handle_batch_get(self, request: BatchGet) -> CallbackResponses:
+        """Called with the lock taken"""
+        path = list(request.path)
+        # Freeze them all with the lock so we get a consistent set
+        serialized = OrderedDict()
+        for field in request.fields:
+            data = self._get_data(path + field.split("."))
+            serialized[field] = freeze(data)
+        ret = [request.return_response(serialized)]
+        return ret
+
     def check_field_writeable(self, field):
         if not field.meta.writeable:
             raise NotWriteableError(f"Field {field.path} is not writeable")
@@ -211,6 +254,41 @@ class Controller(Hookable):
         ret = [request.return_response(result)]
         return ret
 
+    def batch_put(self, values: Dict[str, Any]) -> None:
+        """Put validated values to many Attributes, called without the lock"""
+        for attribute_name, value in values.items():
+            put_function = self.get_put_function(attribute_name)
+            put_function(value)
+
+    def _handle_batch_put(self, request: BatchPut) -> CallbackResponses:
+        """Called with the lock taken"""
+        # Check everything before we put anything
+        values = OrderedDict()
+        for attribute_name, value in (request.values or {}).items():
+            try:
+                attribute = self._block[attribute_name]
+            except KeyError:
+                raise FieldError(
+                    f"Block '{self.mri}' has no Attribute '{attribute_name}'"
+                )
+            assert isinstance(
+                attribute, AttributeModel
+            ), f"Cannot Put to {attribute.path} which is a {type(attribute)}"
+            self.check_field_writeable(attribute)
+            values[attribute_name] = attribute.meta.validate(value)
+
+        with self.lock_released:
+            self.batch_put(values)
+
+        if request.get:
+            # Return the current value of everything we put to, don't serialize
+            # here as they are immutable
+            result = OrderedDict((name, self._block[name].value) for name in values)
+        else:
+            result = None
+        ret = [request.return_response(result)]
+        return ret
+
     def get_post_function(self, method_name):
         return self._write_functions[method_name]
 
@@ -106,6 +106,9 @@ class Hook(Generic[T], WithCallTypes):
         self._queue: Union[Queue, None] = None
         self._spawn: Union[Callable[..., Spawned], None] = None
         self.spawned: Union[Spawned, None] = None
+        # When the hooked function started and finished, from time.time()
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
 
     @property
     def name(self):
@@ -144,6 +147,7 @@ class Hook(Generic[T], WithCallTypes):
 
     def _run(self, func: Callable[..., T], kwargs: Dict[str, Any]) -> None:
         result: Union[T, Exception]
+        self.start_time = time.time()
         try:
             result = func(**kwargs)
             result = self.validate_return(result)
@@ -155,6 +159,7 @@ class Hook(Generic[T], WithCallTypes):
                 "%s: %s(**%s) raised exception %s", self.child, func, kwargs, e
             )
             result = e
+        self.end_time = time.time()
         assert self._queue, "No queue to put result"
         self._queue.put((self, result))
 
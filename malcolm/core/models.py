@@ -45,6 +45,8 @@ def check_type(value, typ):
 class Model(Serializable):
     notifier: Union[Notifier, DummyNotifier] = DummyNotifier()
     path: List[str] = []
+    # The result of freeze(self), kept up to date by our notifier
+    _frozen: Optional[FrozenOrderedDict] = None
     __slots__: List[str] = []
 
     def set_notifier_path(
@@ -63,6 +65,8 @@ class Model(Serializable):
         ), f"Already have a notifier {self.notifier} path {self.path}"
         self.notifier = notifier
         self.path = path
+        # Changes are only tracked while attached, so forget any snapshot
+        self._frozen = None
         # Tell all our children too
         for name, ct in self.call_types.items():
             if ct.is_mapping:
@@ -786,6 +790,12 @@ class ChoiceArrayMeta(ChoiceMeta, VArrayMeta):
             # If we have an Array of the right type, start off assuming it's the
             # same
             is_same = value.__class__ is Array and value.typ is self.enum_cls
+            if is_same and self.enum_cls is str:
+                # String choices map to themselves, so just check the set. None
+                # maps to the default choice, so needs the loop below
+                values = set(value.seq)
+                if None not in values and self.choices_lookup.keys() >= values:
+                    return value
             for i, choice in enumerate(value):
                 # Our lookup table contains all the possible values
                 try:
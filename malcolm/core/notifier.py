@@ -33,10 +33,17 @@ def freeze(o):
     # Cheaper than a subclass check, will find Models for us and freeze them
     # into dicts
     if hasattr(o, "notifier"):
-        o = FrozenOrderedDict(
-            (("typeid", o.typeid),)
-            + tuple((k, freeze(getattr(o, k))) for k in o.call_types)
-        )
+        notifier = o.notifier
+        if notifier.__class__ is Notifier:
+            # Attached to a Block, so the Notifier will tell us when it changes
+            frozen = o._frozen
+            if frozen is None:
+                notifier.frozen_misses += 1
+                frozen = o._frozen = _freeze_model(o)
+            else:
+                notifier.frozen_hits += 1
+            return frozen
+        o = _freeze_model(o)
     elif isinstance(o, dict):
         # Recurse down in case there are any models down there
         o = FrozenOrderedDict(tuple((k, freeze(v)) for k, v in o.items()))
@@ -46,6 +53,51 @@ def freeze(o):
     return o
 
 
+def _freeze_model(o):
+    return FrozenOrderedDict(
+        (("typeid", o.typeid),)
+        + tuple((k, freeze(getattr(o, k))) for k in o.call_types)
+    )
+
+
+# Marker in the squash_changes trie for a path that a later change has set
+_SUPERSEDED = object()
+
+
+def squash_changes(changes: List[List]) -> List[List]:
+    """Remove changes that are made redundant by a later change to the same
+    path or to one of its parents, keeping the order of those that remain
+
+    Args:
+        changes (list): [[path, optional data]] in the order they were made
+
+    Returns:
+        list: [[path, optional data]] that still need to be notified
+    """
+    if len(changes) < 2:
+        return changes
+    # Trie of {name: child_trie or _SUPERSEDED}, the None key is the block
+    root: Dict[Any, Any] = {}
+    squashed = []
+    # Walk backwards so the first change we see for any path is the latest
+    for change in reversed(changes):
+        parent, key = root, None
+        for name in change[0]:
+            node = parent.setdefault(key, {})
+            if node is _SUPERSEDED:
+                # A later change set one of our parents
+                break
+            parent, key = node, name
+        else:
+            if parent.get(key) is not _SUPERSEDED:
+                # This is the latest change at this path, and it supersedes
+                # anything set underneath it before now
+                parent[key] = _SUPERSEDED
+                squashed.append(change)
+    squashed.reverse()
+    return squashed
+
+
 class Notifier(Loggable):
     """Object that can service callbacks on given endpoints"""
 
@@ -57,6 +109,9 @@ class Notifier(Loggable):
         self._squashed_count = 0
         self._squashed_changes: List[List] = []
         self._subscription_keys: SubscriptionKeys = {}
+        # How many times freeze() reused or remade a Model's frozen snapshot
+        self.frozen_hits = 0
+        self.frozen_misses = 0
 
     def handle_subscribe(self, request: Subscribe) -> "CallbackResponses":
         """Handle a Subscribe request from outside. Called with lock taken"""
@@ -89,6 +144,7 @@ class Notifier(Loggable):
             data (object): The new data
         """
         assert self._squashed_count, "Called while not squashing changes"
+        self._invalidate_frozen(path)
         self._squashed_changes.append([path[1:], data])
 
     def add_squashed_delete(self, path: List[str]) -> None:
@@ -98,8 +154,27 @@ class Notifier(Loggable):
             path (list): The path of what has changed, relative from Block
         """
         assert self._squashed_count, "Called while not squashing changes"
+        self._invalidate_frozen(path)
         self._squashed_changes.append([path[1:]])
 
+    def _invalidate_frozen(self, path: List[str]) -> None:
+        """Forget the frozen snapshots of every Model that contains path
+
+        Args:
+            path (list): The path of what has changed, relative from Block
+        """
+        data = self._tree.data
+        data._frozen = None
+        for name in path[1:-1]:
+            if isinstance(data, dict):
+                data = data.get(name, None)
+            else:
+                data = getattr(data, name, None)
+            if data is None:
+                break
+            elif hasattr(data, "notifier"):
+                data._frozen = None
+
     def __enter__(self):
         """So we can use this as a context manager for squashing changes"""
         self._lock.acquire()
@@ -113,8 +188,7 @@ class Notifier(Loggable):
             if self._squashed_count == 0:
                 changes = self._squashed_changes
                 self._squashed_changes = []
-                # TODO: squash intermediate deltas here?
-                responses += self._tree.notify_changes(changes)
+                responses += self._tree.notify_changes(squash_changes(changes))
         finally:
             self._lock.release()
             self._callback_responses(responses)
@@ -1,10 +1,11 @@
-from typing import Any, Callable, List, Sequence, Set, TypeVar, Union
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar, Union
 
 from annotypes import Anno, Array
 
 from malcolm.compat import OrderedDict
 
-from .concurrency import Spawned
+from .concurrency import Spawned, WorkerPool
 from .controller import DEFAULT_TIMEOUT, Controller
 from .errors import TimeoutError
 from .hook import AHookable, Hook, start_hooks, wait_hooks
@@ -17,6 +18,13 @@ T = TypeVar("T")
 # Clear spawned handles after how many spawns?
 SPAWN_CLEAR_COUNT = 1000
 
+# How many requests can wait for a worker before handle_request blocks
+REQUEST_QUEUE_SIZE = 1000
+
+# Upper bounds in seconds of each bucket of the request latency histogram,
+# with a final bucket for anything slower
+LATENCY_BUCKETS = (0.001, 0.01, 0.1, 1.0)
+
 # States for how far in start procedure we've got
 STOPPED = 0
 STARTING = 1
@@ -60,10 +68,48 @@ class ProcessStopHook(Hook):
     """Called at stop() to gracefully stop all child controllers"""
 
 
-class Process(Loggable):
-    """Hosts a number of Controllers and provides spawn capabilities"""
+class RequestStats:
+    """Counts of the requests a Controller has been asked to handle"""
+
+    __slots__ = ["queued", "active", "completed", "latencies"]
+
+    def __init__(self) -> None:
+        # Waiting to be run
+        self.queued = 0
+        # Currently running
+        self.active = 0
+        # Finished running, whether they succeeded or not
+        self.completed = 0
+        # Histogram of time from queued to completed, binned by LATENCY_BUCKETS
+        self.latencies = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add_latency(self, latency: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency < bound:
+                break
+        else:
+            i = len(LATENCY_BUCKETS)
+        self.latencies[i] += 1
 
-    def __init__(self, name: str = "Process") -> None:
+
+class Process(Loggable):
+    """Hosts a number of Controllers and provides spawn capabilities
+
+    Args:
+        name: The name of the process for logging
+        request_workers: If non-zero, handle Controller requests from outside
+            the Process on this many reusable workers rather than spawning a
+            new one for each
+        max_queued_requests: When using workers, how many requests can wait
+            for a free worker before handle_request blocks the caller
+    """
+
+    def __init__(
+        self,
+        name: str = "Process",
+        request_workers: int = 0,
+        max_queued_requests: int = REQUEST_QUEUE_SIZE,
+    ) -> None:
         self.set_logger(process_name=name)
         self.name = name
         self._controllers = OrderedDict()  # mri -> Controller
@@ -71,6 +117,10 @@ class Process(Loggable):
         self.state = STOPPED
         self._spawned: List[Spawned] = []
         self._spawn_count = 0
+        self._request_workers = request_workers
+        self._max_queued_requests = max_queued_requests
+        self._request_pool: Optional[WorkerPool] = None
+        self._request_stats: Dict[str, RequestStats] = OrderedDict()
 
     def start(self, timeout=DEFAULT_TIMEOUT):
         """Start the process going
@@ -81,6 +131,10 @@ class Process(Loggable):
         """
         assert self.state == STOPPED, "Process already started"
         self.state = STARTING
+        if self._request_workers:
+            self._request_pool = WorkerPool(
+                self._request_workers, self._max_queued_requests
+            )
         should_publish = self._start_controllers(self._controllers.values(), timeout)
         if should_publish:
             self._publish_controllers(timeout)
@@ -181,6 +235,9 @@ class Process(Loggable):
                 )
                 raise
         self._spawned = []
+        if self._request_pool is not None:
+            self._request_pool.close()
+            self._request_pool = None
         self._controllers = OrderedDict()
         self._unpublished = set()
         self.state = STOPPED
@@ -198,8 +255,65 @@ class Process(Loggable):
             Spawned: Something you can call wait(timeout) on to see when it's
                 finished executing
         """
+        return self._spawn(function, args, kwargs)
+
+    def spawn_request(
+        self,
+        mri: str,
+        function: Callable[..., Any],
+        *args: Any,
+        external: bool = False,
+    ) -> Spawned:
+        """Runs the function to handle a request for a Controller, recording
+        its stats under mri. External requests run on a reusable worker if we
+        have them
+
+        Args:
+            mri: The mri of the Controller handling the request
+            function: Function to run
+            args: Positional arguments to run the function with
+            external: Whether the request came from outside the Process.
+                Requests from inside may be made by something waiting on a
+                worker, so never wait for one themselves
+
+        Returns:
+            Spawned: Something you can call wait(timeout) on to see when it's
+                finished executing
+        """
+        try:
+            stats = self._request_stats[mri]
+        except KeyError:
+            stats = self._request_stats[mri] = RequestStats()
+        queued = time.time()
+        stats.queued += 1
+
+        def handle_request():
+            stats.queued -= 1
+            stats.active += 1
+            try:
+                return function(*args)
+            finally:
+                stats.active -= 1
+                stats.completed += 1
+                stats.add_latency(time.time() - queued)
+
+        pool = self._request_pool if external else None
+        return self._spawn(handle_request, (), {}, pool)
+
+    @property
+    def request_stats(self) -> Dict[str, RequestStats]:
+        """The RequestStats of each Controller that has handled a request"""
+        return self._request_stats
+
+    def _spawn(
+        self,
+        function: Callable[..., Any],
+        args: Sequence,
+        kwargs: Dict[str, Any],
+        pool: WorkerPool = None,
+    ) -> Spawned:
         assert self.state != STOPPED, "Can't spawn when process stopped"
-        spawned = Spawned(function, args, kwargs)
+        spawned = Spawned(function, tuple(args), kwargs, pool)
         self._spawned.append(spawned)
         self._spawn_count += 1
         # Filter out things that are ready to avoid memory leaks
@@ -23,7 +23,12 @@ with Anno("Parameters to use in a method Post"):
     AParameters = Mapping[str, Any]
 with Anno("Notify of differences only"):
     ADifferences = bool
+with Anno("Dotted paths within the Block to get, like attr.value"):
+    AFields = Union[Array[str]]
+with Anno("Values to put to the Attributes of the Block, keyed by their names"):
+    AValues = Mapping[str, Any]
 UPath = Union[APath, Sequence[str], str]
+UFields = Union[AFields, Sequence[str], str]
 
 
 class Request(Serializable):
@@ -147,3 +152,38 @@ class Unsubscribe(Request):
     """Create an Unsubscribe Request object"""
 
     __slots__: List[str] = []
+
+
+@Serializable.register_subclass("malcolm:core/BatchGet:1.0")
+class BatchGet(PathRequest):
+    """Create a BatchGet Request object to Get many fields of a Block at once,
+    returning {field: value}"""
+
+    __slots__ = ["fields"]
+
+    # Allow id to shadow builtin id so id is a key in the serialized dict
+    # noinspection PyShadowingBuiltins
+    def __init__(self, id: AId = 0, path: UPath = None, fields: UFields = ()) -> None:
+        super().__init__(id, path)
+        self.fields = AFields(fields)
+
+
+@Serializable.register_subclass("malcolm:core/BatchPut:1.0")
+class BatchPut(PathRequest):
+    """Create a BatchPut Request object to Put to many Attributes of a Block,
+    validating all of the values before any of them are Put"""
+
+    __slots__ = ["values", "get"]
+
+    # Allow id to shadow builtin id so id is a key in the serialized dict
+    # noinspection PyShadowingBuiltins
+    def __init__(
+        self,
+        id: AId = 0,
+        path: UPath = None,
+        values: AValues = None,
+        get: AGet = False,
+    ) -> None:
+        super().__init__(id, path)
+        self.values = values
+        self.get = get
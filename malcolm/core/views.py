@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
 from malcolm.compat import OrderedDict
 from malcolm.core.models import Model
@@ -51,16 +51,50 @@ def _make_get_property(cls, endpoint):
     setattr(cls, endpoint, make_child_view)
 
 
-def _make_view_subclass(cls, controller, context, data):
-    # Properties can only be set on classes, so make subclass that we can use
-    class ViewSubclass(cls):
-        pass
+def _make_async_method(cls, endpoint):
+    def post_async(self, *args, **kwargs):
+        child: Method = getattr(self, endpoint)
+        return child.post_async(*args, **kwargs)
+
+    setattr(cls, f"{endpoint}_async", post_async)
+
+
+# {(cls, endpoints, method_endpoints): ViewSubclass}
+_view_subclasses: Dict[Tuple, type] = {}
+# Blocks can grow and lose endpoints at runtime, so bound the number of stale
+# endpoint sets we keep classes for
+VIEW_SUBCLASS_CACHE_SIZE = 1000
 
-    for endpoint in data:
-        # make properties for the endpoints we know about
-        _make_get_property(ViewSubclass, endpoint)
 
-    view = ViewSubclass(controller, context, data)
+def _make_view_subclass(cls, controller, context, data):
+    endpoints = tuple(data)
+    if cls is Block:
+        methods = tuple(e for e in endpoints if isinstance(data[e], MethodModel))
+    else:
+        methods = ()
+    # The endpoint set is part of the key, so adding or removing an endpoint
+    # gets a new subclass rather than a stale one
+    key = (cls, endpoints, methods)
+    try:
+        view_subclass = _view_subclasses[key]
+    except KeyError:
+        # Properties can only be set on classes, so make subclass that we can
+        # use, and share it between every view of the same set of endpoints
+        class ViewSubclass(cls):
+            pass
+
+        for endpoint in endpoints:
+            # make properties for the endpoints we know about
+            _make_get_property(ViewSubclass, endpoint)
+        for endpoint in methods:
+            # Add _async versions of method
+            _make_async_method(ViewSubclass, endpoint)
+
+        if len(_view_subclasses) >= VIEW_SUBCLASS_CACHE_SIZE:
+            _view_subclasses.clear()
+        view_subclass = _view_subclasses.setdefault(key, ViewSubclass)
+
+    view = view_subclass(controller, context, data)
     return view
 
 
@@ -141,13 +175,6 @@ class Method(View):
 class Block(View):
     """Object consisting of a number of Attributes and Methods"""
 
-    def __init__(self, controller, context, data):
-        super().__init__(controller, context, data)
-        for endpoint in self._data:
-            if isinstance(data[endpoint], MethodModel):
-                # Add _async versions of method
-                self._make_async_method(endpoint)
-
     def __getattr__(self, item: str) -> View:
         # Get the child of self._data. Needs to be done by the controller to
         # make sure lock is taken and we get consistent data
@@ -158,12 +185,19 @@ class Block(View):
     def mri(self):
         return self._data.path[0]
 
-    def _make_async_method(self, endpoint):
-        def post_async(*args, **kwargs):
-            child: Method = getattr(self, endpoint)
-            return child.post_async(*args, **kwargs)
+    def get_attribute_values(self, attrs, timeout=None):
+        """Get the values of many Attributes as one consistent set
 
-        object.__setattr__(self, f"{endpoint}_async", post_async)
+        Args:
+            attrs (list): The names of the Attributes
+
+        Returns:
+            dict: {attr: value} for each of attrs
+        """
+        values = self._context.batch_get(
+            self.mri, [f"{attr}.value" for attr in attrs], timeout=timeout
+        )
+        return {attr: values[f"{attr}.value"] for attr in attrs}
 
     def put_attribute_values_async(self, params):
         futures = []
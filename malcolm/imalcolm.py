@@ -51,6 +51,13 @@ def parse_args():
         default=False,
     )
     parser.add_argument("--logcfg", help="Logging dict config in JSON or YAML file")
+    parser.add_argument(
+        "--request-workers",
+        help="Handle requests from clients on this many reusable workers rather "
+        "than spawning a new one for each request",
+        type=int,
+        default=0,
+    )
     parser.add_argument(
         "yaml", nargs="?", help="The YAML file containing the blocks to be loaded"
     )
@@ -148,14 +155,14 @@ def prepare_locals(args):
 
     if args.yaml:
         proc_name = os.path.basename(args.yaml).split(".")[-2]
-        proc = Process(proc_name)
+        proc = Process(proc_name, request_workers=args.request_workers)
         controllers, parts = make_include_creator(args.yaml)()
         assert not parts, f"{args.yaml} defines parts"
         for controller in controllers:
             proc.add_controller(controller)
         proc_name = f"{proc_name} - imalcolm"
     else:
-        proc = Process("Process")
+        proc = Process("Process", request_workers=args.request_workers)
         proc_name = "imalcolm"
     # set terminal title
     sys.stdout.write(f"]0;{proc_name}")
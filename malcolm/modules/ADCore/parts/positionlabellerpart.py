@@ -1,5 +1,6 @@
 from typing import Tuple
 
+import numpy as np
 from annotypes import Any, add_call_types
 
 from malcolm.core import PartRegistrar
@@ -11,10 +12,9 @@ from ..util import FRAME_TIMEOUT
 # How big an XML file can the EPICS waveform receive?
 XML_MAX_SIZE = 1000000 - 2
 
-# How many to load each time
+# Load more when the plugin has less than POSITIONS_PER_XML * N_LOAD_AHEAD
+# positions left. Each load has as many positions as will fit in XML_MAX_SIZE
 POSITIONS_PER_XML = 5000
-
-# How far to load ahead
 N_LOAD_AHEAD = 4
 
 
@@ -159,30 +159,33 @@ class PositionLabellerPart(builtin.parts.ChildPart):
                 self.loading = False
 
     def _make_xml(self, start_index: int) -> Tuple[str, int]:
-        # Make xml root
-        xml = '<?xml version="1.0" ?><pos_layout><dimensions>'
-
-        # Make an index for every hdf index
         assert self.generator, "No generator"
-        for i in range(len(self.generator.dimensions)):
-            xml += '<dimension name="d%d" />' % i
-
-        # Add the actual positions
-        xml += "</dimensions><positions>"
-
-        end_index = start_index + POSITIONS_PER_XML
         assert self.generator.size, "Generator is empty"
-        if end_index > self.generator.size:
-            end_index = self.generator.size
-
-        for i in range(start_index, end_index):
-            point = self.generator.get_point(i)
-            xml += "<position"
-            for j, value in enumerate(point.indexes):
-                xml += ' d%d="%s"' % (j, value)
-            xml += " />"
-
-        xml += "</positions></pos_layout>"
+        dimensions = self.generator.dimensions
+
+        # Make xml root with an index for every hdf index
+        header = '<?xml version="1.0" ?><pos_layout><dimensions>'
+        for i in range(len(dimensions)):
+            header += '<dimension name="d%d" />' % i
+        header += "</dimensions><positions>"
+        footer = "</positions></pos_layout>"
+        position = "<position"
+        for j in range(len(dimensions)):
+            position += ' d%d="%%d"' % j
+        position += " />"
+
+        # Fit in as many positions as we can if they were all the biggest
+        biggest = position % tuple(dim.size - 1 for dim in dimensions)
+        space = XML_MAX_SIZE - len(header) - len(footer) - 1
+        n_positions = space // len(biggest)
+        assert n_positions > 0, "Position %s too big" % biggest
+        end_index = min(start_index + n_positions, self.generator.size)
+
+        # Add the actual positions, reshaping as 1D scans give 1D indexes
+        indexes = self.generator.get_points(start_index, end_index).indexes
+        indexes = np.reshape(indexes, (end_index - start_index, len(dimensions)))
+        positions = "".join(position % tuple(row) for row in indexes.tolist())
+        xml = header + positions + footer
         xml_length = len(xml)
         assert xml_length < XML_MAX_SIZE, "XML size %d too big" % xml_length
         return xml, end_index
@@ -1 +1,8 @@
-from . import includes, parts
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import includes, parts
+
+__getattr__, __dir__ = lazy_submodules(__name__, ["includes", "parts"])
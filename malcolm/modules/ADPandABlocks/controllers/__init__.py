@@ -2,6 +2,7 @@
 from malcolm.core import submodule_all
 
 from .pandarunnablecontroller import (
+    AAdaptivePoll,
     AConfigDir,
     ADescription,
     AHostname,
@@ -15,6 +15,7 @@ APollPeriod = pandablocks.controllers.APollPeriod
 ATemplateDesigns = pandablocks.controllers.ATemplateDesigns
 AInitialDesign = pandablocks.controllers.AInitialDesign
 ADescription = pandablocks.controllers.ADescription
+AAdaptivePoll = pandablocks.controllers.AAdaptivePoll
 
 
 class PandAStatefulBlockController(
@@ -39,6 +40,7 @@ class PandARunnableController(
         template_designs: ATemplateDesigns = "",
         initial_design: AInitialDesign = "",
         description: ADescription = "",
+        adaptive_poll: AAdaptivePoll = False,
     ) -> None:
         super().__init__(
             mri=mri,
@@ -49,6 +51,7 @@ class PandARunnableController(
             template_designs=template_designs,
             initial_design=initial_design,
             description=description,
+            adaptive_poll=adaptive_poll,
         )
         self.prefix = prefix
 
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
-
-from malcolm.core import Block, Context, Future
+import time
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
+
+from malcolm.core import Alarm, AlarmSeverity, AlarmStatus, Block, Context, Future
 
 from .util import SequencerRow, SequencerTable, Trigger
 
@@ -26,24 +41,89 @@ SEQ_TABLE_SWITCH_DELAY: int = 6
 # table used by the double buffering system.
 MIN_TABLE_DURATION: float = 15.0
 
+# Number of tables to generate ahead of the ones loaded onto the SEQ blocks
+PREFETCH_TABLES: int = 1
+
+# Minimum time (in seconds) between a table being loaded and the other SEQ block
+# finishing its table. Any less and we risk the sequencer running out of table.
+MIN_REFILL_MARGIN: float = 1.0
+
+# The trigger values a row can have, stored in rows as an index into this
+TRIGGERS: Tuple[str, ...] = tuple(
+    v for k, v in vars(Trigger).items() if not k.startswith("_")
+)
+TRIGGER_INDEXES: Dict[str, int] = {trigger: i for i, trigger in enumerate(TRIGGERS)}
+_TRIGGER_ARRAY = np.array(TRIGGERS, dtype=object)
+
+# The dtype of a row, matching the SequencerTable columns (apart from trigger) so
+# they can be passed straight to it
+SEQ_ROW_DTYPE = np.dtype(
+    [("repeats", np.uint16), ("trigger", np.uint8), ("position", np.int32)]
+    + [("time1", np.uint32)]
+    + [(f"out{out}1", bool) for out in "abcdef"]
+    + [("time2", np.uint32)]
+    + [(f"out{out}2", bool) for out in "abcdef"]
+)
+
+# Shared by empty SequencerRows, they allocate their own when rows are added
+_EMPTY_ROWS = np.empty(0, dtype=SEQ_ROW_DTYPE)
+_SEQ_ROW_FIELDS: Tuple[str, ...] = SequencerRow._fields
+
 T = TypeVar("T", bound="SequencerRows")  # Allows us to return cls from classmethod
 
 
-class SequencerRows:
-    """A class that represents a series of rows for the Sequencer (SEQ) block."""
+def _trigger_index(trigger: str) -> int:
+    try:
+        return TRIGGER_INDEXES[trigger]
+    except KeyError:
+        raise ValueError(f"{trigger!r} is not one of {TRIGGERS}") from None
 
-    def __init__(self, rows: List[SequencerRow] = None) -> None:
-        self._rows: List[SequencerRow] = []
-        self._duration: float = 0
+
+class SequencerRows:
+    """A class that represents a series of rows for the Sequencer (SEQ) block.
+
+    Rows are added to a list of pending tuples, which is moved in one go into a
+    numpy structured array that grows geometrically when the rows are needed.
+    Splitting returns a view of the remaining rows rather than a copy.
+    """
+
+    def __init__(self, rows: Optional[List[SequencerRow]] = None) -> None:
+        # Only the first _len rows of _data are valid, the rest is spare capacity
+        self._data: np.ndarray = _EMPTY_ROWS
+        self._len: int = 0
+        # Rows added after those in _data, with triggers as indexes into TRIGGERS
+        self._pending: List[SequencerRow] = []
+        # Total duration in ticks
+        self._duration: int = 0
 
         if rows:
-            self._rows = rows
-            self._duration = self._calculate_duration(self._rows)
+            self._pending = [
+                row._replace(trigger=_trigger_index(row.trigger)) for row in rows
+            ]
+            self._duration = self._calculate_duration(self._rows())
 
     @classmethod
     def from_tuple_list(cls: Type[T], rows: List[Tuple]) -> T:
         return cls([SequencerRow(*row) for row in rows])
 
+    def _append(self, rows: np.ndarray) -> None:
+        """Append rows to _data, growing it if needed."""
+        required = self._len + len(rows)
+        if required > len(self._data):
+            # Grow geometrically so appending is amortised O(1) per row
+            data = np.empty(max(required, 2 * self._len), dtype=SEQ_ROW_DTYPE)
+            data[: self._len] = self._data[: self._len]
+            self._data = data
+        self._data[self._len : required] = rows
+        self._len = required
+
+    def _rows(self) -> np.ndarray:
+        """Return all our rows as a structured array."""
+        if self._pending:
+            self._append(np.array(self._pending, dtype=SEQ_ROW_DTYPE))
+            self._pending = []
+        return self._data[: self._len]
+
     def add_seq_entry(
         self,
         count=1,
@@ -57,15 +137,17 @@ class SequencerRows:
         """Add a sequencer row with the given settings."""
         complete_rows = count // MAX_REPEATS
         remaining = count % MAX_REPEATS
-
-        row = self._seq_row(
-            MAX_REPEATS, trigger, position, half_duration, live, dead, trim
-        )
-        self._rows.extend([row] * complete_rows)
-        self._rows.append(
+        trigger = _trigger_index(trigger)
+
+        if complete_rows:
+            row = self._seq_row(
+                MAX_REPEATS, trigger, position, half_duration, live, dead, trim
+            )
+            self._pending.extend([row] * complete_rows)
+        self._pending.append(
             self._seq_row(remaining, trigger, position, half_duration, live, dead, trim)
         )
-        self._duration += count * (2 * half_duration - trim)
+        self._duration += int(count * (2 * half_duration - trim))
 
     def split(self, count: int) -> SequencerRows:
         """Truncate this object after `count` rows, and return the remainder.
@@ -73,59 +155,76 @@ class SequencerRows:
         We need the final row of this object to have a count of 1 in order to subtract
         the table switch delay."""
 
-        assert len(self._rows) > 0, "Zero length seq rows should never be split"
+        assert len(self) > 0, "Zero length seq rows should never be split"
 
-        if len(self._rows) >= count:
-            final_row = self._rows[count - 1]
-            if final_row.repeats == 0:  # Final row in continuous loop
-                assert len(self._rows) == count  # Continuous loop always at end
+        data = self._rows()
+        if len(data) >= count:
+            final_repeats = data["repeats"][count - 1]
+            if final_repeats == 0:  # Final row in continuous loop
+                assert len(data) == count  # Continuous loop always at end
                 return SequencerRows()
 
-            if final_row.repeats == 1:
-                remainder = SequencerRows(self._rows[count:])
-                self._rows = self._rows[:count]
-
-            elif final_row.repeats > 1:
-                remainder = SequencerRows(
-                    [final_row._replace(repeats=final_row.repeats - 1)]
-                )
-                remainder.extend(SequencerRows(self._rows[count:]))
-                self._rows = self._rows[: count - 1]
-                self._rows.append(final_row._replace(repeats=1))
+            # Copy the rows we keep so the remainder can be a view of the rest
+            rows = data[:count].copy()
+            if final_repeats == 1:
+                remainder_data = data[count:]
+            else:
+                rows["repeats"][-1] = 1
+                remainder_data = data[count - 1 :]
+                remainder_data["repeats"][0] = final_repeats - 1
         else:
-            remainder = SequencerRows()
-
-            if self._rows[-1].repeats == 0:
-                return remainder
-
-            if self._rows[-1].repeats > 1:
-                final_row = self._rows[-1]
-                self._rows[-1] = final_row._replace(repeats=final_row.repeats - 1)
-                self._rows += [final_row._replace(repeats=1)]
+            remainder_data = data[:0]
+            final_repeats = data["repeats"][-1]
+            if final_repeats == 0:
+                return SequencerRows()
 
-        final_self_row = self._rows[-1]
-        self._rows[-1] = final_self_row._replace(
-            time2=final_self_row.time2 - SEQ_TABLE_SWITCH_DELAY
-        )
-        self._duration -= SEQ_TABLE_SWITCH_DELAY
-        self._duration -= remainder.duration
+            if final_repeats > 1:
+                rows = np.empty(len(data) + 1, dtype=SEQ_ROW_DTYPE)
+                rows[:-1] = data
+                rows[-1] = data[-1]
+                rows["repeats"][-2] = final_repeats - 1
+                rows["repeats"][-1] = 1
+            else:
+                rows = data
+
+        rows["time2"][-1] -= SEQ_TABLE_SWITCH_DELAY
+        duration = self._calculate_duration(rows)
+        remainder = SequencerRows()
+        remainder._data = remainder_data
+        remainder._len = len(remainder_data)
+        remainder._duration = self._duration - SEQ_TABLE_SWITCH_DELAY - duration
+        self._data = rows
+        self._len = len(rows)
+        self._duration = duration
         return remainder
 
     def extend(self, other: SequencerRows) -> None:
         """Extend this object by the given `SequencerRows` object."""
-        self._rows += other._rows
+        if other._len:
+            # Rows in other's array come before its pending ones
+            self._rows()
+            self._append(other._data[: other._len])
+        self._pending += other._pending
         self._duration += other._duration
 
     def get_table(self) -> SequencerTable:
         """Return a `SequencerTable` from this object's rows."""
-        return SequencerTable.from_rows(self._rows)
+        data = self._rows()
+        # Columns already have the right dtypes, copy them so they are contiguous
+        # and don't change if we do
+        columns = {name: data[name].copy() for name in _SEQ_ROW_FIELDS}
+        columns["trigger"] = _TRIGGER_ARRAY[data["trigger"]].tolist()
+        return SequencerTable(**columns)
 
     def as_tuples(self) -> Tuple[Tuple, ...]:
         """Return the sequencer rows as a tuple of tuples.
 
         This is used for comparisons during testing.
         """
-        return tuple(self._rows)
+        return tuple(
+            SequencerRow(row[0], TRIGGERS[row[1]], *row[2:])
+            for row in self._rows().tolist()
+        )
 
     @property
     def duration(self) -> float:
@@ -134,7 +233,7 @@ class SequencerRows:
 
     def __len__(self) -> int:
         """Return the number of Sequencer rows."""
-        return len(self._rows)
+        return self._len + len(self._pending)
 
     @staticmethod
     def _seq_row(
@@ -174,35 +273,89 @@ class SequencerRows:
         )
 
     @staticmethod
-    def _calculate_duration(rows: List[SequencerRow]) -> float:
-        """Return the duration of the given Sequencer rows (in list format)."""
-        duration = 0.0
-        for row in rows:
-            duration += row.repeats * (row.time1 + row.time2)
-
-        return duration
+    def _calculate_duration(rows: np.ndarray) -> int:
+        """Return the duration of the given Sequencer rows (in ticks)."""
+        repeats = rows["repeats"].astype(np.int64)
+        times = rows["time1"].astype(np.int64) + rows["time2"]
+        return int(np.dot(repeats, times))
 
 
 class DoubleBuffer:
-    """A class that uses two Sequencer (SEQ) blocks in a double buffering system."""
+    """A class that uses two Sequencer (SEQ) blocks in a double buffering system.
+
+    Tables are generated ahead of time so that refilling a SEQ block when it goes
+    inactive only needs a put, and the time each refill takes is compared against
+    the duration of the table on the other SEQ block.
+    """
 
-    def __init__(self, context: Context, seq_a: Block, seq_b: Block) -> None:
+    def __init__(
+        self,
+        context: Context,
+        seq_a: Block,
+        seq_b: Block,
+        prefetch: int = PREFETCH_TABLES,
+        report_health: Optional[Callable[[Alarm], None]] = None,
+    ) -> None:
         self._context: Context = context
         # Need to replace Block with Any due to limitations of typing in malcolm core
         self._table_map: Dict[str, Any] = {"seqA": seq_a, "seqB": seq_b}
         self._seq_status: Dict[str, Optional[bool]] = {"seqA": None, "seqB": None}
         self._futures: List[Future] = []
         self._finished: bool = True
-        self._table_gen: Iterator[SequencerTable] = iter(())
+        self._table_gen: Iterator[Tuple[SequencerTable, float]] = iter(())
+        # Tables and their durations generated before they are needed
+        self._prefetch: int = prefetch
+        self._ready: Deque[Tuple[SequencerTable, float]] = deque()
+        # The duration of the table last put to each SEQ block
+        self._table_durations: Dict[str, float] = {"seqA": 0.0, "seqB": 0.0}
+        # (refill_latency, margin) for each table put during the run, where the
+        # latency includes generating the tables for the next refills
+        self.refill_timings: List[Tuple[float, float]] = []
+        # Called with an Alarm if the margin gets too small
+        self._report_health = report_health
+
+    def _fill_table(self, table: str) -> None:
+        """Fill the given Sequencer table with the next table."""
+        if self._ready:
+            seq_table, duration = self._ready.popleft()
+        else:
+            seq_table, duration = next(self._table_gen)
+        self._table_map[table].table.put_value(seq_table)
+        self._table_durations[table] = duration
 
-    def _fill_table(self, table, gen) -> None:
-        """Fill the given Sequencer table using the given generator."""
-        seq_table = self._table_map[table]
-        seq_table.table.put_value(next(gen))
+    def _prefetch_tables(self) -> None:
+        """Generate tables until we have enough ready for the next refills."""
+        while len(self._ready) < self._prefetch:
+            try:
+                self._ready.append(next(self._table_gen))
+            except StopIteration:
+                break
+
+    def _check_refill_margin(self, table: str, latency: float) -> None:
+        """Check the refill of table, and generating the tables after it,
+        finished well before the other SEQ block finished its table."""
+        other = "seqB" if table == "seqA" else "seqA"
+        # The other SEQ block started its table when this one went inactive
+        margin = self._table_durations[other] - latency
+        self.refill_timings.append((latency, margin))
+        if margin < MIN_REFILL_MARGIN:
+            message = (
+                f"Refilling {table} and generating the next tables took "
+                f"{latency:.3f}s, only {margin:.3f}s "
+                f"before {other} finished, risking a sequencer underrun"
+            )
+            logging.warning(message)
+            if self._report_health:
+                self._report_health(
+                    Alarm(AlarmSeverity.MINOR_ALARM, AlarmStatus.DEVICE_STATUS, message)
+                )
 
     @staticmethod
-    def _get_tables(rows_gen: Iterator[SequencerRows]) -> Iterator[SequencerTable]:
-        """Yield a series of SequencerTable objects from the given rows generator.
+    def _get_tables(
+        rows_gen: Iterator[SequencerRows],
+    ) -> Iterator[Tuple[SequencerTable, float]]:
+        """Yield a series of SequencerTable objects and their durations from the
+        given rows generator.
 
         This generator ensures that each SequencerTable can fit onto a SEQ block.
         """
@@ -213,13 +366,13 @@ class DoubleBuffer:
             if rows.duration > MIN_TABLE_DURATION or len(rows) > SEQ_TABLE_ROWS:
                 while True:
                     remainder = rows.split(SEQ_TABLE_ROWS)
-                    yield rows.get_table()
+                    yield rows.get_table(), rows.duration
                     rows = remainder
 
                     if len(rows) <= SEQ_TABLE_ROWS:
                         break
         if len(rows):
-            yield rows.get_table()
+            yield rows.get_table(), rows.duration
 
     def configure(self, rows_generator: Iterator[SequencerRows]) -> None:
         """Configure the double buffer object.
@@ -228,10 +381,11 @@ class DoubleBuffer:
         """
         self.clean_up()
         self._table_gen = self._get_tables(rows_generator)
+        self.refill_timings = []
 
         try:
-            self._fill_table("seqA", self._table_gen)
-            self._fill_table("seqB", self._table_gen)
+            self._fill_table("seqA")
+            self._fill_table("seqB")
         except StopIteration:
             self._finished = True
         else:
@@ -252,17 +406,23 @@ class DoubleBuffer:
                     )
                     table.prescale.put_value(0)
             self._finished = False
+            self._prefetch_tables()
 
     def _seq_active_handler(self, value: bool, table: str = "seqA") -> None:
         """Handler for the SEQ block activation subscription."""
         prev = self._seq_status[table]
         if prev is not None and prev and not value:
             # We only care when the seq is deactivated
+            start = time.time()
             try:
-                self._fill_table(table, self._table_gen)
+                self._fill_table(table)
             except StopIteration:
                 self.clean_up()
                 return
+            # Now get the next table ready while the other SEQ block runs.
+            # This delays the handler for its deactivation, so time it too
+            self._prefetch_tables()
+            self._check_refill_margin(table, time.time() - start)
 
         self._seq_status[table] = value
 
@@ -293,4 +453,5 @@ class DoubleBuffer:
         """Clean up in preparation for the next scan."""
         self._remove_subscriptions()
         self._seq_status = {"seqA": None, "seqB": None}
+        self._ready.clear()
         self._finished = True
@@ -5,7 +5,7 @@ import numpy as np
 from annotypes import Anno, add_call_types
 from scanpointgenerator import CompoundGenerator, Point, Points
 
-from malcolm.core import APartName, Block, Context, PartRegistrar
+from malcolm.core import Alarm, APartName, Block, Context, PartRegistrar
 from malcolm.modules import builtin, pmac, scanning
 from malcolm.modules.pmac.util import MinTurnaround, get_min_turnaround
 
@@ -42,6 +42,8 @@ class SeqTriggers:
         self.trigger_enums: Dict[Tuple[str, bool], str] = trigger_enums
         self.min_turnaround: float = min_turnaround
         self.last_point: Point = None
+        # Turnarounds we have already calculated
+        self.turnaround_cache: pmac.util.TurnaroundCache = {}
 
     @staticmethod
     def _what_moves_most(
@@ -84,11 +86,25 @@ class SeqTriggers:
             point,
             min_turnaround,
             self.min_turnaround.interval,
+            cache=self.turnaround_cache,
         )
         info = self.axis_mapping[axis_name]
-        time_array = time_arrays[info.scannable]
-        velocity_array = velocity_arrays[info.scannable]
+        return self._blind_time(
+            info,
+            time_arrays[info.scannable],
+            velocity_arrays[info.scannable],
+            increasing,
+        )
 
+    @staticmethod
+    def _blind_time(
+        info: pmac.infos.MotorInfo,
+        time_array: List[float],
+        velocity_array: List[float],
+        increasing: bool,
+    ) -> float:
+        """Return the time in the turnaround profile at which the axis stops moving
+        in the opposite direction from that required."""
         # Work backwards through the velocity array until we are going the
         # opposite way
         i = 0
@@ -198,6 +214,134 @@ class SeqTriggers:
 
         return rows
 
+    def _create_triggered_rows_batch(
+        self, points: Points, start_indices: np.ndarray, end_indices: np.ndarray
+    ) -> Iterator[SequencerRows]:
+        """Yield sequencer rows for each of the triggered points rows that start at
+        `start_indices`, after the first row of the scan.
+
+        This gives the same rows as calling `_create_triggered_rows` with add_blind
+        for each row in turn, but works out the values for every row as arrays.
+        """
+        durations = points.duration
+        half_frames = np.rint(durations[start_indices] / TICK / 2).astype(np.int64)
+
+        # Runs of equal durations in the untriggered points of each row
+        untriggered = np.zeros(len(points), dtype=bool)
+        untriggered[start_indices[0] :] = True
+        untriggered[start_indices] = False
+        changes = np.ones(len(points) + 1, dtype=bool)
+        changes[1:-1] = durations[:-1] != durations[1:]
+        changes[1:-1] |= untriggered[:-1] != untriggered[1:]
+        run_starts = np.nonzero(changes[:-1] & untriggered)[0]
+        run_ends = np.nonzero(changes[1:] & untriggered)[0] + 1
+        run_half_frames = np.rint(durations[run_starts] / TICK / 2).astype(np.int64)
+        # The runs in each row are run_starts[row_runs[i]:row_runs[i + 1]]
+        row_runs = np.searchsorted(run_starts, start_indices).tolist()
+        row_runs.append(len(run_starts))
+        immediate_rows = list(
+            zip(
+                (run_ends - run_starts).tolist(),
+                run_half_frames.tolist(),
+            )
+        )
+
+        if self.trigger_enums:
+            triggered_rows = self._position_compare_batch(points, start_indices)
+        else:
+            # Row trigger coming in on BITA, with a dead pulse as soon as the
+            # previous row has finished
+            triggered_rows = [(Trigger.BITA_0, MIN_PULSE, Trigger.BITA_1, 0)] * len(
+                start_indices
+            )
+
+        for i, (half_frame, triggered_row) in enumerate(
+            zip(half_frames.tolist(), triggered_rows)
+        ):
+            blind_trigger, half_blind, trigger, position = triggered_row
+            rows = SequencerRows()
+            rows.add_seq_entry(trigger=blind_trigger, half_duration=half_blind, dead=1)
+            rows.add_seq_entry(
+                trigger=trigger, position=position, half_duration=half_frame, live=1
+            )
+            for count, run_half_frame in immediate_rows[row_runs[i] : row_runs[i + 1]]:
+                rows.add_seq_entry(count, half_duration=run_half_frame, live=1)
+            yield rows
+
+    def _position_compare_batch(
+        self, points: Points, start_indices: np.ndarray
+    ) -> List[Tuple[str, int, str, int]]:
+        """Return (blind_trigger, half_blind, trigger, compare_cts) for each of the
+        position compare rows that start at `start_indices`"""
+        assert self.min_turnaround, "No MinTurnaround assigned"
+        row_points = points[start_indices]
+        # Work out which axis moves most during the first point of each row
+        # [[compare_cts for each row] for each axis]
+        compare_cts = []
+        diffs = []
+        for s, info in self.axis_mapping.items():
+            axis_compare_cts = info.in_cts_array(row_points.lower[s])
+            centre_cts = info.in_cts_array(row_points.positions[s])
+            compare_cts.append(axis_compare_cts)
+            diffs.append(centre_cts - axis_compare_cts)
+        abs_diffs = np.abs(diffs)
+        # Take the first axis with the biggest abs(diff)
+        axis_indices = np.argmax(abs_diffs, axis=0)
+        row_range = np.arange(len(start_indices))
+        not_moving = abs_diffs[axis_indices, row_range] == 0
+        if not_moving.any():
+            point = points[int(start_indices[np.argmax(not_moving)])]
+            raise AssertionError(
+                "Can't work out a compare point for %s, maybe none of the axes "
+                "connected to the PandA are moving during the scan point?"
+                % point.positions
+            )
+        increasing = np.array(diffs)[axis_indices, row_range] > 0
+        positions = np.array(compare_cts)[axis_indices, row_range]
+
+        # The turnaround before each row starts at the last point of the row before
+        last_points = points[start_indices - 1]
+        for d, last_d in (
+            (last_points.positions, self.last_point.positions),
+            (last_points.lower, self.last_point.lower),
+            (last_points.upper, self.last_point.upper),
+        ):
+            for s in self.axis_mapping:
+                d[s][0] = last_d[s]
+        last_points.duration[0] = self.last_point.duration
+        min_times = np.maximum(self.min_turnaround.time, row_points.delay_after)
+        all_profiles = pmac.util.profiles_between_points(
+            self.axis_mapping,
+            last_points,
+            row_points,
+            min_times,
+            self.min_turnaround.interval,
+            self.turnaround_cache,
+        )
+
+        axis_names = list(self.axis_mapping)
+        triggered_rows = []
+        for axis_index, row_increasing, position, (time_arrays, velocity_arrays) in zip(
+            axis_indices.tolist(), increasing.tolist(), positions.tolist(), all_profiles
+        ):
+            axis_name = axis_names[axis_index]
+            info = self.axis_mapping[axis_name]
+            blind = self._blind_time(
+                info,
+                time_arrays[info.scannable],
+                velocity_arrays[info.scannable],
+                row_increasing,
+            )
+            triggered_rows.append(
+                (
+                    Trigger.IMMEDIATE,
+                    int(round(blind / TICK / 2)),
+                    self.trigger_enums[(axis_name, row_increasing)],
+                    position,
+                )
+            )
+        return triggered_rows
+
     @staticmethod
     def _overlapping_points_range(generator, start: int, end: int) -> Iterator[Points]:
         """Yield a series of `Points` objects that cover the given range.
@@ -246,9 +390,11 @@ class SeqTriggers:
                     yield self._create_immediate_rows(points.duration[1:end])
 
                 # Remaining scan rows from the current batch of points.
-                for start_i, end_i in zip(start_indices, end_indices):
-                    yield self._create_triggered_rows(points, start_i, end_i, True)
-                    self.last_point = points[end_i - 1]
+                if start_indices.size:
+                    yield from self._create_triggered_rows_batch(
+                        points, start_indices, end_indices
+                    )
+                    self.last_point = points[int(end_indices[-1]) - 1]
 
         rows = SequencerRows()
         # add one last dead frame signal
@@ -329,6 +475,8 @@ class PandASeqTriggerPart(builtin.parts.ChildPart):
         self.panda: Optional[Any] = None
         # The DoubleBuffer object used to load tables during a scan
         self.db_seq_table: Optional[DoubleBuffer] = None
+        # Whether the DoubleBuffer reported a bad health we need to clear
+        self.health_alarm: bool = False
 
     def setup(self, registrar: PartRegistrar) -> None:
         super().setup(registrar)
@@ -431,6 +579,7 @@ class PandASeqTriggerPart(builtin.parts.ChildPart):
         axesToMove: scanning.hooks.AAxesToMove,
     ) -> None:
         context.unsubscribe_all()
+        self._clear_health()
 
         self.generator = generator
         self.loaded_up_to = completed_steps
@@ -486,11 +635,23 @@ class PandASeqTriggerPart(builtin.parts.ChildPart):
 
         rows_gen = seq_triggers.get_rows(self.loaded_up_to, self.scan_up_to)
 
-        self.db_seq_table = DoubleBuffer(context, seqa, seqb)
+        self.db_seq_table = DoubleBuffer(
+            context, seqa, seqb, report_health=self._report_health
+        )
 
         assert self.db_seq_table, "No DoubleBuffer"
         self.db_seq_table.configure(rows_gen)
 
+    def _report_health(self, alarm: Alarm) -> None:
+        self.health_alarm = not alarm.is_ok()
+        self.registrar.report(builtin.infos.HealthInfo(alarm))
+
+    def _clear_health(self) -> None:
+        # Each configure makes a new DoubleBuffer, so clear any alarm the
+        # last one reported
+        if self.health_alarm:
+            self._report_health(Alarm.ok)
+
     @add_call_types
     def on_pre_run(self, context: scanning.hooks.AContext) -> None:
         assert self.panda, "No PandA"
@@ -512,6 +673,7 @@ class PandASeqTriggerPart(builtin.parts.ChildPart):
     @add_call_types
     def on_reset(self, context: builtin.hooks.AContext) -> None:
         super().on_reset(context)
+        self._clear_health()
         self.on_abort(context)
 
     @add_call_types
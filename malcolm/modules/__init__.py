@@ -0,0 +1,41 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def lazy_submodules(
+    package: str,
+    submodules: Sequence[str],
+    attributes: Optional[Dict[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Make a module level __getattr__ and __dir__ (PEP 562) for a package so
+    its submodules are only imported when they are first accessed
+
+    Args:
+        package: The __name__ of the package
+        submodules: The submodule names that can be accessed as attributes
+        attributes: {name: submodule} of other attributes to get from
+            submodules when they are first accessed
+
+    Returns:
+        tuple: (__getattr__, __dir__) to put in the package's globals
+    """
+    if attributes is None:
+        attributes = {}
+
+    def __getattr__(name: str) -> Any:
+        if name in submodules:
+            # This sets the attribute on the package too
+            return importlib.import_module(f"{package}.{name}")
+        elif name in attributes:
+            submodule = importlib.import_module(f"{package}.{attributes[name]}")
+            value = getattr(submodule, name)
+            setattr(sys.modules[package], name, value)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        names = set(vars(sys.modules[package]))
+        return sorted(names.union(submodules, attributes))
+
+    return __getattr__, __dir__
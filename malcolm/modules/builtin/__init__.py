@@ -1 +1,11 @@
-from . import controllers, defines, hooks, infos, parameters, parts, util
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import controllers, defines, hooks, infos, parameters, parts, util
+
+__getattr__, __dir__ = lazy_submodules(
+    __name__,
+    ["controllers", "defines", "hooks", "infos", "parameters", "parts", "util"],
+)
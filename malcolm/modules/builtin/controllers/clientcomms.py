@@ -25,6 +25,17 @@ class ClientComms(StatefulController):
         """
         raise NotImplementedError(self)
 
+    def send_batch_put(self, mri, values):
+        """Dispatch Puts to many Attributes of a Block to the server. Unless
+        overridden this sends them one at a time
+
+        Args:
+            mri (str): The mri of the Block
+            values (dict): {attribute_name: value} to put
+        """
+        for attribute_name, value in values.items():
+            self.send_put(mri, attribute_name, value)
+
     def send_post(self, mri, method_name, **params):
         """Abstract method to dispatch a Post to the server
 
@@ -1,6 +1,7 @@
+import hashlib
 import os
-import subprocess
-from typing import Dict, List, Sequence, Set
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from annotypes import Anno, add_call_types, deserialize_object, json_decode, json_encode
 
@@ -16,6 +17,7 @@ from malcolm.core import (
     ChoiceMeta,
     Context,
     Delta,
+    Hook,
     Part,
     StringMeta,
     Subscribe,
@@ -58,6 +60,24 @@ AMri = AMri
 ADescription = ADescription
 
 
+# Modification times can be as coarse as a second, so a file changed in the
+# last STAMP_SETTLE_TIME seconds could change again without its stamp changing
+STAMP_SETTLE_TIME = 2.0
+
+
+def _file_stamp(path: str, settled: bool = False) -> Optional[Tuple[int, int]]:
+    """Return something that changes when the file or directory at path does,
+    or None if it doesn't exist, or if settled and it has changed too recently
+    for the stamp to be trusted"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if settled and time.time() - stat.st_mtime < STAMP_SETTLE_TIME:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class ManagerController(StatefulController):
     """RunnableDevice implementer that also exposes GUI for child parts"""
 
@@ -89,6 +109,14 @@ class ManagerController(StatefulController):
         self.part_modified: Dict[Part, PartModifiedInfo] = {}
         # The attributes our part has published
         self.our_config_attributes: Dict[str, AttributeModel] = {}
+        # {part_name: seconds} for how long each part took in the last load
+        self.load_timings: Dict[str, float] = {}
+        # {filename: (settled stamp, sha1 of contents, parsed structure)} for
+        # design files we have loaded
+        self._design_files: Dict[str, Tuple[Any, str, Dict]] = {}
+        # (config dir stamp, design names in it) and the same for templates
+        self._design_names: Tuple[Any, List[str]] = (None, [])
+        self._template_names: Tuple[Any, List[str]] = (None, [])
         # The reportable infos we are listening for
         self.info_registry.add_reportable(PartModifiedInfo, self.update_modified)
         # Update queue of exportable fields
@@ -445,31 +473,81 @@ class ManagerController(StatefulController):
         filename = self._validated_config_filename(design)
         if filename.startswith("/tmp"):
             self.log.warning(f"Saving to tmp directory {filename}")
-        with open(filename, "w") as f:
-            f.write(text)
-        # Run a sync command to make sure we flush this file to disk
-        subprocess.call("sync")
+        if self._design_digest(filename) == hashlib.sha1(text.encode()).hexdigest():
+            # Reading is much cheaper than writing and flushing to disk
+            self.log.debug(f"{self.mri}: {filename} unchanged, not writing")
+        else:
+            with open(filename, "w") as f:
+                f.write(text)
+                # Flush just this file to disk, not the whole host
+                f.flush()
+                os.fsync(f.fileno())
         self._mark_clean(design)
 
     def _set_layout_names(self, extra_name=None):
-        names = [""]
-        dir_name = self._make_config_dir()
-        for f in os.listdir(dir_name):
-            if os.path.isfile(os.path.join(dir_name, f)) and f.endswith(".json"):
-                names.append(f.split(".json")[0])
+        names = [""] + self._list_designs()
         if extra_name and str(extra_name) not in names:
             names.append(str(extra_name))
         names.sort()
-        if os.path.isdir(self.template_designs):
+        for t_name in self._list_template_designs():
+            if t_name not in names:
+                names.append(t_name)
+        self.design.meta.set_choices(names)
+
+    def _list_designs(self) -> List[str]:
+        dir_name = self._make_config_dir()
+        stamp = self._design_names[0]
+        if stamp is None or stamp != _file_stamp(dir_name):
+            # A file may have been added or removed since we last looked
+            stamp = _file_stamp(dir_name, settled=True)
+            names = []
+            for f in os.listdir(dir_name):
+                if os.path.isfile(os.path.join(dir_name, f)) and f.endswith(".json"):
+                    names.append(f.split(".json")[0])
+            self._design_names = (stamp, names)
+        return list(self._design_names[1])
+
+    def _list_template_designs(self) -> List[str]:
+        if not os.path.isdir(self.template_designs):
+            return []
+        stamp = self._template_names[0]
+        if stamp is None or stamp != _file_stamp(self.template_designs):
+            stamp = _file_stamp(self.template_designs, settled=True)
+            names = []
             for f in sorted(os.listdir(self.template_designs)):
                 assert f.startswith("template_") and f.endswith(".json"), (
                     "Template design %s/%s should start with 'template_' "
                     "and end with .json" % (self.template_designs, f)
                 )
-                t_name = f.split(".json")[0]
-                if t_name not in names:
-                    names.append(t_name)
-        self.design.meta.set_choices(names)
+                names.append(f.split(".json")[0])
+            self._template_names = (stamp, names)
+        return list(self._template_names[1])
+
+    def _read_design(self, filename: str) -> Dict[str, Any]:
+        """Return the parsed contents of a design file, only parsing it again
+        if it has changed on disk since we last read it"""
+        cached = self._design_files.get(filename, None)
+        if cached and cached[0] is not None and cached[0] == _file_stamp(filename):
+            return cached[2]
+        stamp = _file_stamp(filename, settled=True)
+        with open(filename, "r") as f:
+            text = f.read()
+        structure = json_decode(text)
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        self._design_files[filename] = (stamp, digest, structure)
+        return structure
+
+    def _design_digest(self, filename: str) -> Optional[str]:
+        """Return the sha1 of the contents of a design file, or None if it
+        doesn't exist"""
+        cached = self._design_files.get(filename, None)
+        if cached and cached[0] is not None and cached[0] == _file_stamp(filename):
+            return cached[1]
+        try:
+            with open(filename, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
 
     def _validated_config_filename(self, name):
         """Make config dir and return full file path and extension
@@ -513,9 +591,7 @@ class ManagerController(StatefulController):
         """
         if design:
             filename = self._validated_config_filename(design)
-            with open(filename, "r") as f:
-                text = f.read()
-            structure = json_decode(text)
+            structure = self._read_design(filename)
         else:
             structure = {}
         # Attributes and Children used to be merged, support this
@@ -536,19 +612,43 @@ class ManagerController(StatefulController):
             source.append(source_name)
             export.append(export_name)
         self.exports.set_value(ExportTable(source, export))
-        # Set other attributes
+        # Set other attributes that need to change
         our_values = {
-            k: v for k, v in attributes.items() if k in self.our_config_attributes
+            k: v
+            for k, v in attributes.items()
+            if k in self.our_config_attributes
+            and self.our_config_attributes[k].value != v
         }
-        block = self.block_view()
-        block.put_attribute_values(our_values)
+        if our_values:
+            block = self.block_view()
+            block.put_attribute_values(our_values)
         # Run the load hook to get parts to load their own structure
-        self.run_hooks(
+        start = time.time()
+        hook_queue, hook_spawned = self.start_hooks(
             LoadHook(p, c, children.get(p.name, {}), init)
             for p, c in self.create_part_contexts(only_visible=False).items()
         )
+        try:
+            self.wait_hooks(hook_queue, hook_spawned)
+        finally:
+            self.update_load_timings(design, time.time() - start, hook_spawned)
         self._mark_clean(design, init)
 
+    def update_load_timings(
+        self, design: str, duration: float, hooks: List[Hook]
+    ) -> None:
+        """Record and log how long each child took to load design"""
+        self.load_timings = OrderedDict()
+        for hook in hooks:
+            if hook.start_time is not None and hook.end_time is not None:
+                part_name = str(hook.child.name)
+                self.load_timings[part_name] = hook.end_time - hook.start_time
+        message = f"{self.mri}: Loaded design {design!r} in {duration:.3f}s"
+        if self.load_timings:
+            took, slowest = max((t, n) for n, t in self.load_timings.items())
+            message += f", slowest child {slowest} took {took:.3f}s"
+        self.log.info(message)
+
     def _mark_clean(self, design, init=False):
         with self.changes_squashed:
             self.saved_visibility = self.layout.value.visible
@@ -55,6 +55,9 @@ class ProxyController(BasicController):
     def get_put_function(self, attribute_name):
         return functools.partial(self.client_comms.send_put, self.mri, attribute_name)
 
+    def batch_put(self, values):
+        self.client_comms.send_batch_put(self.mri, values)
+
     def check_field_writeable(self, field):
         # Let the server do this
         pass
@@ -19,4 +19,4 @@ class ServerComms(StatefulController):
         assert self.process, "No process"
         controller = self.process.get_controller(info.mri)
         # Don't wait for the server to actually handle the request, just return
-        controller.handle_request(info.request)
+        controller.handle_request(info.request, external=True)
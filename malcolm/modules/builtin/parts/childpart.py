@@ -211,35 +211,50 @@ class ChildPart(Part):
         self, context: AContext, structure: AStructure, init: AInit = False
     ) -> None:
         child = context.block_view(self.mri)
-        iterations: Dict[int, Dict[str, Tuple[Attribute, Any]]] = {}
-        for k, v in structure.items():
+        endpoints = set(child)
+        names = []
+        for k in structure:
             if init and k == "design":
                 # At init pop out the design so it doesn't get restored here
                 # This stops child devices (like a detector) getting told to
                 # go to multiple conflicting designs at startup
                 continue
-            try:
-                attr = getattr(child, k)
-            except KeyError:
+            elif k in endpoints:
+                names.append(k)
+            else:
                 self.log.warning(f"Cannot restore non-existant attr {k}")
+        # Get the tags and current values of everything in one go rather than
+        # making a request per attribute
+        fields = context.batch_get(self.mri, names) if names else {}
+        # {iteration: {attr_name: (current_value, saved_value)}}
+        iterations: Dict[int, Dict[str, Tuple[Any, Any]]] = {}
+        for k in names:
+            field = fields[k]
+            tag = get_config_tag(field["meta"]["tags"])
+            if tag and "value" in field:
+                iteration = int(tag.split(":")[1])
+                iterations.setdefault(iteration, {})[k] = (field["value"], structure[k])
             else:
-                tag = get_config_tag(attr.meta.tags)
-                if tag:
-                    iteration = int(tag.split(":")[1])
-                    iterations.setdefault(iteration, {})[k] = (attr, v)
-                else:
-                    self.log.warning(f"Attr {k} is not config tagged, not restoring")
+                self.log.warning(f"Attr {k} is not config tagged, not restoring")
         # Do this first so that any callbacks that happen in the put know
         # not to notify controller
         self.saved_structure = structure
+        put_something = False
         for name, params in sorted(iterations.items()):
+            if put_something:
+                # An earlier iteration may have changed these values, so get
+                # them again
+                values = context.batch_get(self.mri, [f"{k}.value" for k in params])
+                params = {k: (values[f"{k}.value"], v) for k, (_, v) in params.items()}
             # Call each iteration as a separate operation, only putting the
             # ones that need to change
             to_set = {}
-            for k, (attr, v) in params.items():
-                if attr.value != v:
+            for k, (value, v) in params.items():
+                if value != v:
                     to_set[k] = v
-            child.put_attribute_values(to_set)
+            if to_set:
+                child.put_attribute_values(to_set)
+                put_something = True
         if init and "design" in child:
             # We might not have cleared the changes so report here
             self.send_modified_info_if_not_equal("design", child.design.value)
@@ -1,2 +1,20 @@
-from . import parts, util
-from .util import AConfig, AGroup, AMetaDescription, APartName, ASinkPort, AWidget
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import parts, util
+    from .util import AConfig, AGroup, AMetaDescription, APartName, ASinkPort, AWidget
+
+__getattr__, __dir__ = lazy_submodules(
+    __name__,
+    ["parts", "util"],
+    dict(
+        AConfig="util",
+        AGroup="util",
+        AMetaDescription="util",
+        APartName="util",
+        ASinkPort="util",
+        AWidget="util",
+    ),
+)
@@ -1,8 +1,10 @@
 import time
-from typing import Any, Callable, Optional, Sequence, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
+import cothread
 from annotypes import Anno, Array
 
+from malcolm.compat import get_stack_size
 from malcolm.core import (
     DEFAULT_TIMEOUT,
     Alarm,
@@ -12,6 +14,7 @@ from malcolm.core import (
     Hook,
     Loggable,
     PartRegistrar,
+    Queue,
     TimeStamp,
     VMeta,
     sleep,
@@ -42,6 +45,13 @@ class CatoolsDeferred:
 
 catools = CatoolsDeferred()
 
+# How long the first connect request waits for others to join its batch
+CA_CONNECT_BATCH_WINDOW = 0.01
+# How long the batch waits for PVs to connect. Any that don't are retried by
+# the part that asked for them with the normal timeout, so a missing PV
+# doesn't hold up every block in the batch
+CA_CONNECT_BATCH_TIMEOUT = 0.5
+
 with Anno("Full pv of demand and default for rbv"):
     APv = str
 with Anno("Override for rbv"):
@@ -62,6 +72,79 @@ with Anno("throw error if PV not found"):
     AThrow = bool
 
 
+class CAConnector(Loggable):
+    """Gathers the initial FORMAT_CTRL cagets that every CA part does on
+    Init/Reset into one caget per datatype, so all the blocks of a Process
+    connect in a few rounds rather than one round per attribute"""
+
+    def __init__(self) -> None:
+        self.set_logger()
+        # {datatype: [(pvs, result_queue)]} waiting for the next batch
+        self._pending: Dict[Any, List[Tuple[List[str], Queue]]] = {}
+        # {mri: seconds} the longest connect of each block's attributes
+        self.connect_times: Dict[str, float] = {}
+
+    def caget(
+        self, pvs: List[str], datatype: Any, mri: Optional[str] = None
+    ) -> List[Any]:
+        """Get pvs with FORMAT_CTRL as part of the next batch of this datatype.
+        The batch is done with throw=False and a short timeout, then any PVs
+        that didn't connect are got again with the normal timeout, so that a
+        missing PV only holds up and fails the part that asked for it"""
+        start = time.time()
+        queue = Queue()
+        requests = self._pending.get(datatype)
+        if requests is None:
+            # We are the first, so wait for others then do the caget for all
+            requests = self._pending[datatype] = [(pvs, queue)]
+            sleep(CA_CONNECT_BATCH_WINDOW)
+            self._do_batch(datatype)
+        else:
+            requests.append((pvs, queue))
+        result = queue.get()
+        if isinstance(result, Exception):
+            raise result
+        retry = [i for i, value in enumerate(result) if not value.ok]
+        if retry:
+            self.log.debug("Retrying %d PVs that didn't connect", len(retry))
+            ca_values = catools.caget(
+                [pvs[i] for i in retry],
+                format=catools.FORMAT_CTRL,
+                datatype=datatype,
+                throw=False,
+            )
+            for i, value in zip(retry, ca_values):
+                result[i] = value
+        if mri:
+            duration = time.time() - start
+            self.connect_times[mri] = max(self.connect_times.get(mri, 0), duration)
+        return result
+
+    def _do_batch(self, datatype: Any) -> None:
+        requests = self._pending.pop(datatype)
+        all_pvs = [pv for pvs, _ in requests for pv in pvs]
+        self.log.debug("Connecting %d PVs for %d parts", len(all_pvs), len(requests))
+        try:
+            ca_values = catools.caget(
+                all_pvs,
+                format=catools.FORMAT_CTRL,
+                datatype=datatype,
+                timeout=CA_CONNECT_BATCH_TIMEOUT,
+                throw=False,
+            )
+        except Exception as e:
+            for _, queue in requests:
+                queue.put(e)
+        else:
+            i = 0
+            for pvs, queue in requests:
+                queue.put(ca_values[i : i + len(pvs)])
+                i += len(pvs)
+
+
+ca_connector = CAConnector()
+
+
 class CABase(Loggable):
     def __init__(
         self,
@@ -94,8 +177,17 @@ class CABase(Loggable):
         self._update_after = 0
         self._local_value: Optional[CATable] = None
         self._user_callback = callback
+        # Latest monitor value waiting for the flush timer, and the timer
+        self._pending_value: Any = None
+        self._flush_timer: Optional[cothread.Timer] = None
+        # How many monitor updates were replaced by a later one
+        self.dropped_updates = 0
 
     def disconnect(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._pending_value = None
         if self.monitor is not None:
             if hasattr(self.monitor, "__len__"):
                 for monitor in self.monitor:
@@ -131,6 +223,12 @@ class CABase(Loggable):
     def reconnect(self):
         pass
 
+    def _connect(self, pvs: List[str]) -> List[Any]:
+        # Block mri is only known once we have been added to a Controller
+        mri = self.attr.path[0] if self.attr.path else None
+        ca_values = ca_connector.caget(pvs, self.datatype, mri)
+        return assert_connected(ca_values, self.throw)
+
     def caput(self, value):
         pass
 
@@ -153,28 +251,37 @@ class CABase(Loggable):
         )
 
     def _monitor_callback(self, value, value_index=None):
-        now = time.time()
-        delta = now - self._update_after
         if value_index is not None and hasattr(self, "name_list"):
             value_key = self.name_list[value_index]
             self._local_value[value_key] = value
             self._local_value.raw_stamp = getattr(value, "raw_stamp", (None, None))
             self._local_value.ok = self._local_value.ok or value.ok
             self._local_value.severity = max(self._local_value.severity, value.severity)
-            self._update_value(self._local_value)
+            value = self._local_value
+        if self._flush_timer is not None:
+            # Already waiting to flush, so the latest value wins
+            self.dropped_updates += 1
+            self._pending_value = value
+            return
+        now = time.time()
+        delta = self._update_after - now
+        if delta > 0:
+            # Too soon after the last update, so flush when min_delta is up
+            # rather than sleeping in the monitor callback
+            self._pending_value = value
+            self._flush_timer = cothread.Timer(
+                delta, self._flush_monitor, stack_size=get_stack_size()
+            )
         else:
-            self._update_value(value)
-        # See how long to sleep for to make sure we don't get more than one
-        # update at < min_delta interval
-        if delta > self.min_delta:
-            # If we were more than min_delta late then reset next update time
             self._update_after = now + self.min_delta
-        elif delta < 0:
-            # If delta is less than zero sleep for a bit
-            sleep(-delta)
-        else:
-            # If we were within the delta window just increment next update
-            self._update_after += self.min_delta
+            self._update_value(value)
+
+    def _flush_monitor(self):
+        value = self._pending_value
+        self._pending_value = None
+        self._flush_timer = None
+        self._update_after = time.time() + self.min_delta
+        self._update_value(value)
 
 
 class CAAttribute(CABase):
@@ -232,15 +339,7 @@ class CAAttribute(CABase):
         pvs = [self.rbv]
         if self.pv and self.pv != self.rbv:
             pvs.append(self.pv)
-        ca_values = assert_connected(
-            catools.caget(
-                pvs,
-                format=catools.FORMAT_CTRL,
-                datatype=self.datatype,
-                throw=self.throw,
-            ),
-            self.throw,
-        )
+        ca_values = self._connect(pvs)
 
         if self.on_connect:
             self.on_connect(ca_values[0])
@@ -334,15 +433,7 @@ class WaveformTableAttribute(CABase):
         # release old monitor
         self.disconnect()
         # make the connection in cothread's thread, use caget for initial
-        ca_values = assert_connected(
-            catools.caget(
-                self.pv_list,
-                format=catools.FORMAT_CTRL,
-                datatype=self.datatype,
-                throw=self.throw,
-            ),
-            self.throw,
-        )
+        ca_values = self._connect(list(self.pv_list))
 
         for ind, value in enumerate(ca_values):
             if self.on_connect:
@@ -365,5 +456,7 @@ def assert_connected(ca_values, throw=True):
     # check connection is ok
     if throw:
         for v in ca_values:
-            assert v.ok, f"CA connect failed with {v.state_strings[v.state]}"
+            assert (
+                v.ok
+            ), f"CA connect to {v.name} failed with {v.state_strings[v.state]}"
     return ca_values
@@ -3,6 +3,7 @@ from malcolm.core import submodule_all
 
 from .pandablockcontroller import ABlockName, AClient, ADocUrlBase, PandABlockController
 from .pandamanagercontroller import (
+    AAdaptivePoll,
     AConfigDir,
     ADescription,
     AHostname,
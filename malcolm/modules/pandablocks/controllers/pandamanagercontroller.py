@@ -1,12 +1,21 @@
 import json
+import os
 import re
 import time
-from typing import Any, Dict, Sequence, Set, Tuple
+from typing import Any, Dict, List, Sequence, Set, Tuple
 
 from annotypes import Anno
 from cothread.cosocket import socket
 
-from malcolm.core import Display, NumberMeta, Queue, TimeoutError, TimeStamp, Widget
+from malcolm.core import (
+    Alarm,
+    Display,
+    NumberMeta,
+    Queue,
+    TimeoutError,
+    TimeStamp,
+    Widget,
+)
 from malcolm.modules import builtin
 from malcolm.modules.builtin.util import LayoutTable
 
@@ -22,6 +31,11 @@ with Anno("Port number of the TCP server control port"):
     APort = int
 with Anno("Time between polls of PandA current value changes"):
     APollPeriod = float
+with Anno(
+    "Poll faster while values are changing and back off when idle, fetching "
+    "changed tables with the next poll"
+):
+    AAdaptivePoll = bool
 
 
 AMri = builtin.controllers.AMri
@@ -31,9 +45,21 @@ AInitialDesign = builtin.controllers.AInitialDesign
 ADescription = builtin.controllers.ADescription
 
 
-# Minimum period in seconds between updates of the last poll period attribute
+# Minimum period in seconds between updates of the last poll attributes
 POLL_PERIOD_REPORT = 1
 
+# Adaptive polling divides the poll period by this after a poll with changes, and
+# multiplies it by this after one without
+ADAPTIVE_POLL_FACTOR = 2
+
+# Adaptive polling keeps the poll period between these multiples of poll_period
+ADAPTIVE_POLL_MIN = 0.1
+ADAPTIVE_POLL_MAX = 10
+
+# Snapshot of the PandA introspection results in the config dir, hidden and
+# without a .json extension so it isn't listed as a design
+INTROSPECTION_SNAPSHOT = ".introspection"
+
 
 class PandAManagerController(builtin.controllers.ManagerController):
     def __init__(
@@ -47,6 +73,7 @@ class PandAManagerController(builtin.controllers.ManagerController):
         template_designs: ATemplateDesigns = "",
         initial_design: AInitialDesign = "",
         description: ADescription = "",
+        adaptive_poll: AAdaptivePoll = False,
     ) -> None:
         super().__init__(
             mri=mri,
@@ -56,6 +83,7 @@ class PandAManagerController(builtin.controllers.ManagerController):
             description=description,
         )
         self._poll_period = poll_period
+        self._adaptive_poll = adaptive_poll
         self._doc_url_base = doc_url_base
         # All the bit_out fields and their values
         # {block_name.field_name: value}
@@ -83,6 +111,23 @@ class PandAManagerController(builtin.controllers.ManagerController):
             display=Display(units="s", precision=3),
         ).create_attribute_model(poll_period)
         self.field_registry.add_attribute_model("lastPollPeriod", self.last_poll_period)
+        self.last_poll_latency = NumberMeta(
+            "float64",
+            "How long the last poll of the hardware took to get and handle changes",
+            tags=[Widget.TEXTUPDATE.tag()],
+            display=Display(units="s", precision=4),
+        ).create_attribute_model()
+        self.field_registry.add_attribute_model(
+            "lastPollLatency", self.last_poll_latency
+        )
+        self.last_poll_changes = NumberMeta(
+            "int32",
+            "The number of field changes in the last poll of the hardware",
+            tags=[Widget.TEXTUPDATE.tag()],
+        ).create_attribute_model()
+        self.field_registry.add_attribute_model(
+            "lastPollChanges", self.last_poll_changes
+        )
         # Bus tables
         self.busses: PandABussesPart = self._make_busses()
         self.add_part(self.busses)
@@ -114,22 +159,26 @@ class PandAManagerController(builtin.controllers.ManagerController):
         super().do_reset()
 
     def _poll_loop(self):
-        """At self.poll_period poll for changes"""
+        """At self.poll_period poll for changes, or faster while values are
+        changing if adaptive polling is on"""
+        poll_period = self._poll_period
         last_poll_update = time.time()
-        next_poll = time.time() + self._poll_period
+        next_poll = time.time() + poll_period
+        # Tables that changed in the last poll, fetched along with the next one
+        table_fields: List[str] = []
         try:
             while True:
                 # Need to make sure we don't consume all the CPU, allow us to be
                 # active for 50% of the poll period, so we must sleep at least
                 # 50% of the poll period
-                min_sleep = self._poll_period * 0.5
+                min_sleep = poll_period * 0.5
                 sleep_for = next_poll - time.time()
                 if sleep_for < min_sleep:
                     # Going too fast, slow down a bit
-                    last_poll_period = self._poll_period + min_sleep - sleep_for
+                    last_poll_period = poll_period + min_sleep - sleep_for
                     sleep_for = min_sleep
                 else:
-                    last_poll_period = self._poll_period
+                    last_poll_period = poll_period
                 try:
                     # If told to stop, we will get something here and return
                     return self._stop_queue.get(timeout=sleep_for)
@@ -137,18 +186,52 @@ class PandAManagerController(builtin.controllers.ManagerController):
                     # No stop, no problem
                     pass
                 # Poll for changes
-                self.handle_changes(self._client.get_changes())
-                if (
-                    last_poll_period != self.last_poll_period.value
-                    and next_poll - last_poll_update > POLL_PERIOD_REPORT
-                ):
-                    self.last_poll_period.set_value(last_poll_period)
+                start = time.time()
+                if self._adaptive_poll:
+                    changes, table_fields = self._client.get_changes_pipelined(
+                        table_fields
+                    )
+                else:
+                    changes = list(self._client.get_changes())
+                self.handle_changes(changes)
+                latency = time.time() - start
+                if next_poll - last_poll_update > POLL_PERIOD_REPORT:
+                    # Tables appear twice in get_changes, so count unique fields
+                    n_changes = len(set(field for field, _ in changes))
+                    self._report_poll(last_poll_period, latency, n_changes)
                     last_poll_update = next_poll
                 next_poll += last_poll_period
+                if self._adaptive_poll:
+                    poll_period = self._adapt_poll_period(
+                        poll_period, bool(changes or table_fields)
+                    )
         except Exception as e:
             self.go_to_error_state(e)
             raise
 
+    def _adapt_poll_period(self, poll_period: float, changed: bool) -> float:
+        """Return the period until the poll after next, speeding up if the last
+        poll had changes and backing off if it didn't"""
+        if changed:
+            return max(
+                poll_period / ADAPTIVE_POLL_FACTOR,
+                self._poll_period * ADAPTIVE_POLL_MIN,
+            )
+        else:
+            return min(
+                poll_period * ADAPTIVE_POLL_FACTOR,
+                self._poll_period * ADAPTIVE_POLL_MAX,
+            )
+
+    def _report_poll(self, period: float, latency: float, changes: int) -> None:
+        for attr, value in (
+            (self.last_poll_period, period),
+            (self.last_poll_latency, latency),
+            (self.last_poll_changes, changes),
+        ):
+            if value != attr.value:
+                attr.set_value(value)
+
     def stop_poll_loop(self):
         if self._poll_spawned:
             self._stop_queue.put(None)
@@ -162,6 +245,10 @@ class PandAManagerController(builtin.controllers.ManagerController):
         controllers = []
         child_parts = []
         pos_names = []
+        # If the PandA hasn't changed since the last time we started, build the
+        # Blocks from the snapshot and check it in the background
+        snapshot = os.path.join(self._make_config_dir(), INTROSPECTION_SNAPSHOT)
+        from_snapshot = self._client.load_introspection(snapshot)
         blocks_data = self._client.get_blocks_data()
         for block_rootname, block_data in blocks_data.items():
             block_names = []
@@ -212,6 +299,29 @@ class PandAManagerController(builtin.controllers.ManagerController):
         assert (
             not self._bit_out_changes
         ), f"There are still bit_out changes {self._bit_out_changes}"
+        if from_snapshot:
+            self.process.spawn(self._check_introspection, snapshot)
+        else:
+            self._save_introspection(snapshot)
+
+    def _save_introspection(self, snapshot: str) -> None:
+        try:
+            self._client.save_introspection(snapshot)
+        except OSError:
+            self.log.warning(f"Can't write introspection snapshot {snapshot}")
+
+    def _check_introspection(self, snapshot: str) -> None:
+        try:
+            changed = self._client.refresh_introspection()
+        except Exception:
+            self.log.exception("Can't check introspection snapshot against PandA")
+            return
+        if changed:
+            self._save_introspection(snapshot)
+            alarm = Alarm.major(
+                "PandA has changed since the Blocks were created, restart to update"
+            )
+            self.update_health(INTROSPECTION_SNAPSHOT, builtin.infos.HealthInfo(alarm))
 
     def _make_busses(self) -> PandABussesPart:
         return PandABussesPart("busses", self._client)
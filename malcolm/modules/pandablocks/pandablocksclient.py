@@ -1,9 +1,15 @@
+import json
 import logging
+import os
 from collections import OrderedDict, namedtuple
+from socket import IPPROTO_TCP, TCP_NODELAY
 
 # Create a module level logger
 log = logging.getLogger(__name__)
 
+# Maximum number of bytes to read from the socket at a time
+RECV_SIZE = 65536
+
 
 BlockData = namedtuple("BlockData", "number,description,fields")
 FieldData = namedtuple("FieldData", "field_type,field_subtype,description,labels")
@@ -18,6 +24,33 @@ def strip_ok(resp):
     return value
 
 
+def introspection_to_json(idn, blocks_data, pcap_bits_fields, table_fields):
+    """Serialize the introspection results as a json snapshot"""
+    snapshot = OrderedDict(
+        idn=idn, blocks=blocks_data, pcap_bits=pcap_bits_fields, tables=table_fields
+    )
+    return json.dumps(snapshot, indent=1)
+
+
+def introspection_from_json(text):
+    """Recreate the introspection results from introspection_to_json output
+
+    Returns:
+        tuple: (idn, blocks_data, pcap_bits_fields, table_fields)
+    """
+    snapshot = json.loads(text, object_pairs_hook=OrderedDict)
+    blocks_data = OrderedDict()
+    for block_name, (number, description, fields) in snapshot["blocks"].items():
+        for field_name, field_data in fields.items():
+            fields[field_name] = FieldData(*field_data)
+        blocks_data[block_name] = BlockData(number, description, fields)
+    table_fields = snapshot["tables"]
+    for fields in table_fields.values():
+        for name, field_data in fields.items():
+            fields[name] = TableFieldData(*field_data)
+    return snapshot["idn"], blocks_data, snapshot["pcap_bits"], table_fields
+
+
 class PandABlocksClient:
     # Sentinel that tells the send_loop and recv_loop to stop
     STOP = object()
@@ -46,6 +79,12 @@ class PandABlocksClient:
         self._recv_spawned = None
         self._response_queues = None
         self._thread_pool = None
+        # Introspection results, filled in on first request or from a snapshot
+        self._idn = None
+        self._blocks_data = None
+        self._pcap_bits_fields = None
+        # {"SEQ1.TABLE": {name: TableFieldData}}
+        self._table_fields = OrderedDict()
 
     def start(self, spawn=None, socket_cls=None):
         if spawn is None:
@@ -68,6 +107,8 @@ class PandABlocksClient:
                 f"Can't connect to '{self.hostname}:{self.port}', "
                 "did all services on the PandA start correctly?"
             ) from e
+        # Requests are small and pipelined, so don't wait to coalesce them
+        self._socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
 
         self._send_spawned = spawn(self._send_loop)
         self._recv_spawned = spawn(self._recv_loop)
@@ -93,9 +134,20 @@ class PandABlocksClient:
             self._thread_pool = None
 
     def send(self, message):
-        response_queue = self.queue_cls()
-        self._send_queue.put((message, response_queue))
-        return response_queue
+        return self.send_many([message])[0]
+
+    def send_many(self, messages):
+        """Send a batch of messages in one go
+
+        Args:
+            messages (list): The messages to send
+
+        Returns:
+            list: A response queue for each message
+        """
+        response_queues = [self.queue_cls() for _ in messages]
+        self._send_queue.put((messages, response_queues))
+        return response_queues
 
     def recv(self, response_queue, timeout=10.0):
         response = response_queue.get(timeout=timeout)
@@ -121,24 +173,32 @@ class PandABlocksClient:
     def _send_loop(self):
         """Service self._send_queue, sending requests to server"""
         while True:
-            message, response_queue = self._send_queue.get()
-            if message is self.STOP:
+            messages, response_queues = self._send_queue.get()
+            if messages is self.STOP:
                 break
             try:
-                self._response_queues.put(response_queue)
-                self._socket.sendall(message.encode("utf-8"))
+                for response_queue in response_queues:
+                    self._response_queues.put(response_queue)
+                # Send a batch of messages in a single sendall
+                self._socket.sendall("".join(messages).encode("utf-8"))
             except Exception:  # pylint:disable=broad-except
-                log.exception("Exception sending message %s", message)
+                log.exception("Exception sending messages %s", messages)
 
     def _get_lines(self):
-        buf = ""
+        buf = bytearray()
         while True:
-            lines = buf.split("\n")
-            for line in lines[:-1]:
-                yield line
-            buf = lines[-1]
+            start = 0
+            end = buf.find(b"\n")
+            # Decode each line straight out of the buffer without copying it
+            with memoryview(buf) as view:
+                while end >= 0:
+                    yield str(view[start:end], "utf-8")
+                    start = end + 1
+                    end = buf.find(b"\n", start)
+            # Only the partial last line is left to move to the front
+            del buf[:start]
             # Get something new from the socket
-            rx = self._socket.recv(4096).decode("utf-8")
+            rx = self._socket.recv(RECV_SIZE)
             if not rx:
                 break
             buf += rx
@@ -178,6 +238,92 @@ class PandABlocksClient:
                 log.exception("Exception receiving message")
                 raise
 
+    def get_idn(self):
+        if self._idn is None:
+            self._idn = strip_ok(self.send_recv("*IDN?\n"))
+        return self._idn
+
+    def get_blocks_data(self):
+        if self._blocks_data is None:
+            self._blocks_data = self._get_blocks_data()
+        return self._blocks_data
+
+    def get_pcap_bits_fields(self):
+        if self._pcap_bits_fields is None:
+            self._pcap_bits_fields = self._get_pcap_bits_fields()
+        return self._pcap_bits_fields
+
+    def get_table_fields(self, block, field):
+        table_name = f"{block}.{field}"
+        try:
+            return self._table_fields[table_name]
+        except KeyError:
+            fields = self._get_table_fields(block, field)
+            self._table_fields[table_name] = fields
+            return fields
+
+    def load_introspection(self, filename):
+        """Use the introspection results from a snapshot written by
+        save_introspection if it was made from a PandA with the same *IDN?
+
+        Returns:
+            bool: True if the snapshot was loaded
+        """
+        try:
+            with open(filename) as f:
+                snapshot = introspection_from_json(f.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            log.debug("No usable introspection snapshot in %s", filename)
+            return False
+        idn, blocks_data, pcap_bits_fields, table_fields = snapshot
+        if idn != self.get_idn():
+            log.info("Ignoring introspection snapshot of %r, got %r", idn, self._idn)
+            return False
+        self._blocks_data = blocks_data
+        self._pcap_bits_fields = pcap_bits_fields
+        self._table_fields = table_fields
+        return True
+
+    def save_introspection(self, filename):
+        """Write the introspection results made so far to a snapshot"""
+        text = introspection_to_json(
+            self.get_idn(),
+            self.get_blocks_data(),
+            self.get_pcap_bits_fields(),
+            self._table_fields,
+        )
+        # Write then rename so a partial snapshot is never loaded
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "w") as f:
+            f.write(text)
+        os.replace(tmp_filename, filename)
+
+    def refresh_introspection(self):
+        """Ask the PandA again for everything introspected so far, replacing
+        the results if they are different
+
+        Returns:
+            bool: True if the introspection results changed
+        """
+        self._idn = None
+        idn = self.get_idn()
+        blocks_data = self._get_blocks_data()
+        pcap_bits_fields = self._get_pcap_bits_fields()
+        table_fields = OrderedDict()
+        for table_name in self._table_fields:
+            block, field = table_name.split(".")
+            table_fields[table_name] = self._get_table_fields(block, field)
+        introspection = (blocks_data, pcap_bits_fields, table_fields)
+        if introspection == (
+            self._blocks_data,
+            self._pcap_bits_fields,
+            self._table_fields,
+        ):
+            return False
+        log.info("PandA %r introspection results have changed", idn)
+        self._blocks_data, self._pcap_bits_fields, self._table_fields = introspection
+        return True
+
     def _get_block_numbers(self):
         block_numbers = OrderedDict()
         for line in self.send_recv("*BLOCKS?\n"):
@@ -196,12 +342,11 @@ class PandABlocksClient:
         Returns:
             dict: {parameter: response_queue}
         """
-        response_queues = OrderedDict()
-        for parameter in parameter_list:
-            response_queues[parameter] = self.send(request % parameter)
+        messages = [request % parameter for parameter in parameter_list]
+        response_queues = OrderedDict(zip(parameter_list, self.send_many(messages)))
         return response_queues
 
-    def get_blocks_data(self):
+    def _get_blocks_data(self):
         blocks = OrderedDict()
 
         # Get details about number of blocks
@@ -272,7 +417,7 @@ class PandABlocksClient:
 
         return blocks
 
-    def get_pcap_bits_fields(self):
+    def _get_pcap_bits_fields(self):
         # {field_to_set: [bit_names]}
         # E.g. {"PCAP.BITS0"=["TTLIN1.VAL", "TTLIN2.VAL", ...], ...}
         bits_fields = []
@@ -288,16 +433,16 @@ class PandABlocksClient:
             bits[k + ".CAPTURE"] = self.recv(queue)
         return bits
 
-    def get_changes(self, include_errors=False):
-        table_queues = {}
-        for line in self.send_recv("*CHANGES?\n"):
+    def _parse_changes(self, lines, include_errors):
+        """Yield (field, value) for each line of a *CHANGES? response, with a value
+        of None for tables as they have to be fetched separately"""
+        for line in lines:
             if "=" in line:
                 field, val = line.split("=", 1)
             elif line[-1] == "<":
                 # table
                 field = line[:-1]
                 val = None
-                table_queues[field] = self.send(f"{field}?\n")
             elif line.endswith("(error)"):
                 if include_errors:
                     field = line.split(" ", 1)[0]
@@ -308,10 +453,42 @@ class PandABlocksClient:
                 log.warning("Can't parse line %r of changes", line)
                 continue
             yield field, val
+
+    def get_changes(self, include_errors=False):
+        table_fields = []
+        for field, val in self._parse_changes(
+            self.send_recv("*CHANGES?\n"), include_errors
+        ):
+            if val is None:
+                table_fields.append(field)
+            yield field, val
+        table_queues = self.parameterized_send("%s?\n", table_fields)
         for field, q in table_queues.items():
             yield field, self.recv(q)
 
-    def get_table_fields(self, block, field):
+    def get_changes_pipelined(self, table_fields, include_errors=False):
+        """Get the values of the given table fields in the same batch as *CHANGES?,
+        saving a round trip for each poll that changes a table.
+
+        Args:
+            table_fields (list): Tables that changed in the previous call
+            include_errors (bool): Whether to include fields in error
+
+        Returns:
+            tuple: ([(field, value)], changed_table_fields) where
+            changed_table_fields should be passed to the next call
+        """
+        queues = self.send_many([f"{f}?\n" for f in table_fields] + ["*CHANGES?\n"])
+        changes = [(f, self.recv(q)) for f, q in zip(table_fields, queues)]
+        changed_table_fields = []
+        for field, val in self._parse_changes(self.recv(queues[-1]), include_errors):
+            if val is None:
+                changed_table_fields.append(field)
+            else:
+                changes.append((field, val))
+        return changes, changed_table_fields
+
+    def _get_table_fields(self, block, field):
         fields = OrderedDict()
         enum_queues = {}
         for line in self.send_recv(f"{block}.{field}.FIELDS?\n"):
@@ -352,11 +529,9 @@ class PandABlocksClient:
         self.set_fields({f"{block}.{field}": value})
 
     def set_fields(self, field_values):
-        queues = OrderedDict()
-        for field, value in field_values.items():
-            message = f"{field}={value}\n"
-            queues[(field, value)] = self.send(message)
-        for (field, value), queue in queues.items():
+        messages = [f"{field}={value}\n" for field, value in field_values.items()]
+        queues = zip(field_values.items(), self.send_many(messages))
+        for (field, value), queue in queues:
             try:
                 resp = self.recv(queue)
             except ValueError as e:
@@ -365,8 +540,8 @@ class PandABlocksClient:
                 assert resp == "OK", f"Expected OK, got {resp!r}"
 
     def set_table(self, block, field, int_values):
-        lines = [f"{block}.{field}<\n"]
-        lines += [f"{int_value}\n" for int_value in int_values]
-        lines += ["\n"]
-        resp = self.send_recv("".join(lines))
+        lines = [f"{block}.{field}<"]
+        lines += map(str, int_values)
+        lines += ["", ""]
+        resp = self.send_recv("\n".join(lines))
         assert resp == "OK", f"Expected OK, got {resp!r}"
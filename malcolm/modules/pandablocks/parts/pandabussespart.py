@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
 
 from malcolm.core import (
     Alarm,
@@ -14,26 +16,38 @@ from malcolm.core import (
 from ..util import AClient, BitsTable, PositionCapture, PositionsTable
 
 
-def update_column(
-    column_changes: Dict[str, List[Any]], column: str, table_value: Table
-) -> List[Any]:
-    try:
-        column_value = column_changes[column]
-    except KeyError:
-        column_array = getattr(table_value, column)
-        try:
-            # numpy array
-            column_value = column_array.seq.copy()
-        except AttributeError:
-            # list
-            column_value = column_array.seq[:]
-        column_changes[column] = column_value
-    return column_value
+# {column: {row_index: new_value}}
+RowChanges = Dict[str, Dict[int, Any]]
+
 
+def make_updated_table(old_value: Table, row_changes: RowChanges) -> Optional[Table]:
+    """Create new table from the old and the changed rows of each column, or return
+    None if none of the rows actually change.
 
-def make_updated_table(old_value: Table, column_changes: Dict[str, List[Any]]) -> Table:
-    # Create new table from the old and changes
-    d = {k: column_changes.get(k, getattr(old_value, k)) for k in old_value}
+    Only the columns with changed rows are copied, the rest are shared with the old
+    table so they aren't published again."""
+    columns: Dict[str, Any] = {}
+    for column, rows in row_changes.items():
+        old_column = getattr(old_value, column).seq
+        if isinstance(old_column, np.ndarray):
+            indexes = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            values = np.array(list(rows.values()), dtype=old_column.dtype)
+            changed = old_column[indexes] != values
+            if changed.any():
+                # Copy the column we are about to publish, then write it in place
+                new_column = old_column.copy()
+                new_column[indexes[changed]] = values[changed]
+                columns[column] = new_column
+        else:
+            changed_rows = {i: v for i, v in rows.items() if old_column[i] != v}
+            if changed_rows:
+                new_list = list(old_column)
+                for i, v in changed_rows.items():
+                    new_list[i] = v
+                columns[column] = new_list
+    if not columns:
+        return None
+    d = {k: columns.get(k, getattr(old_value, k)) for k in old_value.call_types}
     new_value = old_value.__class__(**d)
     return new_value
 
@@ -53,8 +67,8 @@ class PandABussesPart(Part):
         # Row index lookups
         # {bit_name: index}
         self._bit_indexes: Dict[str, int] = {}
-        # {pos_name: index}
-        self._pos_indexes: Dict[str, int] = {}
+        # {pos_field_name: (index, column or None if it is the value)}
+        self._pos_fields: Dict[str, Tuple[int, Optional[str]]] = {}
         # {pos_index: value}
         self._pos_values: Dict[int, int] = {}
         # Forward and reverse bit lookups
@@ -85,32 +99,58 @@ class PandABussesPart(Part):
         registrar.add_attribute_model("bits", self.bits, self.set_bits)
         registrar.add_attribute_model("positions", self.positions, self.set_positions)
 
-    def get_column_changes(self, old: Table, new: Table) -> Dict[str, List[Any]]:
-        column_changes: Dict[str, List[Any]] = {}
+    def get_column_changes(self, old: Table, new: Table) -> RowChanges:
+        """Return the rows of each column of `new` that differ from `old`, looking
+        rows up by name"""
+        column_changes: RowChanges = {}
         lookup = {k: i for i, k in enumerate(old.name)}
+        # Row indexes in the actual table and in new
+        old_indexes = []
+        new_indexes = []
         for i, name in enumerate(new.name):
-            for k in old:
-                if k not in ("name", "value"):
-                    new_value = new[k][i]
-                    # Lookup row index in actual table
-                    try:
-                        j = lookup[name]
-                    except KeyError:
-                        self.log.warning(f"Ignoring table row with name {name}")
-                    else:
-                        if old[k][j] != new_value:
-                            # row changed
-                            update_column(column_changes, k, old)[j] = new_value
+            try:
+                old_indexes.append(lookup[name])
+            except KeyError:
+                self.log.warning(f"Ignoring table row with name {name}")
+            else:
+                new_indexes.append(i)
+        for k in old:
+            if k not in ("name", "value"):
+                old_column = old[k].seq
+                if isinstance(old_column, np.ndarray):
+                    old_values = old_column[old_indexes]
+                    new_values = np.asarray(new[k].seq, dtype=old_column.dtype)[
+                        new_indexes
+                    ]
+                    changed = np.flatnonzero(old_values != new_values)
+                    rows = dict(
+                        zip(
+                            np.take(old_indexes, changed).tolist(),
+                            new_values[changed].tolist(),
+                        )
+                    )
+                else:
+                    new_column = new[k].seq
+                    rows = {
+                        j: new_column[i]
+                        for i, j in zip(new_indexes, old_indexes)
+                        if old_column[j] != new_column[i]
+                    }
+                if rows:
+                    column_changes[k] = rows
         return column_changes
 
     def set_bits(self, value: BitsTable) -> None:
         assert self.bits, "No bits"
         column_changes = self.get_column_changes(self.bits.value, value)
-        if "capture" in column_changes:
+        new_value = make_updated_table(self.bits.value, column_changes)
+        if new_value is None:
+            new_value = self.bits.value
+        elif "capture" in column_changes:
             # If capture changed, set PCAP bits
             field_values = {}
             for bit in value.name:
-                capture = column_changes["capture"][self._bit_indexes[bit]]
+                capture = new_value.capture[self._bit_indexes[bit]]
                 capture_field = self._bit_pcap_fields[bit]
                 if capture:
                     # If told to capture, this trumps anything it currently
@@ -120,25 +160,26 @@ class PandABussesPart(Part):
                     # If not already set, set it to No
                     field_values.setdefault(capture_field, "No")
             self._client.set_fields(field_values)
-        new_value = make_updated_table(self.bits.value, column_changes)
         self.bits.set_value(new_value)
 
     def set_positions(self, value: PositionsTable) -> None:
         assert self.positions, "No positions"
         column_changes = self.get_column_changes(self.positions.value, value)
+        new_value = make_updated_table(self.positions.value, column_changes)
+        if new_value is None:
+            new_value = self.positions.value
         for attr in ("capture", "scale", "offset", "units"):
             if attr in column_changes:
                 # If attribute changed, set field bits
                 field_values = {}
-                for i, name in enumerate(self.positions.value.name):
+                for i, name in enumerate(new_value.name):
                     field = f"{name}.{attr.upper()}"
-                    value = column_changes[attr][i]
+                    field_value = new_value[attr][i]
                     if attr == "capture":
                         # Convert Enum to string value for capture string
-                        value = value.value
-                    field_values[field] = value
+                        field_value = field_value.value
+                    field_values[field] = field_value
                 self._client.set_fields(field_values)
-        new_value = make_updated_table(self.positions.value, column_changes)
         self.positions.set_value(new_value)
 
     @staticmethod
@@ -186,88 +227,90 @@ class PandABussesPart(Part):
         assert self.positions, "No positions"
         self.positions.set_value(self._make_initial_pos_table(pos_names))
         # Pos lookups
-        self._pos_indexes = {k: i for i, k in enumerate(pos_names)}
+        self._pos_fields = {k: (i, None) for i, k in enumerate(pos_names)}
         for i, k in enumerate(pos_names):
             for suffix in ("CAPTURE", "SCALE", "OFFSET", "UNITS"):
-                self._pos_indexes[f"{k}.{suffix}"] = i
+                self._pos_fields[f"{k}.{suffix}"] = (i, suffix.lower())
             self._pos_values[i] = 0
 
-    def _handle_bit(
-        self, field_name: str, value: bool, column_changes: Dict[str, List[Any]]
-    ) -> Optional[bool]:
-        i = self._bit_indexes.get(field_name, None)
-        assert self.bits, "No bits"
-        if i is not None:
-            # It's a bit, update the table changes
-            update_column(column_changes, "value", self.bits.value)[i] = value
-            return True
-        return None
-
-    def _handle_pos(
-        self, field_name: str, value: str, column_changes: Dict[str, List[Any]]
-    ) -> Optional[bool]:
-        i = self._pos_indexes.get(field_name, None)
-        if i is not None:
-            split = field_name.split(".")
-            if len(split) == 2:
-                # Value change
-                self._pos_values[i] = int(value)
-            else:
-                # Another field change
-                assert len(split) == 3, f"Bad Pos field name: {field_name}"
-                column = split[-1].lower()
-                parsed_value: Union[str, float, PositionCapture]
-                if column in ("scale", "offset"):
-                    parsed_value = float(value)
-                elif column == "capture":
-                    parsed_value = PositionCapture(value)
-                else:
-                    parsed_value = value
-                if self.positions:
-                    update_column(column_changes, column, self.positions.value)[
-                        i
-                    ] = parsed_value
-            # Grab scale and offset
-            assert self.positions, "No positions"
-            table_value = self.positions.value
-            scale = column_changes.get("scale", table_value.scale)[i]
-            offset = column_changes.get("offset", table_value.offset)[i]
-
-            # It's a pos, update the value column with what we know
-            update_column(column_changes, "value", self.positions.value)[i] = (
-                self._pos_values[i] * scale + offset
-            )
-            return True
-        return None
+    @staticmethod
+    def _parse_pos_field(column: str, value: str) -> Any:
+        if column in ("scale", "offset"):
+            return float(value)
+        elif column == "capture":
+            return PositionCapture(value)
+        else:
+            return value
 
-    def _handle_pcap(
-        self, field_name: str, value: str, column_changes: Dict[str, List[Any]]
-    ) -> Optional[bool]:
-        # This should be a pcap bits field...
-        indexes = self._pcap_bit_indexes.get(field_name, None)
-        assert self.bits, "No bits"
-        if indexes is not None:
-            capture = value != "No"
-            for i in indexes:
-                update_column(column_changes, "capture", self.bits.value)[i] = capture
-            return True
-        return None
+    def _update_pos_values(self, column_changes: RowChanges) -> None:
+        """Fill in the value of each changed pos from its raw value and the latest
+        scale and offset"""
+        assert self.positions, "No positions"
+        table_value = self.positions.value
+        scales_offsets = []
+        for column in ("scale", "offset"):
+            column_values = getattr(table_value, column).seq
+            rows = column_changes.get(column, None)
+            if rows:
+                # Scale or offset changed in this update too
+                column_values = column_values.copy()
+                column_values[list(rows)] = list(rows.values())
+            scales_offsets.append(column_values)
+        scales, offsets = scales_offsets
+        values = column_changes["value"]
+        indexes = np.fromiter(values, dtype=np.intp, count=len(values))
+        raw_values = np.array([self._pos_values[i] for i in values], dtype=np.float64)
+        new_values = raw_values * scales[indexes] + offsets[indexes]
+        column_changes["value"] = dict(zip(values, new_values.tolist()))
 
     def handle_changes(self, changes: Dict[str, Any], ts: TimeStamp) -> None:
-        bit_column_changes: Dict[str, Any] = {}
-        pos_column_changes: Dict[str, Any] = {}
+        bit_column_changes: RowChanges = {}
+        pos_column_changes: RowChanges = {}
+        # Look each field up in the precomputed row maps, bits first as there are
+        # most of them
+        bit_indexes = self._bit_indexes
+        pos_fields = self._pos_fields
+        bit_values: Dict[int, bool] = {}
+        pos_values: Dict[int, Any] = {}
         for k, v in changes.items():
-            assert (
-                self._handle_bit(k, v, bit_column_changes)
-                or self._handle_pos(k, v, pos_column_changes)
-                or self._handle_pcap(k, v, bit_column_changes)
-            ), f"Don't know how to handle {k}"
-        # Update the tables
+            i = bit_indexes.get(k, None)
+            if i is not None:
+                # It's a bit, update the table changes
+                bit_values[i] = v
+                continue
+            pos_field = pos_fields.get(k, None)
+            if pos_field is not None:
+                i, column = pos_field
+                if column is None:
+                    # Value change
+                    self._pos_values[i] = int(v)
+                else:
+                    # Another field change
+                    pos_column_changes.setdefault(column, {})[
+                        i
+                    ] = self._parse_pos_field(column, v)
+                # It's a pos, the value column will be updated with what we know
+                pos_values[i] = None
+                continue
+            # This should be a pcap bits field...
+            indexes = self._pcap_bit_indexes.get(k, None)
+            assert indexes is not None, f"Don't know how to handle {k}"
+            capture = v != "No"
+            captures = bit_column_changes.setdefault("capture", {})
+            for i in indexes:
+                captures[i] = capture
+        # Update the tables, only publishing them if a row actually changed
         assert self.bits, "No bits"
+        if bit_values:
+            bit_column_changes["value"] = bit_values
         if bit_column_changes:
             new_value = make_updated_table(self.bits.value, bit_column_changes)
-            self.bits.set_value_alarm_ts(new_value, Alarm.ok, ts)
+            if new_value is not None:
+                self.bits.set_value_alarm_ts(new_value, Alarm.ok, ts)
         assert self.positions, "No positions"
-        if pos_column_changes:
+        if pos_values:
+            pos_column_changes["value"] = pos_values
+            self._update_pos_values(pos_column_changes)
             new_value = make_updated_table(self.positions.value, pos_column_changes)
-            self.positions.set_value_alarm_ts(new_value, Alarm.ok, ts)
+            if new_value is not None:
+                self.positions.set_value_alarm_ts(new_value, Alarm.ok, ts)
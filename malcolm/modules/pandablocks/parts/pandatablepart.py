@@ -1,4 +1,5 @@
 import numpy as np
+from annotypes import Array
 
 from malcolm.compat import OrderedDict
 from malcolm.core import (
@@ -90,6 +91,18 @@ class PandATablePart(PandAFieldPart):
         # TODO: this should be in the block data
         max_bits_hi = max(f.bits_hi for f in self.field_data.values())
         self.ints_per_row = int((max_bits_hi + 31) / 32)
+        # Lookup tables for the choice columns in each direction
+        # {column_name: np.array([label])}
+        self.label_arrays = {}
+        # {column_name: {label: index}}
+        self.label_indexes = {}
+        for column_name, field_data in self.field_data.items():
+            if field_data.labels:
+                labels = np.array(field_data.labels, dtype=object)
+                self.label_arrays[column_name] = labels
+                self.label_indexes[column_name] = {
+                    label: i for i, label in enumerate(field_data.labels)
+                }
         # Superclass will make the attribute for us
         super().__init__(client, meta, block_name, field_name)
 
@@ -98,7 +111,8 @@ class PandATablePart(PandAFieldPart):
         self.attr.set_value_alarm_ts(value, Alarm.ok, ts)
 
     def set_field(self, value):
-        int_values = self.list_from_table(value)
+        # Python ints format much faster than numpy scalars
+        int_values = self.list_from_table(value).tolist()
         self.client.set_table(self.block_name, self.field_name, int_values)
 
     def list_from_table(self, table):
@@ -110,8 +124,17 @@ class PandATablePart(PandAFieldPart):
             column_value = table[column_name]
             if field_data.labels:
                 # Choice, lookup indexes of the label values
-                indexes = [field_data.labels.index(v) for v in column_value]
-                column_value = np.array(indexes, dtype=np.uint32)
+                label_indexes = self.label_indexes[column_name]
+                try:
+                    column_value = np.fromiter(
+                        map(label_indexes.__getitem__, column_value.seq),
+                        dtype=np.uint32,
+                        count=nrows,
+                    )
+                except KeyError as e:
+                    raise ValueError(
+                        f"{e} is not in {column_name} labels {field_data.labels}"
+                    )
             else:
                 # Array, unwrap to get the numpy array
                 column_value = column_value.seq
@@ -128,8 +151,10 @@ class PandATablePart(PandAFieldPart):
     def table_from_list(self, int_values):
         columns = {}
         nrows = len(int_values) // self.ints_per_row
-        # Convert to a 1D uint32 array
-        u32 = np.array([int(x) for x in int_values], dtype=np.uint32)
+        # Convert to a 1D uint32 array, parsing all the strings at once
+        u32 = np.fromstring(" ".join(int_values), dtype=np.uint32, sep=" ")
+        if len(u32) != len(int_values):
+            raise ValueError(f"Can't parse {int_values} as uint32")
         # Reshape to a 2D array
         int_matrix = u32.reshape((nrows, self.ints_per_row))
         # Create the data for each column
@@ -142,7 +167,8 @@ class PandATablePart(PandAFieldPart):
             shifted_column = (int_column >> field_data.bits_lo % 32) & mask
             # If we wanted labels, convert to values here
             if field_data.labels:
-                column_value = [field_data.labels[i] for i in shifted_column]
+                labels = self.label_arrays[column_name]
+                column_value = Array[str](labels[shifted_column].tolist())
             elif nbits == 1:
                 column_value = shifted_column.astype(bool)
             else:
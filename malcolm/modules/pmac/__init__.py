@@ -1,2 +1,10 @@
-from . import infos, parts, util
+from typing import TYPE_CHECKING
+
 from velocity_profile import velocityprofile as vp
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import infos, parts, util
+
+__getattr__, __dir__ = lazy_submodules(__name__, ["infos", "parts", "util"])
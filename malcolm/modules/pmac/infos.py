@@ -1,3 +1,5 @@
+import numpy as np
+
 from malcolm.core import Info
 
 from velocity_profile import velocityprofile as vp
@@ -121,6 +123,12 @@ class MotorInfo(Info):
         cts = int(round((position - self.offset) / self.resolution))
         return cts
 
+    def in_cts_array(self, positions: np.ndarray) -> np.ndarray:
+        """Return the positions (in EGUs) translated to counts, rounding like
+        `in_cts`"""
+        cts = np.rint((positions - self.offset) / self.resolution).astype(np.int64)
+        return cts
+
     def check_position_within_soft_limits(self, position: float) -> bool:
         """Check a position (in EGUs) against the soft limits and return True/False"""
         if self.soft_limits_enabled:
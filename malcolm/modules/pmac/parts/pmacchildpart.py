@@ -1,4 +1,5 @@
 import re
+from bisect import bisect_left
 from enum import Enum
 from typing import Dict, List, Optional, Union
 
@@ -15,6 +16,8 @@ from ..infos import MotorInfo
 from ..util import (
     MIN_TIME,
     MinTurnaround,
+    ProfileColumn,
+    TurnaroundCache,
     all_points_joined,
     all_points_same_velocities,
     cs_axis_mapping,
@@ -82,6 +85,8 @@ class PmacChildPart(builtin.parts.ChildPart):
         self.completed_steps_lookup: List[int] = []
         # Minimum turnaround information
         self.min_turnaround: Optional[MinTurnaround] = None
+        # Turnarounds already calculated for the current axis_mapping
+        self.turnaround_cache: TurnaroundCache = {}
         # If we are currently loading then block loading more points
         self.loading = False
         # Where we have generated into profile
@@ -93,8 +98,10 @@ class PmacChildPart(builtin.parts.ChildPart):
         # What sort of triggers to output
         self.output_triggers: Optional[MotionTrigger] = None
         # Profile points that haven't been sent yet
-        # {timeArray/velocityMode/userPrograms/a/b/c/u/v/w/x/y/z: [elements]}
-        self.profile: Dict[str, List] = {}
+        # {timeArray/velocityMode/userPrograms/a/b/c/u/v/w/x/y/z: ProfileColumn}
+        self.profile: Dict[str, ProfileColumn] = {}
+        # Rounding error in ticks carried over from the last timeArray written
+        self.tick_overflow = 0.0
         # accumulated intervals since the last PVT point used by sparse
         # trajectory logic
         self.time_since_last_pvt = 0
@@ -384,6 +391,7 @@ class PmacChildPart(builtin.parts.ChildPart):
 
         # Set minimum turnaround information
         self.min_turnaround = get_min_turnaround(part_info)
+        self.turnaround_cache = {}
 
         # Work out the cs_port
         cs_port = self.get_cs_port(context, motion_axes)
@@ -408,13 +416,14 @@ class PmacChildPart(builtin.parts.ChildPart):
         self.completed_steps_lookup = []
         # Reset the profiles that still need to be sent
         self.profile = dict(
-            timeArray=[],
-            velocityMode=[],
-            userPrograms=[],
+            timeArray=ProfileColumn(np.float64),
+            velocityMode=ProfileColumn(np.int32),
+            userPrograms=ProfileColumn(np.int32),
         )
+        self.tick_overflow = 0.0
         self.time_since_last_pvt = 0
         for info in self.axis_mapping.values():
-            self.profile[info.cs_axis.lower()] = []
+            self.profile[info.cs_axis.lower()] = ProfileColumn(np.float64)
         self.calculate_generator_profile(completed_steps, do_run_up=True)
         self.write_profile_points(child, cs_port)
         # Wait for the motors to have got to the start
@@ -491,29 +500,26 @@ class PmacChildPart(builtin.parts.ChildPart):
             args["csPort"] = cs_port
 
         for k, v in self.profile.items():
-            # store the remnant back in the array
-            self.profile[k] = v[PROFILE_POINTS:]
-            v = v[:PROFILE_POINTS]
+            # leave the remnant in the profile for next time
+            v = v.take(PROFILE_POINTS)
             if k == "timeArray":
-                overflow = 0.0
-                time_array_ticks = []
-                for t in v:
-                    ticks = t / TICK_S
-                    overflow += ticks % 1
-                    ticks = int(ticks)
-                    if overflow > 0.5:
-                        overflow -= 1
-                        ticks += 1
-                    time_array_ticks.append(ticks)
-                # TODO: overflow discarded every 10000 points, is it a problem?
-                v = np.array(time_array_ticks, np.int32)
-            elif k in ("velocityMode", "userPrograms"):
-                v = np.array(v, np.int32)
-            else:
-                v = np.array(v, np.float64)
+                v = self.time_array_to_ticks(v)
             args[k] = v
         child.writeProfile(**args)
 
+    def time_array_to_ticks(self, time_array: np.ndarray) -> np.ndarray:
+        """Convert times in seconds to whole ticks, carrying the rounding error
+        between calls so the total time is always within half a tick"""
+        ticks = time_array / TICK_S
+        whole_ticks = np.floor(ticks)
+        # Running total of the fractional ticks that haven't been output yet
+        overflow = self.tick_overflow + np.cumsum(ticks - whole_ticks)
+        # Output an extra tick each time it goes over 0.5
+        extra_ticks = np.ceil(overflow - 0.5)
+        if len(overflow):
+            self.tick_overflow = overflow[-1] - extra_ticks[-1]
+        return (whole_ticks + np.diff(extra_ticks, prepend=0)).astype(np.int32)
+
     user_program = {
         scanning.infos.MotionTrigger.NONE: {
             PointType.POINT_JOIN: UserPrograms.NO_PROGRAM,
@@ -684,6 +690,42 @@ class PmacChildPart(builtin.parts.ChildPart):
             {name: point.upper[name] for name in self.axis_mapping},
         )
 
+    def add_generator_point_pairs(self, points, start, stop, point_num, joined):
+        """Vectorised add_generator_point_pair for points[start:stop]
+
+        The points must all be short enough not to need splitting into
+        MAX_MOVE_TIME sections, and joined gives whether each one is joined to
+        the point after it.
+        """
+        n = stop - start
+        half_durations = points.duration[start:stop] / 2.0
+        self.profile["timeArray"].extend(np.repeat(half_durations, 2))
+
+        # Even indices are positions, odd indices are upper bounds
+        velocity_modes = np.full(2 * n, VelocityModes.AVERAGE_PREV_TO_NEXT)
+        velocity_modes[1::2] = np.where(
+            joined,
+            VelocityModes.AVERAGE_PREV_TO_NEXT,
+            VelocityModes.REAL_PREV_TO_CURRENT,
+        )
+        self.profile["velocityMode"].extend(velocity_modes)
+        user_programs = np.full(2 * n, self.get_user_program(PointType.MID_POINT))
+        user_programs[1::2] = np.where(
+            joined,
+            self.get_user_program(PointType.POINT_JOIN),
+            self.get_user_program(PointType.END_OF_ROW),
+        )
+        self.profile["userPrograms"].extend(user_programs)
+        completed_steps = np.repeat(np.arange(point_num, point_num + n), 2)
+        completed_steps[1::2] += 1
+        self.completed_steps_lookup.extend(completed_steps.tolist())
+
+        for name, motor_info in self.axis_mapping.items():
+            axis_points = np.empty(2 * n)
+            axis_points[0::2] = points.positions[name][start:stop]
+            axis_points[1::2] = points.upper[name][start:stop]
+            self.profile[motor_info.cs_axis.lower()].extend(axis_points)
+
     def add_sparse_point(self, points, point_num, points_are_joined, same_velocities):
         """
         Add in points but skip those that are linear to create a sparse
@@ -812,36 +854,48 @@ class PmacChildPart(builtin.parts.ChildPart):
             )
 
             # Don't do all points in the batch otherwise we can get an index error
-            # when adding the turnaround.
+            # when adding the turnaround. The final generator point is added if
+            # it is in this batch, and is never joined to anything
             points_to_do = num_points - 1
-            for i in range(points_to_do):
-                self.add_generator_point_pair(points[i], point_index, joined[i])
+            num_to_add = num_points if last_point_in_batch else points_to_do
+            joined = np.append(joined[:points_to_do], False)[:num_to_add]
+            gaps = np.flatnonzero(~joined).tolist()
+            long_points = points.duration[:num_to_add] / 2.0 > MAX_MOVE_TIME
+
+            i = 0
+            while i < num_to_add:
+                # Add a run of points up to the next one that is not joined to
+                # its neighbour, but no more than will fit in the profile
+                room = (PROFILE_POINTS - len(self.profile["timeArray"])) // 2 + 1
+                stop = i + max(room, 1)
+                next_gap = bisect_left(gaps, i)
+                if next_gap < len(gaps):
+                    stop = min(stop, gaps[next_gap] + 1)
+                stop = min(stop, num_to_add)
+                if long_points[i]:
+                    # This needs splitting, so add it on its own
+                    stop = i + 1
+                    self.add_generator_point_pair(points[i], point_index, joined[i])
+                else:
+                    # Stop the run before the next point that needs splitting
+                    long_in_run = long_points[i:stop]
+                    if long_in_run.any():
+                        stop = i + int(np.argmax(long_in_run))
+                    self.add_generator_point_pairs(
+                        points, i, stop, point_index, joined[i:stop]
+                    )
+                point_index += stop - i
+                i = stop
 
                 # add in the turnaround between non-contiguous points
-                if not (joined[i]):
-                    self.insert_gap(points[i], points[i + 1], point_index + 1)
-
-                # Check if we have exceeded the profile points limit
-                if self.check_profile_length_exceeds_profile_points():
-                    self.end_index = point_index + 1
-                    return False
-
-                # Increment point index
-                point_index += 1
-
-            # Check for the last point
-            if last_point_in_batch:
-                # Add the final generator point
-                self.add_generator_point_pair(points[-1], point_index, False)
+                if not joined[i - 1] and i <= points_to_do:
+                    self.insert_gap(points[i - 1], points[i], point_index)
 
                 # Check if we have exceeded the profile points limit
                 if self.check_profile_length_exceeds_profile_points():
-                    self.end_index = point_index + 1
+                    self.end_index = point_index
                     return False
 
-                # Increment point index
-                point_index += 1
-
             # Increment the index for the next batch
             start_batch_index = point_index
 
@@ -877,8 +931,21 @@ class PmacChildPart(builtin.parts.ChildPart):
             # Don't do all points in the batch otherwise we can get an index error
             # when adding the turnaround.
             points_to_do = num_points - 1
-            for i in range(points_to_do):
+
+            # Points joined to the next with the same velocity are always
+            # skipped by add_sparse_point, so just accumulate their durations
+            # and only visit the others
+            skipped = np.zeros(0, dtype=bool)
+            if points_to_do:
+                skipped = np.logical_and(
+                    joined[:points_to_do], velocities[:points_to_do]
+                )
+            prev = 0
+            for i in np.flatnonzero(~skipped).tolist():
+                self.accumulate_skipped_time(points.duration[prev:i])
+                prev = i + 1
                 point_added = self.add_sparse_point(points, i, joined[i], velocities[i])
+                point_index = start_batch_index + i
 
                 # add in the turnaround between non-contiguous points
                 if not (joined[i]):
@@ -889,9 +956,8 @@ class PmacChildPart(builtin.parts.ChildPart):
                 if point_added and self.check_profile_length_exceeds_profile_points():
                     self.end_index = point_index + 1
                     return False
-
-                # Increment point index
-                point_index += 1
+            self.accumulate_skipped_time(points.duration[prev:points_to_do])
+            point_index = start_batch_index + points_to_do
 
             # Check for the last point
             if last_point_in_batch:
@@ -917,6 +983,14 @@ class PmacChildPart(builtin.parts.ChildPart):
             # Yield so that we don't continuously block other threads
             cothread.Yield()
 
+    def accumulate_skipped_time(self, durations: np.ndarray) -> None:
+        # Same as adding each duration to time_since_last_pvt in turn, as
+        # cumsum accumulates sequentially so gives identical rounding
+        if len(durations):
+            self.time_since_last_pvt = np.cumsum(
+                np.append(self.time_since_last_pvt, durations)
+            )[-1]
+
     def calculate_generator_profile(self, start_index, do_run_up=False):
         # If we are doing the first build, do_run_up will be passed to flag
         # that we need a run up, else just continue from the previous point
@@ -998,6 +1072,7 @@ class PmacChildPart(builtin.parts.ChildPart):
             next_point,
             min_turnaround,
             self.min_turnaround.interval,
+            cache=self.turnaround_cache,
         )
 
         start_positions = {}
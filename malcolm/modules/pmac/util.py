@@ -1,6 +1,6 @@
 from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, List, Set, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from annotypes import Anno, Array, Sequence
@@ -14,6 +14,9 @@ from malcolm.modules.scanning.infos import MotionTriggerInfo
 from .infos import MotorInfo
 
 Profiles = Dict[str, List[float]]
+# {(min_time, min_interval, *start_velocities, *end_velocities, *distances):
+#   (time_arrays, velocity_arrays)}
+TurnaroundCache = Dict[Tuple[float, ...], Tuple[Profiles, Profiles]]
 
 # All possible PMAC CS axis assignment
 CS_AXIS_NAMES = list("ABCUVWXYZ")
@@ -22,6 +25,25 @@ CS_AXIS_NAMES = list("ABCUVWXYZ")
 MIN_TIME = 0.002
 # minimum time between points in a profile
 MIN_INTERVAL = 0.002
+# Decimal places to round to when looking up turnarounds in a TurnaroundCache
+TURNAROUND_CACHE_DECIMALS = 10
+
+# Attributes of a motor block needed to make a MotorInfo
+MOTOR_ATTRIBUTES = [
+    "maxVelocity",
+    "maxVelocityPercent",
+    "accelerationTime",
+    "cs",
+    "resolution",
+    "offset",
+    "readback",
+    "velocitySettle",
+    "units",
+    "userHighLimit",
+    "userLowLimit",
+    "dialHighLimit",
+    "dialLowLimit",
+]
 
 
 def cs_port_with_motors_in(
@@ -62,14 +84,15 @@ def cs_axis_mapping(
     axis_mapping: Dict[str, MotorInfo] = {}
     for name, mri in zip(layout_table.name, layout_table.mri):
         if name in axes_to_move:
-            child = context.block_view(mri)
-            max_velocity = child.maxVelocity.value * (
-                child.maxVelocityPercent.value / 100.0
+            # Get all the values in one consistent set
+            values = context.block_view(mri).get_attribute_values(MOTOR_ATTRIBUTES)
+            max_velocity = values["maxVelocity"] * (
+                values["maxVelocityPercent"] / 100.0
             )
-            acceleration = float(max_velocity) / child.accelerationTime.value
-            cs = child.cs.value
+            acceleration = float(max_velocity) / values["accelerationTime"]
+            cs = values["cs"]
             if cs:
-                cs_port, cs_axis = child.cs.value.split(",", 1)
+                cs_port, cs_axis = cs.split(",", 1)
             else:
                 cs_port, cs_axis = "", ""
             assert cs_axis in CS_AXIS_NAMES, "Can only scan 1-1 mappings, %r is %r" % (
@@ -81,17 +104,17 @@ def cs_axis_mapping(
                 cs_axis=cs_axis,
                 cs_port=cs_port,
                 acceleration=acceleration,
-                resolution=child.resolution.value,
-                offset=child.offset.value,
+                resolution=values["resolution"],
+                offset=values["offset"],
                 max_velocity=max_velocity,
-                current_position=child.readback.value,
+                current_position=values["readback"],
                 scannable=name,
-                velocity_settle=child.velocitySettle.value,
-                units=child.units.value,
-                user_high_limit=child.userHighLimit.value,
-                user_low_limit=child.userLowLimit.value,
-                dial_high_limit=child.dialHighLimit.value,
-                dial_low_limit=child.dialLowLimit.value,
+                velocity_settle=values["velocitySettle"],
+                units=values["units"],
+                user_high_limit=values["userHighLimit"],
+                user_low_limit=values["userLowLimit"],
+                dial_high_limit=values["dialHighLimit"],
+                dial_low_limit=values["dialLowLimit"],
             )
     missing = list(set(axes_to_move) - set(axis_mapping))
     assert not missing, "Some scannables %s are not in the CS mapping %s" % (
@@ -225,6 +248,7 @@ def profile_between_points(
     next_point: Point,
     min_time: float = MIN_TIME,
     min_interval: float = MIN_INTERVAL,
+    cache: Optional[TurnaroundCache] = None,
 ):
     """Make consistent time and velocity arrays for each axis
 
@@ -252,10 +276,135 @@ def profile_between_points(
     Note that for each profile the area under the velocity/time plot
     must equal 'distance'. The class VelocityProfile implements the math
     to achieve this.
+
+    If a cache is given then it is used to look up turnarounds with the same
+    velocities, distances and times (to TURNAROUND_CACHE_DECIMALS places) that
+    have already been calculated, so snake and grid scans only calculate each
+    shape of turnaround once. It must only be used with one axis_mapping.
     """
     start_velocities = point_velocities(axis_mapping, point)
     end_velocities = point_velocities(axis_mapping, next_point, entry=False)
+    distances = {}
+    for axis_name in axis_mapping:
+        distance = next_point.lower[axis_name] - point.upper[axis_name]
+        # If the distance is tiny, round to zero
+        if abs(distance) <= 1e-12:
+            distance = 0.0
+        distances[axis_name] = distance
+
+    if cache is None:
+        return _profile_between_velocities(
+            axis_mapping,
+            start_velocities,
+            end_velocities,
+            distances,
+            min_time,
+            min_interval,
+        )
+
+    key = tuple(
+        np.round(
+            [min_time, min_interval]
+            + [start_velocities[axis_name] for axis_name in axis_mapping]
+            + [end_velocities[axis_name] for axis_name in axis_mapping]
+            + [distances[axis_name] for axis_name in axis_mapping],
+            TURNAROUND_CACHE_DECIMALS,
+        ).tolist()
+    )
+    try:
+        profiles = cache[key]
+    except KeyError:
+        profiles = _profile_between_velocities(
+            axis_mapping,
+            start_velocities,
+            end_velocities,
+            distances,
+            min_time,
+            min_interval,
+        )
+        cache[key] = profiles
+    return profiles
+
+
+def points_velocities(
+    axis_mapping: Dict[str, MotorInfo], points: Points, entry: bool = True
+) -> Dict[str, np.ndarray]:
+    """Find the velocities of each axis over the entry/exit of every point in
+    `points`, in the same way as `point_velocities`"""
+    velocities = {}
+    for axis_name, motor_info in axis_mapping.items():
+        dp = points.upper[axis_name] - points.lower[axis_name]
+        vp = dp / points.duration
+        if entry:
+            d_half = points.positions[axis_name] - points.lower[axis_name]
+        else:
+            d_half = points.upper[axis_name] - points.positions[axis_name]
+        velocity = 4 * d_half / points.duration - vp
+        max_velocity = motor_info.max_velocity
+        invalid = (np.abs(velocity) - max_velocity) / max_velocity >= 1e-6
+        assert not invalid.any(), (
+            f"Velocity {velocity[invalid][0]} invalid for {axis_name} with "
+            f"max_velocity {max_velocity}"
+        )
+        velocities[axis_name] = velocity
+    return velocities
 
+
+def profiles_between_points(
+    axis_mapping: Dict[str, MotorInfo],
+    points: Points,
+    next_points: Points,
+    min_times: np.ndarray,
+    min_interval: float,
+    cache: TurnaroundCache,
+) -> List[Tuple[Profiles, Profiles]]:
+    """Make the time and velocity arrays for each turnaround between points[i] and
+    next_points[i], in the same way as `profile_between_points`.
+
+    The cache keys for all the turnarounds are calculated as one array, so each
+    turnaround shape is only looked at in Python once.
+    """
+    start_velocities = points_velocities(axis_mapping, points)
+    end_velocities = points_velocities(axis_mapping, next_points, entry=False)
+    distances = {}
+    for axis_name in axis_mapping:
+        distance = next_points.lower[axis_name] - points.upper[axis_name]
+        # If the distance is tiny, round to zero
+        distance[np.abs(distance) <= 1e-12] = 0.0
+        distances[axis_name] = distance
+
+    columns = [min_times, np.full(len(min_times), min_interval)]
+    columns += [start_velocities[axis_name] for axis_name in axis_mapping]
+    columns += [end_velocities[axis_name] for axis_name in axis_mapping]
+    columns += [distances[axis_name] for axis_name in axis_mapping]
+    keys = np.round(np.column_stack(columns), TURNAROUND_CACHE_DECIMALS).tolist()
+
+    all_profiles = []
+    for i, key in enumerate(map(tuple, keys)):
+        try:
+            profiles = cache[key]
+        except KeyError:
+            profiles = _profile_between_velocities(
+                axis_mapping,
+                {k: v[i] for k, v in start_velocities.items()},
+                {k: v[i] for k, v in end_velocities.items()},
+                {k: v[i] for k, v in distances.items()},
+                min_times[i],
+                min_interval,
+            )
+            cache[key] = profiles
+        all_profiles.append(profiles)
+    return all_profiles
+
+
+def _profile_between_velocities(
+    axis_mapping: Dict[str, MotorInfo],
+    start_velocities: Dict[str, float],
+    end_velocities: Dict[str, float],
+    distances: Dict[str, float],
+    min_time: float,
+    min_interval: float,
+) -> Tuple[Profiles, Profiles]:
     p = None
     new_min_time = 0
     time_arrays = {}
@@ -266,14 +415,10 @@ def profile_between_points(
     iterations = 2
     while iterations > 0:
         for axis_name, motor_info in axis_mapping.items():
-            distance = next_point.lower[axis_name] - point.upper[axis_name]
-            # If the distance is tiny, round to zero
-            if np.isclose(distance, 0.0, atol=1e-12):
-                distance = 0.0
             p = motor_info.make_velocity_profile(
                 start_velocities[axis_name],
                 end_velocities[axis_name],
-                distance,
+                distances[axis_name],
                 min_time,
                 min_interval,
             )
@@ -347,6 +492,68 @@ def get_min_turnaround(
     return MinTurnaround(min_turnaround, min_interval)
 
 
+class ProfileColumn:
+    """A first in first out buffer of values for one column of a profile.
+
+    Values are appended to the end and taken from the start in chunks. They are
+    stored in a preallocated numpy array, and when that fills up the values that
+    are left are moved back to the start of it (or to a bigger array if needed)
+    so that appending and taking are O(values) with no per-value Python work.
+    """
+
+    def __init__(self, dtype: type, capacity: int = 4096) -> None:
+        self._data = np.empty(capacity, dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, item):
+        return self._data[self._start : self._end][item]
+
+    def __setitem__(self, item, value) -> None:
+        self._data[self._start : self._end][item] = value
+
+    def __repr__(self) -> str:
+        return repr(self[:].tolist())
+
+    def _reserve(self, num: int) -> None:
+        if self._end + num > len(self._data):
+            length = len(self)
+            capacity = len(self._data)
+            while length + num > capacity:
+                capacity *= 2
+            if capacity == len(self._data):
+                # Reuse the existing storage
+                data = self._data
+            else:
+                data = np.empty(capacity, self._data.dtype)
+            data[:length] = self._data[self._start : self._end]
+            self._data = data
+            self._start = 0
+            self._end = length
+
+    def append(self, value) -> None:
+        self._reserve(1)
+        self._data[self._end] = value
+        self._end += 1
+
+    def extend(self, values) -> None:
+        values = np.asarray(values)
+        self._reserve(len(values))
+        self._data[self._end : self._end + len(values)] = values
+        self._end += len(values)
+
+    def take(self, num: int) -> np.ndarray:
+        """Remove and return a copy of up to num values from the start"""
+        taken = self._data[self._start : min(self._start + num, self._end)].copy()
+        self._start += len(taken)
+        if self._start == self._end:
+            self._start = self._end = 0
+        return taken
+
+
 with Anno("Delay after value to add to even points"):
     AEvenDelayAfter = float
 with Anno("Delay after value to add to odd points"):
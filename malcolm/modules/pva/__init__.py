@@ -1 +1,8 @@
-from . import controllers
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import controllers
+
+__getattr__, __dir__ = lazy_submodules(__name__, ["controllers"])
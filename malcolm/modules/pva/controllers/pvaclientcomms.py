@@ -147,6 +147,34 @@ class PvaClientComms(builtin.controllers.ClientComms):
                 # Not expected, raise
                 raise
 
+    def send_batch_put(self, mri, values):
+        """Dispatch Puts to many Attributes of a Block to the server in a
+        single pvAccess put
+
+        Args:
+            mri (str): The mri of the Block
+            values (dict): {attribute_name: value} to put
+        """
+        put_values = {}
+        for attribute_name, value in values.items():
+            typ, value = convert_to_type_tuple_value(value)
+            if isinstance(typ, tuple):
+                # Structure, make into a Value
+                _, typeid, fields = typ
+                value = Value(Type(fields, typeid), value)
+            put_values[attribute_name + ".value"] = value
+        try:
+            self._ctxt.put(mri, put_values, ",".join(put_values))
+        except RemoteError:
+            if "exports" in values:
+                # TODO: use a tag instead of a name
+                # This will change the structure of the block
+                # Wait for reconnect
+                self._queues[mri].get(timeout=DEFAULT_TIMEOUT)
+            else:
+                # Not expected, raise
+                raise
+
     def send_post(self, mri, method_name, **params):
         """Abstract method to dispatch a Post to the server
 
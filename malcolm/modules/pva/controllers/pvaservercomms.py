@@ -8,6 +8,7 @@ from p4p.server.cothread import Handler, SharedPV
 
 from malcolm.core import (
     APublished,
+    BatchPut,
     BlockMeta,
     Controller,
     Delta,
@@ -110,7 +111,7 @@ class BlockHandler(Handler):
                 op.done(error=message)
 
         post.set_callback(handle_post_response)
-        self.controller.handle_request(post).get()
+        self.controller.handle_request(post, external=True).get()
 
     def put(self, pv: SharedPV, op: ServerOperation) -> None:
         path = [self.controller.mri]
@@ -127,6 +128,10 @@ class BlockHandler(Handler):
         # thing we want to change, so value_changed would be:
         #  {"attr.value"} or {"table.value"} or {"value"}
         value_changed = changed_fields_inc_parents.intersection(self.put_paths)
+        if self.field is None and len(value_changed) > 1:
+            # Put to many attributes of the Block at once
+            self._batch_put(op, sorted(value_changed))
+            return
         assert (
             len(value_changed) == 1
         ), f"Can only do a Put to a single field, got {list(value_changed)}"
@@ -166,7 +171,29 @@ class BlockHandler(Handler):
                 op.done(error=message)
 
         put.set_callback(handle_put_response)
-        self.controller.handle_request(put).get()
+        self.controller.handle_request(put, external=True).get()
+
+    def _batch_put(self, op: ServerOperation, changed: List[str]) -> None:
+        values = {}
+        for dotted in changed:
+            # put_paths are all of the form "attr.value"
+            attribute_name = dotted.split(".")[0]
+            op_value = op.value()[attribute_name]
+            values[attribute_name] = convert_value_to_dict(op_value)["value"]
+        batch_put = BatchPut(path=[self.controller.mri], values=values)
+
+        def handle_batch_put_response(response: Response) -> None:
+            if isinstance(response, Return):
+                op.done()
+            else:
+                if isinstance(response, Error):
+                    message = stringify_error(response.message)
+                else:
+                    message = f"BadResponse: {response.to_dict()}"
+                op.done(error=message)
+
+        batch_put.set_callback(handle_batch_put_response)
+        self.controller.handle_request(batch_put, external=True).get()
 
     def handle(self, response: Response) -> None:
         # Called from whatever thread the child block could be in, so
@@ -246,7 +273,7 @@ class BlockHandler(Handler):
         request = Subscribe(path=path, delta=True)
         request.set_callback(self.handle)
         # No need to wait for first update here
-        self.controller.handle_request(request)
+        self.controller.handle_request(request, external=True)
 
     # Need camelCase as called by p4p Server
     # noinspection PyPep8Naming
@@ -259,7 +286,7 @@ class BlockHandler(Handler):
             self.value = None
         request = Unsubscribe()
         request.set_callback(self.handle)
-        self.controller.handle_request(request).get(timeout=1)
+        self.controller.handle_request(request, external=True).get(timeout=1)
 
 
 class PvaServerComms(builtin.controllers.ServerComms):
@@ -1,6 +1,7 @@
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Type
 
-from annotypes import Anno, add_call_types, deserialize_object
+from annotypes import Anno, add_call_types, deserialize_object, json_encode
 from scanpointgenerator import CompoundGenerator
 
 from malcolm.compat import OrderedDict
@@ -9,6 +10,8 @@ from malcolm.core import (
     AbortedError,
     AMri,
     Context,
+    Hook,
+    Info,
     NumberMeta,
     Part,
     Queue,
@@ -22,6 +25,7 @@ from ..hooks import (
     AAxesToMove,
     AbortHook,
     ABreakpoints,
+    APartInfo,
     ConfigureHook,
     ControllerHook,
     PauseHook,
@@ -36,13 +40,24 @@ from ..hooks import (
     ValidateHook,
 )
 from ..infos import ConfigureParamsInfo, ParameterTweakInfo, RunProgressInfo
-from ..util import AGenerator, ConfigureParams, RunnableStates, resolve_generator_tweaks
+from ..util import (
+    AGenerator,
+    ConfigureParams,
+    HookTimingsTable,
+    RunnableStates,
+    resolve_generator_tweaks,
+)
 
 PartContextParams = Iterable[Tuple[Part, Context, Dict[str, Any]]]
 PartConfigureParams = Dict[Part, ConfigureParamsInfo]
 
 ss = RunnableStates
 
+# How many (hook, part) timings to keep in the hookTimings attribute
+HOOK_TIMINGS_LENGTH = 1000
+# How many sets of validated parameters to remember
+VALIDATE_CACHE_SIZE = 32
+
 with Anno("The validated configure parameters"):
     AConfigureParams = ConfigureParams
 with Anno("Step to mark as the last completed step, -1 for current"):
@@ -185,6 +200,24 @@ class RunnableController(builtin.controllers.ManagerController):
             "int32", "Readback of number of scan steps", tags=[Widget.TEXTUPDATE.tag()]
         ).create_attribute_model(0)
         self.field_registry.add_attribute_model("totalSteps", self.total_steps)
+        # Create read-only attribute for how long each part took in recent hooks
+        self.hook_timings = TableMeta.from_table(
+            HookTimingsTable,
+            "Start and end times of the most recent hooks run on each part",
+            Widget.TABLE,
+        ).create_attribute_model()
+        self.field_registry.add_attribute_model("hookTimings", self.hook_timings)
+        # Ring buffer of (hook, part, start, end) rows for hookTimings
+        self._hook_timings: Deque[Tuple[str, str, float, float]] = deque(
+            maxlen=HOOK_TIMINGS_LENGTH
+        )
+        # {serialized params: (tweaked generator dict, validated params)} of the
+        # results of validate, cleared when a part reports it is modified
+        self._validate_cache: Dict[
+            str, Tuple[Optional[Dict[str, Any]], ConfigureParams]
+        ] = {}
+        self.validate_cache_hits = 0
+        self.validate_cache_misses = 0
         # Create the method models
         self.field_registry.add_method_model(self.validate)
         self.set_writeable_in(
@@ -228,6 +261,30 @@ class RunnableController(builtin.controllers.ManagerController):
             ConfigureParamsInfo, self.update_configure_params
         )
 
+    def wait_hooks(
+        self, hook_queue: Queue, hook_spawned: List[Hook]
+    ) -> Dict[str, List[Info]]:
+        try:
+            return super().wait_hooks(hook_queue, hook_spawned)
+        finally:
+            self.update_hook_timings(hook_spawned)
+
+    def update_hook_timings(self, hooks: List[Hook]) -> None:
+        """Add the start and end times of the given finished hooks to the
+        hookTimings ring buffer"""
+        rows: List[Tuple[str, str, float, float]] = []
+        for hook in hooks:
+            if hook.start_time is not None and hook.end_time is not None:
+                part_name = str(hook.child.name)
+                rows.append((hook.name, part_name, hook.start_time, hook.end_time))
+        if rows:
+            self._hook_timings.extend(sorted(rows, key=lambda row: row[2]))
+            self.hook_timings.set_value(HookTimingsTable.from_rows(self._hook_timings))
+
+    def dump_hook_timings(self) -> str:
+        """Return the contents of the hookTimings attribute as JSON"""
+        return json_encode(self.hook_timings.value)
+
     def get_steps_per_run(
         self,
         generator: CompoundGenerator,
@@ -287,6 +344,7 @@ class RunnableController(builtin.controllers.ManagerController):
         return outer_steps
 
     def do_reset(self):
+        self._validate_cache.clear()
         super().do_reset()
         self.configured_steps.set_value(0)
         self.completed_steps.set_value(0)
@@ -297,6 +355,7 @@ class RunnableController(builtin.controllers.ManagerController):
         self, part: Part = None, info: ConfigureParamsInfo = None
     ) -> None:
         """Tell controller part needs different things passed to Configure"""
+        self._validate_cache.clear()
         with self.changes_squashed:
             # Update the dict
             if part:
@@ -374,6 +433,15 @@ class RunnableController(builtin.controllers.ManagerController):
         status_part_info = self.run_hooks(
             ReportStatusHook(p, c) for p, c in part_contexts.items()
         )
+        # If nothing has been modified and the parts report the same status as
+        # when we last validated these params then we can return the same
+        # answer without asking the parts to validate again
+        cache_key = self._validate_cache_key(params, status_part_info)
+        cached = self._validate_cache.get(cache_key, None)
+        if cached:
+            self.validate_cache_hits += 1
+            return self._copy_validated_params(params, *cached)
+        self.validate_cache_misses += 1
         while iterations > 0:
             # Try up to 10 times to get a valid set of parameters
             iterations -= 1
@@ -412,9 +480,53 @@ class RunnableController(builtin.controllers.ManagerController):
                         )
             else:
                 # Consistent set, just return the params
+                if len(self._validate_cache) >= VALIDATE_CACHE_SIZE:
+                    self._validate_cache.clear()
+                if params.generator is generator:
+                    generator_dict = None
+                else:
+                    generator_dict = params.generator.to_dict()
+                self._validate_cache[cache_key] = (generator_dict, params)
                 return params
         raise ValueError("Could not get a consistent set of parameters")
 
+    def _validate_cache_key(
+        self, params: ConfigureParams, status_part_info: APartInfo
+    ) -> str:
+        # Our own config attributes don't report PartModifiedInfo, so include
+        # their values in the key
+        config = {k: a.value for k, a in self.our_config_attributes.items()}
+        # Parts validate against live values like motor velocities that don't
+        # clear the cache, so include the status they reported
+        status = {k: repr(v) for k, v in sorted(status_part_info.items())}
+        return json_encode([params, config, status])
+
+    @staticmethod
+    def _copy_validated_params(
+        params: ConfigureParams,
+        generator_dict: Optional[Dict[str, Any]],
+        validated: ConfigureParams,
+    ) -> ConfigureParams:
+        # Callers compare generators by identity, so pass back their own one if
+        # it wasn't tweaked, otherwise a fresh copy as configure() will prepare
+        # it. The other params are immutable so can be shared
+        if generator_dict is None:
+            generator = params.generator
+        else:
+            generator = CompoundGenerator.from_dict(generator_dict)
+        kwargs = {
+            k: getattr(validated, k) for k in validated.call_types if k != "generator"
+        }
+        return ConfigureParams(generator, **kwargs)
+
+    def update_modified(
+        self, part: Part = None, info: builtin.infos.PartModifiedInfo = None
+    ) -> None:
+        # A child config value, the layout or a design has changed, so parts may
+        # now validate differently
+        self._validate_cache.clear()
+        super().update_modified(part, info)
+
     def abortable_transition(self, state):
         with self._lock:
             # We might have been aborted just now, so this will fail
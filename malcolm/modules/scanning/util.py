@@ -165,6 +165,34 @@ with Anno("The detectors that should be active and their exposures"):
     ADetectorTable = DetectorTable
 
 
+with Anno("Hook names"):
+    AHookNames = Union[Array[str]]
+with Anno("Names of the Parts the hook was run on"):
+    AHookParts = Union[Array[str]]
+with Anno("Time the Part started running the hook, in seconds since the epoch"):
+    AHookStarts = Union[Array[float]]
+with Anno("Time the Part finished running the hook, in seconds since the epoch"):
+    AHookEnds = Union[Array[float]]
+UHookNames = Union[AHookNames, Sequence[str]]
+UHookParts = Union[AHookParts, Sequence[str]]
+UHookStarts = Union[AHookStarts, Sequence[float]]
+UHookEnds = Union[AHookEnds, Sequence[float]]
+
+
+class HookTimingsTable(Table):
+    def __init__(
+        self,
+        hook: UHookNames,
+        part: UHookParts,
+        start: UHookStarts,
+        end: UHookEnds,
+    ) -> None:
+        self.hook = AHookNames(hook)
+        self.part = AHookParts(part)
+        self.start = AHookStarts(start)
+        self.end = AHookEnds(end)
+
+
 class RunnableStates(builtin.util.ManagerStates):
     """This state set covers controllers and parts that can be configured and
     then run, and have the ability to pause and rewind"""
@@ -1 +1,10 @@
-from . import controllers, defines, parts
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import controllers, defines, parts, util
+
+__getattr__, __dir__ = lazy_submodules(
+    __name__, ["controllers", "defines", "parts", "util"]
+)
@@ -12,7 +12,10 @@ from malcolm.core import (
     BadValueError,
     ProcessStartHook,
     ProcessStopHook,
+    Queue,
     StringMeta,
+    TableMeta,
+    TimeoutError,
     Widget,
 )
 from malcolm.modules import builtin, ca
@@ -20,6 +23,10 @@ from malcolm.modules.ca.util import catools
 
 from ..parts.dirparsepart import DirParsePart
 from ..parts.iociconpart import IocIconPart
+from ..util import RequestStatsTable
+
+# How often to publish the request stats of the process
+REQUEST_STATS_PERIOD = 1.0
 
 
 def await_ioc_start(stats, prefix):
@@ -130,6 +137,15 @@ class ProcessController(builtin.controllers.ManagerController):
         self.field_registry.add_attribute_model("kernel", self.kernel)
         self.field_registry.add_attribute_model("pid", self.pid)
 
+        self.request_stats = TableMeta.from_table(
+            RequestStatsTable,
+            "Requests handled by each Block in this process",
+            Widget.TABLE,
+        ).create_attribute_model()
+        self.field_registry.add_attribute_model("requestStats", self.request_stats)
+        self._stats_stop_queue = Queue()
+        self._stats_spawned = None
+
         if self.stats["yaml_ver"] in ["work", "unknown"]:
             message = "Non-prod YAML config"
             alarm = Alarm(message=message, severity=AlarmSeverity.MINOR_ALARM)
@@ -137,13 +153,43 @@ class ProcessController(builtin.controllers.ManagerController):
 
         self.register_hooked(ProcessStartHook, self.init)
 
-        self.register_hooked(ProcessStopHook, self.stop_ioc)
+        self.register_hooked(ProcessStopHook, self.stop)
 
     def init(self):
         if self.ioc is None:
             self.ioc = start_ioc(self.stats, self.prefix)
         self.get_ioc_list()
         super().init()
+        if self._stats_spawned is None:
+            self._stats_spawned = self.process.spawn(self._stats_loop)
+
+    def stop(self):
+        if self._stats_spawned:
+            self._stats_stop_queue.put(None)
+            self._stats_spawned.wait()
+            self._stats_spawned = None
+        self.stop_ioc()
+
+    def _stats_loop(self):
+        """At REQUEST_STATS_PERIOD publish the request stats of the process"""
+        while True:
+            try:
+                # If told to stop, we will get something here and return
+                return self._stats_stop_queue.get(timeout=REQUEST_STATS_PERIOD)
+            except TimeoutError:
+                # No stop, no problem
+                pass
+            self.update_request_stats()
+
+    def update_request_stats(self):
+        frozen = {}
+        for mri in self.process.mri_list:
+            controller = self.process.get_controller(mri)
+            frozen[mri] = (controller.frozen_hits, controller.frozen_misses)
+        table = RequestStatsTable.from_request_stats(self.process.request_stats, frozen)
+        # Only send a delta to subscribers if something changed
+        if table != self.request_stats.value:
+            self.request_stats.set_value(table)
 
     def set_default_layout(self):
         name = []
@@ -0,0 +1,84 @@
+from typing import Dict, Sequence, Tuple, Union
+
+from annotypes import Anno, Array
+
+from malcolm.core import Table
+
+with Anno("Malcolm full names of the Blocks handling requests"):
+    AMriArray = Union[Array[str]]
+with Anno("Number of requests waiting to be run"):
+    AQueuedArray = Union[Array[int]]
+with Anno("Number of requests currently running"):
+    AActiveArray = Union[Array[int]]
+with Anno("Number of requests that have finished"):
+    ACompletedArray = Union[Array[int]]
+with Anno("Number of requests that took less than 1ms"):
+    AUnder1msArray = Union[Array[int]]
+with Anno("Number of requests that took between 1ms and 10ms"):
+    AUnder10msArray = Union[Array[int]]
+with Anno("Number of requests that took between 10ms and 100ms"):
+    AUnder100msArray = Union[Array[int]]
+with Anno("Number of requests that took between 100ms and 1s"):
+    AUnder1sArray = Union[Array[int]]
+with Anno("Number of requests that took longer than 1s"):
+    AOver1sArray = Union[Array[int]]
+with Anno("Number of times a frozen snapshot of a Model was reused"):
+    AFrozenHitsArray = Union[Array[int]]
+with Anno("Number of times a frozen snapshot of a Model was made"):
+    AFrozenMissesArray = Union[Array[int]]
+UMriArray = Union[AMriArray, Sequence[str]]
+UQueuedArray = Union[AQueuedArray, Sequence[int]]
+UActiveArray = Union[AActiveArray, Sequence[int]]
+UCompletedArray = Union[ACompletedArray, Sequence[int]]
+UUnder1msArray = Union[AUnder1msArray, Sequence[int]]
+UUnder10msArray = Union[AUnder10msArray, Sequence[int]]
+UUnder100msArray = Union[AUnder100msArray, Sequence[int]]
+UUnder1sArray = Union[AUnder1sArray, Sequence[int]]
+UOver1sArray = Union[AOver1sArray, Sequence[int]]
+UFrozenHitsArray = Union[AFrozenHitsArray, Sequence[int]]
+UFrozenMissesArray = Union[AFrozenMissesArray, Sequence[int]]
+
+
+class RequestStatsTable(Table):
+    # The latency columns match the buckets of malcolm.core.process.RequestStats
+    def __init__(
+        self,
+        mri: UMriArray,
+        queued: UQueuedArray,
+        active: UActiveArray,
+        completed: UCompletedArray,
+        under1ms: UUnder1msArray,
+        under10ms: UUnder10msArray,
+        under100ms: UUnder100msArray,
+        under1s: UUnder1sArray,
+        over1s: UOver1sArray,
+        frozenHits: UFrozenHitsArray,
+        frozenMisses: UFrozenMissesArray,
+    ) -> None:
+        self.mri = AMriArray(mri)
+        self.queued = AQueuedArray(queued)
+        self.active = AActiveArray(active)
+        self.completed = ACompletedArray(completed)
+        self.under1ms = AUnder1msArray(under1ms)
+        self.under10ms = AUnder10msArray(under10ms)
+        self.under100ms = AUnder100msArray(under100ms)
+        self.under1s = AUnder1sArray(under1s)
+        self.over1s = AOver1sArray(over1s)
+        self.frozenHits = AFrozenHitsArray(frozenHits)
+        self.frozenMisses = AFrozenMissesArray(frozenMisses)
+
+    @classmethod
+    def from_request_stats(
+        cls, request_stats, frozen: Dict[str, Tuple[int, int]] = None
+    ) -> "RequestStatsTable":
+        """Make a table from the Process.request_stats dict, and the
+        {mri: (frozen_hits, frozen_misses)} of each Controller"""
+        if frozen is None:
+            frozen = {}
+        rows = [
+            [mri, stats.queued, stats.active, stats.completed]
+            + stats.latencies
+            + list(frozen.get(mri, (0, 0)))
+            for mri, stats in request_stats.items()
+        ]
+        return cls.from_rows(rows)
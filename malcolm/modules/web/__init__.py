@@ -1 +1,10 @@
-from . import controllers, hooks, infos, parts
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import controllers, hooks, infos, parts
+
+__getattr__, __dir__ = lazy_submodules(
+    __name__, ["controllers", "hooks", "infos", "parts"]
+)
@@ -85,4 +85,4 @@ class HTTPServerComms(builtin.controllers.ServerComms):
         else:
             assert self.process, "No attached process"
             controller = self.process.get_controller(info.mri)
-        cothread.Callback(controller.handle_request, info.request)
+        cothread.Callback(controller.handle_request, info.request, True)
@@ -7,6 +7,7 @@ from tornado.websocket import WebSocketClientConnection, websocket_connect
 
 from malcolm.core import (
     DEFAULT_TIMEOUT,
+    BatchPut,
     BlockMeta,
     BlockModel,
     Delta,
@@ -243,6 +244,22 @@ class WebsocketClientComms(builtin.controllers.ClientComms):
         else:
             return response.value
 
+    def send_batch_put(self, mri, values):
+        """Dispatch Puts to many Attributes of a Block to the server in a
+        single BatchPut
+
+        Args:
+            mri (str): The mri of the Block
+            values (dict): {attribute_name: value} to put
+        """
+        q = Queue()
+        request = BatchPut(path=[mri], values=values)
+        request.set_callback(q.put)
+        IOLoopHelper.call(self._send_request, request)
+        response = q.get()
+        if isinstance(response, Error):
+            raise response.message
+
     def send_post(self, mri, method_name, **params):
         """Abstract method to dispatch a Post to the server
 
@@ -10,6 +10,7 @@ from annotypes import Anno, add_call_types, deserialize_object, json_decode, jso
 from tornado.websocket import WebSocketError, WebSocketHandler
 
 from malcolm.core import (
+    BatchPut,
     Delta,
     Error,
     FieldError,
@@ -115,7 +116,7 @@ class MalcWebSocketHandler(WebSocketHandler):
                 mri = self._id_to_mri[msg_id]
             else:
                 mri = request.path[0]
-            if isinstance(request, (Put, Post)) and not self._writeable:
+            if isinstance(request, (Put, BatchPut, Post)) and not self._writeable:
                 raise ValueError(f"Put/Post is forbidden from {self.request.remote_ip}")
             self._registrar.report(builtin.infos.RequestInfo(request, mri))
         except Exception as e:
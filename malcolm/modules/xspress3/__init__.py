@@ -1 +1,8 @@
-from . import parts
+from typing import TYPE_CHECKING
+
+from malcolm.modules import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import parts
+
+__getattr__, __dir__ = lazy_submodules(__name__, ["parts"])
@@ -1,12 +1,14 @@
+import hashlib
 import importlib
 import inspect
 import logging
 import os
-from collections.abc import MutableSequence
-from typing import Any, Callable, Dict, List, Tuple
+import pickle
+import time
+from collections.abc import Mapping, MutableSequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from annotypes import NO_DEFAULT, Anno
-from ruamel.yaml import YAML
 
 from malcolm.compat import OrderedDict, raise_with_traceback
 from malcolm.core import Controller, Define, MethodMeta, Part, YamlError
@@ -16,6 +18,12 @@ log = logging.getLogger(__name__)
 
 SECTION_NAMES = ["parameters", "controllers", "parts", "blocks", "includes", "defines"]
 
+# Bump this if the format of the parsed YAML cache changes
+YAML_CACHE_VERSION = 1
+# Only trust the mtime and size of a YAML file if it was last modified this
+# long before we cached it, otherwise check its contents too
+STAMP_SETTLE_TIME = 2.0
+
 
 def _create_takes_arguments(sections: List["Section"]) -> List[Anno]:
     takes_arguments = []
@@ -88,6 +96,12 @@ def check_yaml_names(globals_d: (Dict[str, Any])) -> List[str]:
 
 def make_include_creator(
     yaml_path: str, filename: str = None
+) -> Callable[..., Tuple[List[Controller], List[Part]]]:
+    return YamlCreator(yaml_path, filename, _make_include_creator)
+
+
+def _make_include_creator(
+    yaml_path: str, filename: str = None
 ) -> Callable[..., Tuple[List[Controller], List[Part]]]:
     sections, yamlname, docstring = Section.from_yaml(yaml_path, filename)
     yamldir = os.path.dirname(os.path.abspath(yaml_path))
@@ -151,6 +165,12 @@ def make_block_creator(
         instantiated. If there are any blocks listed then they will be called.
         All created controllers by this or any sub collection will be returned
     """
+    return YamlCreator(yaml_path, filename, _make_block_creator)
+
+
+def _make_block_creator(
+    yaml_path: str, filename: str = None
+) -> Callable[..., List[Controller]]:
     sections, yamlname, docstring = Section.from_yaml(yaml_path, filename)
     yamldir = os.path.dirname(os.path.abspath(yaml_path))
 
@@ -178,6 +198,140 @@ def make_block_creator(
     return creator
 
 
+class YamlCreator:
+    # Callable returned by make_block_creator and make_include_creator. The
+    # YAML file is only parsed and the creator function made the first time
+    # it is called or its signature or docstring are needed
+    def __init__(
+        self, yaml_path: str, filename: Optional[str], make_creator: Callable
+    ) -> None:
+        if filename:
+            path = os.path.join(os.path.dirname(yaml_path), filename)
+        else:
+            path = yaml_path
+        assert path.endswith(
+            ".yaml"
+        ), f"Expected a/path/to/<yamlname>.yaml, got {path!r}"
+        self.yamlname = os.path.basename(path)[:-5]
+        self.__name__ = self.yamlname
+        self.path = path
+        self._yaml_path = yaml_path
+        self._filename = filename
+        self._make_creator = make_creator
+        self._creator: Any = None
+
+    @property
+    def creator(self) -> Any:
+        """The function made from the YAML file"""
+        if self._creator is None:
+            self._creator = self._make_creator(self._yaml_path, self._filename)
+        return self._creator
+
+    @property
+    def call_types(self) -> Dict[str, Anno]:
+        return self.creator.call_types
+
+    @property
+    def return_type(self) -> Anno:
+        return self.creator.return_type
+
+    @property
+    def __doc__(self) -> Optional[str]:  # type: ignore
+        return self.creator.__doc__
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        return inspect.signature(self.creator)
+
+    def __call__(self, *args, **kwargs):
+        return self.creator(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<YamlCreator {self.yamlname}>"
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of path if it hasn't been modified in the last
+    STAMP_SETTLE_TIME seconds, as a later write could leave it unchanged"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if time.time() - stat.st_mtime < STAMP_SETTLE_TIME:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _yaml_cache_path(yaml_path: str) -> str:
+    # Keep it with the .pyc files, as Python does
+    yamldir, yamlfile = os.path.split(os.path.abspath(yaml_path))
+    return os.path.join(yamldir, "__pycache__", yamlfile + ".pickle")
+
+
+def _read_yaml_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if isinstance(cached, dict) and cached.get("version") == YAML_CACHE_VERSION:
+        return cached
+    return None
+
+
+def _write_yaml_cache(cache_path: str, cached: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write then rename so another process never sees half a file
+        tmp_path = f"{cache_path}.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cached, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # Probably an installed read-only package, not an error
+        log.debug("Can't write YAML cache %s: %s", cache_path, e)
+
+
+def _plain(value: Any) -> Any:
+    """Turn ruamel's round trip types into builtin types so they pickle"""
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    elif isinstance(value, MutableSequence):
+        return [_plain(v) for v in value]
+    elif isinstance(value, str):
+        return str(value)
+    elif isinstance(value, bool) or value is None:
+        return value
+    elif type(value).__name__ == "ScalarBoolean":
+        return bool(value)
+    elif isinstance(value, int):
+        return int(value)
+    elif isinstance(value, float):
+        return float(value)
+    else:
+        return value
+
+
+def _parse_yaml(text: str) -> Tuple[List[Tuple[int, str, Dict]], Optional[str]]:
+    # ruamel is slow to import, and not needed if everything is cached
+    from ruamel.yaml import YAML
+
+    # First separate them into their relevant sections
+    yaml = YAML(typ="rt")
+    ds = yaml.load(text)
+    docstring = None
+    sections = []
+    for d in ds:
+        assert len(d) == 1, f"Expected section length 1, got {len(d)}"
+        lineno = d._yaml_line_col.line + 1
+        name = list(d)[0]
+        param_dict = _plain(d[name])
+        sections.append((lineno, name, param_dict))
+        if name == "builtin.defines.docstring":
+            docstring = param_dict["value"]
+    return sections, docstring
+
+
 class Section:
     def __init__(self, filename, lineno, name, param_dict=None):
         self.filename = filename
@@ -236,8 +390,12 @@ class Section:
             args = meta.takes.validate(param_dict)
             ret = ob(**args)
         except Exception as e:
-            sourcefile = inspect.getsourcefile(ob)
-            lineno = inspect.getsourcelines(ob)[1]
+            if isinstance(ob, YamlCreator):
+                # Point at the YAML file rather than the generated function
+                sourcefile, lineno = ob.path, 1
+            else:
+                sourcefile = inspect.getsourcefile(ob)
+                lineno = inspect.getsourcelines(ob)[1]
             raise_with_traceback(
                 YamlError(
                     "\n%s:%d:\n%s:%d:\n%s"
@@ -267,23 +425,31 @@ class Section:
             ".yaml"
         ), f"Expected a/path/to/<yamlname>.yaml, got {yaml_path!r}"
         yamlname = os.path.basename(yaml_path)[:-5]
-        log.debug("Parsing %s", yaml_path)
-        with open(yaml_path) as f:
-            text = f.read()
-        # First separate them into their relevant sections
-        yaml = YAML(typ="rt")
-        ds = yaml.load(text)
-        docstring = None
-        sections = []
-        for d in ds:
-            assert len(d) == 1, f"Expected section length 1, got {len(d)}"
-            lineno = d._yaml_line_col.line + 1
-            name = list(d)[0]
-            sections.append(cls(yaml_path, lineno, name, d[name]))
-            if name == "builtin.defines.docstring":
-                docstring = d[name]["value"]
-
-        return sections, yamlname, docstring
+        # Use the parsed sections cached from last time if the file is the same
+        stamp = _file_stamp(yaml_path)
+        cache_path = _yaml_cache_path(yaml_path)
+        cached = _read_yaml_cache(cache_path) if stamp else None
+        if cached is None or cached["stamp"] != stamp:
+            with open(yaml_path) as f:
+                text = f.read()
+            digest = hashlib.sha1(text.encode()).hexdigest()
+            if cached is None or cached["digest"] != digest:
+                log.debug("Parsing %s", yaml_path)
+                parsed, docstring = _parse_yaml(text)
+                cached = dict(
+                    version=YAML_CACHE_VERSION,
+                    digest=digest,
+                    sections=parsed,
+                    docstring=docstring,
+                )
+            if stamp:
+                cached["stamp"] = stamp
+                _write_yaml_cache(cache_path, cached)
+        sections = [
+            cls(yaml_path, lineno, name, param_dict)
+            for lineno, name, param_dict in cached["sections"]
+        ]
+        return sections, yamlname, cached["docstring"]
 
     def substitute_params(self, substitutions):
         """Substitute param values in our param_dict from params
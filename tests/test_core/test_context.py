@@ -8,7 +8,7 @@ from malcolm.core import Process
 from malcolm.core.context import Context
 from malcolm.core.errors import AbortedError, BadValueError, ResponseError, TimeoutError
 from malcolm.core.future import Future
-from malcolm.core.request import Post, Put, Subscribe, Unsubscribe
+from malcolm.core.request import BatchGet, BatchPut, Post, Put, Subscribe, Unsubscribe
 from malcolm.core.response import Error, Return, Update
 
 
@@ -55,6 +55,17 @@ class TestContext(unittest.TestCase):
             self.o.put(["block", "attr", "value"], 32)
         assert str(cm.exception) == "Test Exception"
 
+    def test_batch_get(self):
+        self.o._q.put(Return(1, dict(a=2, b=3)))
+        ret = self.o.batch_get("block", ["a", "b"])
+        self.assert_handle_request_called_with(BatchGet(1, ["block"], ["a", "b"]))
+        assert ret == dict(a=2, b=3)
+
+    def test_batch_put(self):
+        self.o._q.put(Return(1))
+        self.o.batch_put("block", dict(a=2, b=3))
+        self.assert_handle_request_called_with(BatchPut(1, ["block"], dict(a=2, b=3)))
+
     def test_post(self):
         self.o._q.put(Return(1, dict(a=2)))
         result = self.o.post(["block", "method"], dict(b=32))
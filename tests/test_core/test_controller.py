@@ -4,6 +4,8 @@ from annotypes import Anno, add_call_types
 
 from malcolm import __version__
 from malcolm.core import (
+    BatchGet,
+    BatchPut,
     Controller,
     Error,
     Get,
@@ -144,3 +146,52 @@ class TestController(unittest.TestCase):
         response = q.get(timeout=0.1)
         self.assertIsInstance(response, Return)
         assert response.id == 44
+
+    def test_handle_batch_get(self):
+        q = Queue()
+        request = BatchGet(
+            id=45, path=["mri"], fields=["myAttribute.value", "meta.label"]
+        )
+        request.set_callback(q.put)
+        self.o.handle_request(request)
+        response = q.get(timeout=0.1)
+        self.assertIsInstance(response, Return)
+        assert response.id == 45
+        assert list(response.value) == ["myAttribute.value", "meta.label"]
+        assert response.value["myAttribute.value"] == "hello_block"
+        assert response.value["meta.label"] == "mri"
+
+    def test_handle_batch_get_bad_field(self):
+        q = Queue()
+        request = BatchGet(id=46, path=["mri"], fields=["myAttribute.value", "bad"])
+        request.set_callback(q.put)
+        self.o.handle_request(request)
+        response = q.get(timeout=0.1)
+        self.assertIsInstance(response, Error)
+        assert response.id == 46
+
+    def test_handle_batch_put(self):
+        q = Queue()
+        request = BatchPut(
+            id=47, path=["mri"], values=dict(myAttribute="hello_batch"), get=True
+        )
+        request.set_callback(q.put)
+        self.o.handle_request(request)
+        response = q.get(timeout=0.1)
+        self.assertIsInstance(response, Return)
+        assert response.id == 47
+        assert response.value == dict(myAttribute="hello_batch")
+        assert self.part.my_attribute.value == "hello_batch"
+
+    def test_handle_batch_put_validates_all_first(self):
+        q = Queue()
+        # bad is not an Attribute, so nothing should be put
+        request = BatchPut(
+            id=48, path=["mri"], values=dict(myAttribute="hello_batch", bad="BAD")
+        )
+        request.set_callback(q.put)
+        self.o.handle_request(request)
+        response = q.get(timeout=0.1)
+        self.assertIsInstance(response, Error)
+        assert response.id == 48
+        assert self.part.my_attribute.value == "hello_block"
@@ -2,7 +2,7 @@ import unittest
 from collections import OrderedDict
 
 import numpy as np
-from annotypes import Serializable
+from annotypes import Array, Serializable
 from mock import Mock
 
 from malcolm.core import (
@@ -219,6 +219,17 @@ class TestChoiceArrayMeta(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.meta.validate(["a", "x"])
 
+    def test_validate_array_of_choices(self):
+        array = Array[str](["b", "a", "b"])
+        assert self.meta.validate(array) is array
+        with self.assertRaises(ValueError) as cm:
+            self.meta.validate(Array[str](["b", "x"]))
+        assert "for element 1" in str(cm.exception)
+
+    def test_validate_array_null_element_maps_default(self):
+        array = Array[str](["b", None])
+        assert self.meta.validate(array) == ["b", "a"]
+
 
 class TestChoiceMeta(unittest.TestCase):
     def setUp(self):
@@ -2,11 +2,13 @@ import unittest
 from threading import RLock
 
 from annotypes import serialize_object
-from mock import Mock
+from mock import Mock, patch
 
 # module imports
 from malcolm.compat import OrderedDict
-from malcolm.core.notifier import Notifier
+from malcolm.core.alarm import Alarm
+from malcolm.core.models import BlockModel, NumberMeta
+from malcolm.core.notifier import Notifier, freeze, squash_changes
 from malcolm.core.request import Return, Subscribe, Unsubscribe
 from malcolm.core.response import Delta, Update
 
@@ -160,3 +162,148 @@ class TestNotifier(unittest.TestCase):
         expected["attr"]["value"] = 33
         expected["attr2"]["value"] = "tr"
         self.assert_called_with(r2.callback, Update(value=expected))
+
+
+class TestSquashChanges(unittest.TestCase):
+    def test_single_change_untouched(self):
+        changes = [[["attr", "value"], 1]]
+        assert squash_changes(changes) is changes
+
+    def test_overwritten(self):
+        changes = [
+            [["attr", "value"], 1],
+            [["attr2", "value"], 2],
+            [["attr", "value"], 3],
+        ]
+        assert squash_changes(changes) == [
+            [["attr2", "value"], 2],
+            [["attr", "value"], 3],
+        ]
+
+    def test_parent_supersedes_earlier_children(self):
+        changes = [
+            [["attr", "value"], 1],
+            [["attr", "alarm"], 2],
+            [["attr2", "value"], 3],
+            [["attr"], 4],
+            [["attr", "timeStamp"], 5],
+        ]
+        assert squash_changes(changes) == [
+            [["attr2", "value"], 3],
+            [["attr"], 4],
+            [["attr", "timeStamp"], 5],
+        ]
+
+    def test_delete_and_readd(self):
+        changes = [[["attr", "value"], 1], [["attr"]], [["attr"], 2]]
+        assert squash_changes(changes) == [[["attr"], 2]]
+        changes = [[["attr"], 2], [["attr", "value"], 1], [["attr"]]]
+        assert squash_changes(changes) == [[["attr"]]]
+
+    def test_root_supersedes_everything(self):
+        changes = [[["attr", "value"], 1], [["attr2"], 2], [[], 3], [["attr"], 4]]
+        assert squash_changes(changes) == [[[], 3], [["attr"], 4]]
+
+
+class TestNotifierBurst(unittest.TestCase):
+    """The pattern of a PandA poll loop: many fields set in one squash, each
+    more than once, all of them touching value, alarm and timeStamp"""
+
+    n_fields = 300
+
+    def setUp(self):
+        self.block = BlockModel()
+        self.o = Notifier("b", RLock(), self.block)
+        self.block.set_notifier_path(self.o, ["b"])
+        self.attrs = [
+            self.block.set_endpoint_data(
+                f"field{i}", NumberMeta("int32").create_attribute_model()
+            )
+            for i in range(self.n_fields)
+        ]
+        self.delta = Subscribe(path=["b"], delta=True)
+        self.delta.set_callback(Mock())
+        self.update = Subscribe(path=["b", "field0", "value"])
+        self.update.set_callback(Mock())
+        for request in (self.delta, self.update):
+            for cb, response in self.o.handle_subscribe(request):
+                cb(response)
+
+    def poll(self):
+        with self.o.changes_squashed:
+            for attr in self.attrs:
+                attr.set_value(1, alarm=Alarm.major("Bad"))
+            for attr in self.attrs:
+                attr.set_value(2)
+
+    def measure(self):
+        self.delta.callback.reset_mock()
+        with patch("malcolm.core.notifier.freeze", side_effect=freeze) as mock_freeze:
+            self.poll()
+        changes = self.delta.callback.call_args[0][0].changes
+        return mock_freeze.call_count, changes
+
+    def test_burst_squashed(self):
+        freezes, changes = self.measure()
+        with patch("malcolm.core.notifier.squash_changes", side_effect=lambda c: c):
+            unsquashed_freezes, unsquashed_changes = self.measure()
+        # value, alarm, timeStamp each set twice, only the last one kept
+        assert len(unsquashed_changes) == 6 * self.n_fields
+        assert len(changes) == 3 * self.n_fields
+        # One freeze per change for the delta, plus one for the update
+        assert unsquashed_freezes == 6 * self.n_fields + 1
+        assert freezes == 3 * self.n_fields + 1
+        # And the last change to each path is the one that survives
+        assert [c[0] for c in changes] == [
+            c[0] for c in unsquashed_changes[-len(changes) :]
+        ]
+        assert [c[1] for c in changes[:2]] == [2, Alarm.ok]
+        assert self.attrs[0].value == 2
+        assert self.attrs[0].alarm == Alarm.ok
+        assert self.update.callback.call_args[0][0].value == 2
+
+
+class TestFrozenCache(unittest.TestCase):
+    def setUp(self):
+        self.block = BlockModel()
+        self.o = Notifier("b", RLock(), self.block)
+        self.block.set_notifier_path(self.o, ["b"])
+        self.attr = self.block.set_endpoint_data(
+            "attr", NumberMeta("int32").create_attribute_model(3)
+        )
+        self.attr2 = self.block.set_endpoint_data(
+            "attr2", NumberMeta("int32").create_attribute_model(4)
+        )
+
+    def test_reused_until_changed(self):
+        frozen = freeze(self.block)
+        assert self.o.frozen_hits == 0
+        misses = self.o.frozen_misses
+        assert freeze(self.block) is frozen
+        assert self.o.frozen_hits == 1
+        assert self.o.frozen_misses == misses
+        assert frozen["attr"]["value"] == 3
+        frozen_attr2 = freeze(self.attr2)
+        with self.o.changes_squashed:
+            self.attr.set_value(5)
+        # Only the changed path is refrozen
+        new_frozen = freeze(self.block)
+        assert new_frozen is not frozen
+        assert new_frozen["attr"]["value"] == 5
+        assert new_frozen["attr2"] is frozen_attr2
+        assert frozen["attr"]["value"] == 3
+
+    def test_deletion_invalidates(self):
+        frozen = freeze(self.block)
+        with self.o.changes_squashed:
+            self.block.remove_endpoint("attr2")
+        assert list(freeze(self.block)) == ["typeid", "meta", "attr"]
+        assert list(frozen) == ["typeid", "meta", "attr", "attr2"]
+
+    def test_detached_not_cached(self):
+        with self.o.changes_squashed:
+            self.block.remove_endpoint("attr2")
+        frozen = freeze(self.attr2)
+        assert freeze(self.attr2) is not frozen
+        self.attr2.set_value(6)
+        assert freeze(self.attr2)["value"] == 6
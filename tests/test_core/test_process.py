@@ -2,8 +2,9 @@ import unittest
 
 from mock import MagicMock
 
-from malcolm.core import Process, ProcessStartHook
+from malcolm.core import Get, Process, ProcessStartHook
 from malcolm.core.controller import Controller
+from malcolm.core.process import RequestStats
 from malcolm.testutil import PublishController, UnpublishableController
 
 
@@ -43,3 +44,59 @@ class TestProcess(unittest.TestCase):
         assert c.published == ["mri", "mri2"]
         self.o.add_controller(UnpublishableController("mri3"))
         assert c.published == ["mri", "mri2"]
+
+    def test_request_stats(self):
+        c = Controller("mri")
+        self.o.add_controller(c)
+        for _ in range(3):
+            c.handle_request(Get(path=["mri", "meta", "label"])).wait(1)
+        stats = self.o.request_stats["mri"]
+        assert (stats.queued, stats.active, stats.completed) == (0, 0, 3)
+        assert sum(stats.latencies) == 3
+
+    def test_latency_buckets(self):
+        stats = RequestStats()
+        for latency in (0.0001, 0.05, 0.5, 0.5, 20):
+            stats.add_latency(latency)
+        assert stats.latencies == [1, 0, 1, 2, 1]
+
+
+class TestProcessRequestWorkers(unittest.TestCase):
+    def setUp(self):
+        self.o = Process("proc", request_workers=2, max_queued_requests=10)
+        self.o.start()
+
+    def tearDown(self):
+        self.o.stop(timeout=1)
+
+    def test_requests_use_pool(self):
+        c = Controller("mri")
+        self.o.add_controller(c)
+        pool = self.o._request_pool
+        spawned = [
+            c.handle_request(Get(path=["mri", "meta", "label"]), external=True)
+            for _ in range(5)
+        ]
+        assert len(pool) == 5
+        assert self.o.request_stats["mri"].queued == 5
+        assert [s.get(1) for s in spawned] == [None] * 5
+        assert len(pool) == 0
+        assert self.o.request_stats["mri"].completed == 5
+
+    def test_internal_requests_dont_use_pool(self):
+        c = Controller("mri")
+        self.o.add_controller(c)
+        spawned = [c.handle_request(Get(path=["mri", "meta", "label"]))]
+        assert len(self.o._request_pool) == 0
+        assert self.o.request_stats["mri"].queued == 1
+        assert spawned[0].get(1) is None
+        assert self.o.request_stats["mri"].completed == 1
+
+    def test_stop_closes_pool(self):
+        pool = self.o._request_pool
+        self.o.stop(timeout=1)
+        assert self.o._request_pool is None
+        with self.assertRaises(AssertionError):
+            pool._queue.Signal(None)
+        self.o.start()
+        assert self.o._request_pool is not pool
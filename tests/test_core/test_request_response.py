@@ -5,7 +5,16 @@ from annotypes import json_decode
 from mock import ANY, MagicMock
 
 from malcolm.compat import OrderedDict
-from malcolm.core.request import Get, Post, Put, Request, Subscribe, Unsubscribe
+from malcolm.core.request import (
+    BatchGet,
+    BatchPut,
+    Get,
+    Post,
+    Put,
+    Request,
+    Subscribe,
+    Unsubscribe,
+)
 from malcolm.core.response import Delta, Error, Response, Return, Update
 
 
@@ -85,6 +94,47 @@ class TestPut(unittest.TestCase):
         assert get_doc_json("put_hdf_file_path") == self.o.to_dict()
 
 
+class TestBatchGet(unittest.TestCase):
+    def setUp(self):
+        self.callback = MagicMock()
+        self.fields = ["state.value", "health.value"]
+        self.o = BatchGet(36, ["BL18I:XSPRESS3"], self.fields)
+        self.o.set_callback(self.callback)
+
+    def test_init(self):
+        assert self.o.typeid == "malcolm:core/BatchGet:1.0"
+        assert self.o.id == 36
+        assert self.o.callback == self.callback
+        assert self.o.path == ["BL18I:XSPRESS3"]
+        assert self.o.fields == self.fields
+
+    def test_serialize(self):
+        d = self.o.to_dict()
+        assert d["fields"] == self.fields
+        assert BatchGet.from_dict(d).to_dict() == d
+
+
+class TestBatchPut(unittest.TestCase):
+    def setUp(self):
+        self.callback = MagicMock()
+        self.values = OrderedDict(fileName="f.h5", filePath="/path/to")
+        self.o = BatchPut(37, ["BL18I:XSPRESS3:HDF"], self.values, get=True)
+        self.o.set_callback(self.callback)
+
+    def test_init(self):
+        assert self.o.typeid == "malcolm:core/BatchPut:1.0"
+        assert self.o.id == 37
+        assert self.o.callback == self.callback
+        assert self.o.path == ["BL18I:XSPRESS3:HDF"]
+        assert self.o.values == self.values
+        assert self.o.get is True
+
+    def test_serialize(self):
+        d = self.o.to_dict()
+        assert d["values"] == self.values
+        assert BatchPut.from_dict(d).to_dict() == d
+
+
 class TestPost(unittest.TestCase):
     def setUp(self):
         self.callback = MagicMock()
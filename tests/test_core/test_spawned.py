@@ -1,6 +1,7 @@
 import unittest
 
-from malcolm.core import Queue, Spawned
+from malcolm.core import Queue, Spawned, sleep
+from malcolm.core.concurrency import WorkerPool
 from malcolm.core.errors import UnexpectedError
 
 
@@ -36,3 +37,44 @@ class TestSpawned(unittest.TestCase):
         assert self.q.get(1) == UnexpectedError
         with self.assertRaises(UnexpectedError):
             s.get()
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(2, 3)
+        self.q = Queue()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_runs_on_workers(self):
+        spawned = [Spawned(do_div, (40, i, self.q), {}, self.pool) for i in (1, 2)]
+        assert len(self.pool) == 2
+        assert [s.get(1) for s in spawned] == [40, 20]
+        assert len(self.pool) == 0
+        assert len(self.pool._workers) == 2
+
+    def test_err(self):
+        s = Spawned(do_div, (40, 2, self.q, UnexpectedError), {}, self.pool)
+        with self.assertRaises(UnexpectedError):
+            s.get(1)
+
+    def test_back_pressure(self):
+        block = Queue()
+        # Both workers busy and 3 waiting in the queue
+        spawned = [Spawned(block.get, (1,), {}, self.pool) for _ in range(2)]
+        sleep(0)
+        assert len(self.pool) == 0
+        spawned += [Spawned(block.get, (1,), {}, self.pool) for _ in range(3)]
+        assert len(self.pool) == 3
+        # This one can't be queued until a worker is free
+        s = Spawned(lambda: Spawned(do_div, (1, 1, self.q), {}, self.pool), (), {})
+        sleep(0.05)
+        assert len(self.pool) == 3
+        assert not s.ready()
+        for _ in range(6):
+            block.put(None)
+        s.get(1)
+        for x in spawned + [s.get()]:
+            x.wait(1)
+        assert self.q.get(1) == 1
@@ -1,11 +1,15 @@
+import os
+import time
 import unittest
 
+import pytest
 from annotypes import Anno, add_call_types
-from mock import Mock
+from mock import MagicMock, Mock
 
 from malcolm.core import (
     Attribute,
     BlockModel,
+    Context,
     Controller,
     MethodModel,
     Part,
@@ -54,7 +58,7 @@ class TestBlock(unittest.TestCase):
         self.data = BlockModel()
         self.data.set_endpoint_data("attr", StringMeta().create_attribute_model())
         self.data.set_endpoint_data("method", MethodModel())
-        self.data.set_notifier_path(Mock(), ["block"])
+        self.data.set_notifier_path(MagicMock(), ["block"])
         self.controller = Mock()
         self.context = Mock()
         self.o = make_view(self.controller, self.context, self.data)
@@ -75,6 +79,21 @@ class TestBlock(unittest.TestCase):
         self.o.method_async(a=3)
         self.o.method.post_async.assert_called_once_with(a=3)
 
+    def test_view_subclass_shared(self):
+        o2 = make_view(self.controller, self.context, self.data)
+        assert type(o2) is type(self.o)
+        assert o2 is not self.o
+
+    def test_view_subclass_new_endpoint(self):
+        self.data.set_endpoint_data("method2", MethodModel())
+        o2 = make_view(self.controller, self.context, self.data)
+        assert type(o2) is not type(self.o)
+        assert hasattr(o2, "method2_async")
+        assert not hasattr(type(self.o), "method2")
+        self.data.remove_endpoint("method2")
+        o3 = make_view(self.controller, self.context, self.data)
+        assert type(o3) is type(self.o)
+
 
 with Anno("A Param"):
     AParam = str
@@ -83,6 +102,9 @@ with Anno("A Param"):
 class MyPart(Part):
     def setup(self, registrar):
         registrar.add_method_model(self.my_method, "myMethod")
+        registrar.add_attribute_model(
+            "myAttr", StringMeta().create_attribute_model("hello")
+        )
 
     @add_call_types
     def my_method(self, param1: AParam, param2: AParam) -> AParam:
@@ -112,6 +134,19 @@ class TestMethod(unittest.TestCase):
         f = method_view.post_async("testAsync", "y")
         assert f.result() == "testAsyncy"
 
+    def test_block_view_benchmark(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in os.environ:
+            pytest.skip("performance test only")
+
+        context = Context(self.process)
+        start = time.time()
+        for _ in range(10000):
+            block = context.block_view("mri")
+            assert block.myAttr.value == "hello"
+        elapsed = time.time() - start
+        assert elapsed < 1.0
+
 
 class TestView(unittest.TestCase):
     def setUp(self):
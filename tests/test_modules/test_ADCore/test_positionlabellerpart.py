@@ -1,10 +1,15 @@
+import os
+import time
+
 import numpy as np
+import pytest
 from mock import MagicMock, call
 from scanpointgenerator import CompoundGenerator, LineGenerator
 
 from malcolm.core import Context, Future, Process
 from malcolm.modules.ADCore.blocks import position_labeller_block
 from malcolm.modules.ADCore.parts import PositionLabellerPart
+from malcolm.modules.ADCore.parts.positionlabellerpart import XML_MAX_SIZE
 from malcolm.modules.ADCore.util import FRAME_TIMEOUT
 from malcolm.testutil import ChildTestCase
 
@@ -169,3 +174,36 @@ class TestPositionLabellerPart(ChildTestCase):
 
         assert len(self.context._subscriptions) == 0
         assert self.o.done_when_reaches == 150
+
+    def test_make_xml_fills_max_size(self):
+        xs = LineGenerator("x", "mm", 0.0, 0.5, 1000, alternate=True)
+        ys = LineGenerator("y", "mm", 0.0, 0.1, 1000)
+        self.o.generator = CompoundGenerator([ys, xs], [], [])
+        self.o.generator.prepare()
+        xml, end_index = self.o._make_xml(500)
+        assert len(xml) < XML_MAX_SIZE
+        # Room for 33328 of the largest position <position d0="999" d1="999" />
+        assert end_index == 500 + 33328
+        positions = xml.split("<positions>")[1].split(" />")
+        assert positions[0] == '<position d0="0" d1="500"'
+        assert positions[500] == '<position d0="1" d1="999"'
+        # And the last chunk stops at the end of the scan
+        xml, end_index = self.o._make_xml(999990)
+        assert end_index == 1000000
+        assert xml.count("<position ") == 10
+
+    def test_make_xml_benchmark(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in os.environ:
+            pytest.skip("performance test only")
+        xs = LineGenerator("x", "mm", 0.0, 0.5, 1000, alternate=True)
+        ys = LineGenerator("y", "mm", 0.0, 0.1, 1000)
+        self.o.generator = CompoundGenerator([ys, xs], [], [])
+        self.o.generator.prepare()
+        start = time.time()
+        end_index = 0
+        while end_index < 100000:
+            _, end_index = self.o._make_xml(end_index)
+        end = time.time()
+        # Takes about 0.2s, was 1.2s when made one point at a time
+        assert end - start < 0.6
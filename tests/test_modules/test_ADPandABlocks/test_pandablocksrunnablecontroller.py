@@ -39,6 +39,7 @@ class PandABlocksRunnableControllerTest(unittest.TestCase):
         self.o.add_part(DatasetTablePart("DSET"))
         self.client = self.o._client
         self.client.started = False
+        self.client.load_introspection.return_value = False
         blocks_data = OrderedDict()
         fields = OrderedDict()
         fields["TS"] = FieldData("ext_out", "", "Timestamp", ["No", "Capture"])
@@ -8,6 +8,9 @@ from numpy import isclose
 from scanpointgenerator import CompoundGenerator, LineGenerator, StaticPointGenerator
 
 from malcolm.core import (
+    Alarm,
+    AlarmSeverity,
+    AlarmStatus,
     BooleanMeta,
     Context,
     NumberMeta,
@@ -29,6 +32,7 @@ from malcolm.modules.ADPandABlocks.doublebuffer import (
     SequencerRows,
 )
 from malcolm.modules.ADPandABlocks.parts import PandASeqTriggerPart
+from malcolm.modules.ADPandABlocks.parts.pandaseqtriggerpart import SeqTriggers
 from malcolm.modules.ADPandABlocks.util import (
     DatasetPositionsTable,
     SequencerTable,
@@ -332,6 +336,39 @@ class TestPandaSeqTriggerPart(ChildTestCase):
         self.gate_part.enable_set.assert_called_once()
         buffer_instance.run.assert_called_once()
 
+    @patch(
+        "malcolm.modules.ADPandABlocks.parts.pandaseqtriggerpart.DoubleBuffer",
+        autospec=True,
+    )
+    def test_configure_clears_refill_margin_alarm(self, buffer_class):
+        self.o.registrar = Mock()
+        generator = CompoundGenerator([StaticPointGenerator(size=1)], [], [], 1.0)
+        generator.prepare()
+        self.o.on_configure(self.context, 0, 1, {}, generator, "")
+        self.o.registrar.report.assert_not_called()
+        # The DoubleBuffer says a refill was too slow
+        report_health = buffer_class.call_args[1]["report_health"]
+        alarm = Alarm(AlarmSeverity.MINOR_ALARM, AlarmStatus.DEVICE_STATUS, "slow")
+        report_health(alarm)
+        self.o.registrar.report.assert_called_once()
+        assert self.o.registrar.report.call_args[0][0].alarm == alarm
+        # The next configure makes a new DoubleBuffer and clears the alarm
+        self.o.registrar.report.reset_mock()
+        self.o.on_configure(self.context, 0, 1, {}, generator, "")
+        self.o.registrar.report.assert_called_once()
+        assert self.o.registrar.report.call_args[0][0].alarm.is_ok()
+        # And it isn't cleared again when there is no alarm
+        self.o.registrar.report.reset_mock()
+        self.o.on_configure(self.context, 0, 1, {}, generator, "")
+        self.o.on_reset(self.context)
+        self.o.registrar.report.assert_not_called()
+        # But reset does clear one
+        report_health(alarm)
+        self.o.registrar.report.reset_mock()
+        self.o.on_reset(self.context)
+        self.o.registrar.report.assert_called_once()
+        assert self.o.registrar.report.call_args[0][0].alarm.is_ok()
+
     @patch(
         "malcolm.modules.ADPandABlocks.parts.pandaseqtriggerpart.PandASeqTriggerPart"
         ".on_abort",
@@ -676,6 +713,105 @@ class TestPandaSeqTriggerPart(ChildTestCase):
         elapsed = datetime.now() - start
         assert elapsed.total_seconds() < 3.0
 
+    @staticmethod
+    def get_rows_per_row(seq_triggers, loaded_up_to, scan_up_to):
+        """Yield rows using SeqTriggers._create_triggered_rows for each scan row, as
+        get_rows did before it worked out a batch of rows at a time."""
+        for points in seq_triggers._overlapping_points_range(
+            seq_triggers.generator, loaded_up_to, scan_up_to
+        ):
+            start_indices, end_indices = seq_triggers._get_row_indices(points)
+            end = start_indices[0] if start_indices.size else len(points)
+            if seq_triggers.last_point is None:
+                yield seq_triggers._create_triggered_rows(points, 0, end, False)
+                seq_triggers.last_point = points[end - 1]
+            else:
+                yield seq_triggers._create_immediate_rows(points.duration[1:end])
+            for start_i, end_i in zip(start_indices, end_indices):
+                yield seq_triggers._create_triggered_rows(points, start_i, end_i, True)
+                seq_triggers.last_point = points[end_i - 1]
+
+    # Small batches so that scan rows span several batches
+    @patch("malcolm.modules.ADPandABlocks.parts.pandaseqtriggerpart.BATCH_SIZE", 7)
+    def test_get_rows_matches_per_row_rows(self):
+        self.set_motor_attributes(x_acceleration=5.0, y_acceleration=4.0)
+        for x_steps, alternate, delay_after, row_trigger in [
+            (5, True, 0, "Position Compare"),
+            (5, False, 0, "Position Compare"),
+            (4, True, 0.5, "Position Compare"),
+            (1, True, 0, "Position Compare"),
+            (17, True, 0, "Position Compare"),
+            (5, True, 0, "Motion Controller"),
+        ]:
+            with self.subTest(
+                x_steps=x_steps,
+                alternate=alternate,
+                delay_after=delay_after,
+                row_trigger=row_trigger,
+            ):
+                self.set_attributes(self.child, rowTrigger=row_trigger)
+                self.set_attributes(self.child_seq1, bita="TTLIN1.VAL")
+                self.set_attributes(self.child_seq2, bita="TTLIN1.VAL")
+                xs = LineGenerator("x", "mm", 0.0, 0.5, x_steps, alternate=alternate)
+                ys = LineGenerator("y", "mm", 0.0, 0.4, 4)
+                generator = CompoundGenerator(
+                    [ys, xs], [], [], 1.0, delay_after=delay_after
+                )
+                generator.prepare()
+                self.o.on_configure(
+                    self.context, 0, generator.size, {}, generator, ["x", "y"]
+                )
+                args = (
+                    generator,
+                    self.o.axis_mapping,
+                    self.o.trigger_enums,
+                    self.o.min_turnaround,
+                )
+                expected = list(
+                    self.get_rows_per_row(SeqTriggers(*args), 0, generator.size)
+                )
+                # The batch path also yields the final dead frame and loop rows
+                actual = list(SeqTriggers(*args).get_rows(0, generator.size))[:-1]
+                assert [rows.as_tuples() for rows in actual] == [
+                    rows.as_tuples() for rows in expected
+                ]
+
+    def test_get_rows_1M_point_fly_scan(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in os.environ:
+            pytest.skip("performance test only")
+
+        self.set_motor_attributes(
+            0,
+            0,
+            "mm",
+            x_velocity=300,
+            y_velocity=300,
+            x_acceleration=3000,
+            y_acceleration=3000,
+        )
+        # Short rows so there are lots of SEQ rows and tables
+        x_steps, y_steps = 20, 50000
+        xs = LineGenerator("x", "mm", 0.0, 10, x_steps, alternate=True)
+        ys = LineGenerator("y", "mm", 0.0, 8, y_steps)
+        generator = CompoundGenerator([ys, xs], [], [], 0.005)
+        generator.prepare()
+        steps_to_do = x_steps * y_steps
+        self.o.on_configure(self.context, 0, steps_to_do, {}, generator, ["x", "y"])
+        seq_triggers = SeqTriggers(
+            generator,
+            self.o.axis_mapping,
+            self.o.trigger_enums,
+            self.o.min_turnaround,
+        )
+
+        start = datetime.now()
+        tables = list(DoubleBuffer._get_tables(seq_triggers.get_rows(0, steps_to_do)))
+        elapsed = datetime.now() - start
+        # At least a blind, compare and immediate SEQ row for each scan row
+        assert sum(len(table.repeats) for table, _ in tables) > 3 * y_steps
+        assert elapsed.total_seconds() < 3.0
+
     def test_on_report_status_doing_pcomp(self):
         mock_context = MagicMock(name="context_mock")
         mock_child = MagicMock(name="child_mock")
@@ -888,6 +1024,83 @@ class TestDoubleBuffer(ChildTestCase):
             for future in futures:
                 self.context.unsubscribe(future)
 
+    def test_tables_are_prefetched(self):
+        generated = []
+
+        def rows_generator():
+            for i in range(4):
+                rows, _ = self.get_sequencer_rows(i)
+                generated.append(i)
+                yield rows
+
+        self.db.configure(rows_generator())
+        # 2 tables loaded, and the next one generated ready for the first refill
+        assert len(self.db._ready) == 1
+        assert generated == [0, 1, 2]
+        table, duration = self.db._ready[0]
+        assert table.position == [2, 2]
+        assert isclose(duration, 2 * (MIN_TABLE_DURATION / 2 + 200 * TICK))
+
+        self.db.run()
+        self.seq1_block.active.put_value_async(True)
+        self.context.sleep(0)
+        self.seq2_block.active.put_value_async(True)
+        self.seq1_block.active.put_value_async(False)
+        self.context.sleep(0)
+        table = self.seq_parts[1].table_set.call_args[0][0]
+        assert table.position == [2, 2]
+        # Last table is now ready
+        assert [t.position for t, _ in self.db._ready] == [[3, 3]]
+        assert len(self.db.refill_timings) == 1
+        latency, margin = self.db.refill_timings[0]
+        assert latency < 1
+        assert isclose(margin, duration - latency)
+
+    def test_refill_latency_includes_prefetch(self):
+        now = [0.0]
+
+        def rows_generator():
+            for i in range(4):
+                if i == 3:
+                    # Generated after the first refill, and takes 5s
+                    now[0] += 5
+                yield self.get_sequencer_rows(i)[0]
+
+        self.db.configure(rows_generator())
+        self.db.run()
+        with patch("malcolm.modules.ADPandABlocks.doublebuffer.time") as time_mock:
+            time_mock.time.side_effect = lambda: now[0]
+            self.seq1_block.active.put_value_async(True)
+            self.context.sleep(0)
+            self.seq2_block.active.put_value_async(True)
+            self.seq1_block.active.put_value_async(False)
+            self.context.sleep(0)
+        # The handler for seqB going inactive couldn't start until then
+        assert self.db.refill_timings[0][0] == 5
+
+    @patch("malcolm.modules.ADPandABlocks.doublebuffer.MIN_REFILL_MARGIN", 100)
+    def test_small_refill_margin_reports_health(self):
+        report_health = Mock()
+        self.db = DoubleBuffer(
+            self.context, self.seq1_block, self.seq2_block, report_health=report_health
+        )
+        rows_list = [self.get_sequencer_rows(i)[0] for i in range(4)]
+        self.db.configure(self.rows_generator(rows_list))
+        report_health.assert_not_called()
+
+        self.db.run()
+        self.seq1_block.active.put_value_async(True)
+        self.context.sleep(0)
+        self.seq2_block.active.put_value_async(True)
+        self.seq1_block.active.put_value_async(False)
+        self.context.sleep(0)
+        report_health.assert_called_once()
+        alarm = report_health.call_args[0][0]
+        assert alarm.severity == AlarmSeverity.MINOR_ALARM
+        assert alarm.message.startswith(
+            "Refilling seqA and generating the next tables took"
+        )
+
 
 class TestSequencerRows(ChildTestCase):
     def test_get_table(self):
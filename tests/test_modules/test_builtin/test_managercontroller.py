@@ -1,8 +1,9 @@
 import os
 import shutil
+import time
 import unittest
 
-from mock import MagicMock
+from mock import MagicMock, patch
 
 from malcolm.compat import OrderedDict
 from malcolm.core import (
@@ -168,6 +169,59 @@ class TestManagerController(unittest.TestCase):
         self.check_expected_save(design_name, attr="newv")
         assert self.c.design.value == "testSaveLayout"
 
+    def test_load_timings_and_only_put_changes(self):
+        design_name = "testLoadTimings"
+        self.b.save(designName=design_name)
+        self.c_part.attr.set_value("newv")
+        self.c.set_design(design_name)
+        assert self.c_part.attr.value == "defaultv"
+        assert list(self.c.load_timings) == ["part2"]
+        assert self.c.load_timings["part2"] >= 0
+        # Loading again when nothing has changed doesn't put anything
+        self.c_child._handle_put = MagicMock(wraps=self.c_child._handle_put)
+        self.c.set_design(design_name)
+        self.c_child._handle_put.assert_not_called()
+        assert list(self.c.load_timings) == ["part2"]
+
+    def test_save_unchanged_design_not_written(self):
+        design_name = "testSaveTwice"
+        with patch(f"{ManagerController.__module__}.os.fsync") as fsync:
+            self.b.save(designName=design_name)
+            assert fsync.call_count == 1
+            self.b.save(designName=design_name)
+            assert fsync.call_count == 1
+            self.c_part.attr.set_value("newv")
+            self.b.save(designName=design_name)
+            assert fsync.call_count == 2
+        self.check_expected_save(design_name, attr="newv")
+
+    def test_load_design_edited_on_disk(self):
+        design_name = "testEdited"
+        self.b.save(designName=design_name)
+        filename = self._get_design_filename(self.main_block_name, design_name)
+        # Only files that haven't changed recently have their contents cached
+        long_ago = time.time() - 10
+        os.utime(filename, (long_ago, long_ago))
+        structure = self.c._read_design(filename)
+        assert self.c._read_design(filename) is structure
+        with open(filename) as f:
+            text = f.read()
+        with open(filename, "w") as f:
+            f.write(text.replace("defaultv", "editedv"))
+        self.c.set_design(design_name)
+        assert self.c_part.attr.value == "editedv"
+
+    def test_design_names_refreshed_from_dir(self):
+        assert self.c.design.meta.choices == [""]
+        filename = self._get_design_filename(self.main_block_name, "other")
+        with open(filename, "w") as f:
+            f.write("{}")
+        self.b.save(designName="testNames")
+        assert self.c.design.meta.choices == ["", "other", "testNames"]
+        os.remove(filename)
+        self.c._set_layout_names()
+        assert self.c.design.meta.choices == ["", "testNames"]
+
     def move_child_block(self):
         new_layout = dict(
             name=["part2"], mri=["anything"], x=[10], y=[20], visible=[True]
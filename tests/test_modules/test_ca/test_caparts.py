@@ -5,6 +5,7 @@ from mock import ANY, patch
 
 from malcolm.core import AlarmSeverity, Process, Table, Widget
 from malcolm.modules.builtin.controllers import StatefulController
+from malcolm.modules.ca.util import CA_CONNECT_BATCH_TIMEOUT
 
 
 @patch("malcolm.modules.ca.util.catools")
@@ -41,7 +42,8 @@ class TestCAParts(unittest.TestCase):
             ["pv2", "pv"],
             datatype=catools.DBR_LONG,
             format=catools.FORMAT_CTRL,
-            throw=True,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
         catools.caget.reset_mock()
 
@@ -79,7 +81,8 @@ class TestCAParts(unittest.TestCase):
             ["pvr"],
             datatype=catools.DBR_CHAR_STR,
             format=catools.FORMAT_CTRL,
-            throw=True,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
 
     def test_cachoice(self, catools):
@@ -101,7 +104,8 @@ class TestCAParts(unittest.TestCase):
             ["rbv", "pv"],
             datatype=catools.DBR_ENUM,
             format=catools.FORMAT_CTRL,
-            throw=True,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
         catools.caget.reset_mock()
 
@@ -157,7 +161,11 @@ class TestCAParts(unittest.TestCase):
         assert b.attrname.meta.display.limitHigh == 10.0
         assert b.attrname.meta.display.precision == 5
         catools.caget.assert_called_once_with(
-            ["pv"], datatype=catools.DBR_DOUBLE, format=catools.FORMAT_CTRL, throw=True
+            ["pv"],
+            datatype=catools.DBR_DOUBLE,
+            format=catools.FORMAT_CTRL,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
         catools.caget.reset_mock()
 
@@ -236,10 +244,11 @@ class TestCAParts(unittest.TestCase):
         assert c.attrname.meta.elements["xData"].display.units == "s"
 
         catools.caget.assert_called_with(
-            ("yPv", "xPv"),
+            ["yPv", "xPv"],
             datatype=catools.DBR_DOUBLE,
             format=catools.FORMAT_CTRL,
-            throw=True,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
 
         catools.caget.reset_mock()
@@ -272,7 +281,11 @@ class TestCAParts(unittest.TestCase):
         assert b.attrname.meta.display.units == ""
 
         catools.caget.assert_called_once_with(
-            ["pv"], datatype=catools.DBR_DOUBLE, format=catools.FORMAT_CTRL, throw=True
+            ["pv"],
+            datatype=catools.DBR_DOUBLE,
+            format=catools.FORMAT_CTRL,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
 
         li = []
@@ -284,11 +297,13 @@ class TestCAParts(unittest.TestCase):
         callback = catools.camonitor.call_args[0][1]
         callback(Initial(8.7))
         callback(Initial(8.8))
-        assert b.attrname.value == 8.8
+        # The second update is held back until min_delta has passed
+        assert b.attrname.value == 8.7
 
         # TODO: why does this seg fault on travis VMs when cothread is
         # stack sharing?
         b._context.sleep(0.1)
+        assert b.attrname.value == 8.8
         assert li == [5.2, 8.7, 8.8]
 
         c = self.create_block(
@@ -321,7 +336,11 @@ class TestCAParts(unittest.TestCase):
         assert b.attrname.meta.tags == ["widget:textinput", "config:1"]
         assert b.attrname.meta.writeable
         catools.caget.assert_called_once_with(
-            ["pv"], datatype=catools.DBR_LONG, format=catools.FORMAT_CTRL, throw=True
+            ["pv"],
+            datatype=catools.DBR_LONG,
+            format=catools.FORMAT_CTRL,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
         catools.caget.reset_mock()
 
@@ -357,7 +376,11 @@ class TestCAParts(unittest.TestCase):
         assert b.attrname.meta.description == "desc"
         assert b.attrname.meta.writeable
         catools.caget.assert_called_once_with(
-            ["pv"], datatype=catools.DBR_LONG, format=catools.FORMAT_CTRL, throw=True
+            ["pv"],
+            datatype=catools.DBR_LONG,
+            format=catools.FORMAT_CTRL,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
 
     def test_castring(self, catools):
@@ -375,7 +398,11 @@ class TestCAParts(unittest.TestCase):
         assert b.attrname.meta.description == "desc"
         assert not b.attrname.meta.writeable
         catools.caget.assert_called_once_with(
-            ["pv"], datatype=catools.DBR_STRING, format=catools.FORMAT_CTRL, throw=True
+            ["pv"],
+            datatype=catools.DBR_STRING,
+            format=catools.FORMAT_CTRL,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
 
     def test_init_no_pv_no_rbv(self, catools):
@@ -0,0 +1,162 @@
+import unittest
+
+from mock import patch
+
+from malcolm.core import NumberMeta, Process, sleep
+from malcolm.modules.builtin.controllers import StatefulController
+from malcolm.modules.ca.parts import CADoublePart, CALongPart
+from malcolm.modules.ca.util import CA_CONNECT_BATCH_TIMEOUT, CAAttribute, ca_connector
+
+
+class caint(int):
+    ok = True
+    severity = 0
+
+
+class cafloat(float):
+    ok = True
+    severity = 0
+    precision = 3
+    units = ""
+    lower_disp_limit = 0
+    upper_disp_limit = 0
+
+
+class ca_nothing:
+    ok = False
+    severity = 0
+    state = 0
+    state_strings = ["never connected"]
+
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeCatools:
+    """Stand-in for cothread.catools serving values from a dict of PVs"""
+
+    FORMAT_CTRL = "CTRL"
+    FORMAT_TIME = "TIME"
+    DBR_LONG = "LONG"
+    DBR_DOUBLE = "DOUBLE"
+
+    def __init__(self, values, slow=()):
+        self.values = values
+        # PVs that don't connect within the batch timeout
+        self.slow = set(slow)
+        self.cagets = []
+        self.timeouts = []
+
+    def caget(self, pvs, format, datatype, throw, timeout=5):
+        self.cagets.append((list(pvs), datatype))
+        self.timeouts.append(timeout)
+        ret = []
+        for pv in pvs:
+            if pv in self.slow and timeout < 5:
+                ret.append(ca_nothing(pv))
+            else:
+                ret.append(self.values.get(pv, ca_nothing(pv)))
+        return ret
+
+    def camonitor(self, pv, callback, **kwargs):
+        return None
+
+
+class TestCAConnector(unittest.TestCase):
+    def setUp(self):
+        self.process = Process("proc")
+        self.catools = FakeCatools(
+            {"A:L": caint(3), "A:D": cafloat(2.5), "B:D": cafloat(4.5)}
+        )
+        patcher = patch("malcolm.modules.ca.util.catools", self.catools)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ca_connector.connect_times.clear()
+
+    def tearDown(self):
+        self.process.stop(timeout=2)
+
+    def add_block(self, mri, *parts):
+        c = StatefulController(mri)
+        for part in parts:
+            c.add_part(part)
+        self.process.add_controller(c)
+        return c
+
+    def test_blocks_connect_in_one_batch(self):
+        self.add_block(
+            "A",
+            CALongPart(name="l", description="desc", rbv="A:L"),
+            CADoublePart(name="d", description="desc", rbv="A:D"),
+        )
+        self.add_block("B", CADoublePart(name="d", description="desc", rbv="B:D"))
+        self.process.start()
+        # One caget per datatype, rather than one per part
+        assert sorted(self.catools.cagets) == [
+            (["A:D", "B:D"], "DOUBLE"),
+            (["A:L"], "LONG"),
+        ]
+        a = self.process.block_view("A")
+        b = self.process.block_view("B")
+        assert a.l.value == 3
+        assert a.d.value == 2.5
+        assert b.d.value == 4.5
+        assert list(sorted(ca_connector.connect_times)) == ["A", "B"]
+
+    def test_missing_pv_only_fails_its_part(self):
+        self.add_block("A", CADoublePart(name="d", description="desc", rbv="A:D"))
+        self.add_block("C", CADoublePart(name="d", description="desc", rbv="C:D"))
+        self.process.start()
+        # The batch has a short timeout, then only C retries its PV
+        assert self.catools.cagets == [
+            (["A:D", "C:D"], "DOUBLE"),
+            (["C:D"], "DOUBLE"),
+        ]
+        assert self.catools.timeouts == [CA_CONNECT_BATCH_TIMEOUT, 5]
+        assert self.process.block_view("A").state.value == "Ready"
+        c = self.process.block_view("C")
+        assert c.state.value == "Fault"
+        assert c.health.value == "CA connect to C:D failed with never connected"
+
+    def test_slow_pv_connects_on_retry(self):
+        self.catools.slow.add("B:D")
+        self.add_block(
+            "B",
+            CADoublePart(name="a", description="desc", rbv="A:D"),
+            CADoublePart(name="d", description="desc", rbv="B:D"),
+        )
+        self.process.start()
+        assert self.catools.cagets == [
+            (["A:D", "B:D"], "DOUBLE"),
+            (["B:D"], "DOUBLE"),
+        ]
+        b = self.process.block_view("B")
+        assert b.state.value == "Ready"
+        assert b.a.value == 2.5
+        assert b.d.value == 4.5
+
+
+class TestMonitorRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.o = CAAttribute(NumberMeta("float64"), "DOUBLE", rbv="pv", min_delta=0.05)
+
+    def test_fast_updates_coalesced(self):
+        with patch("malcolm.modules.ca.util.sleep") as sleep_mock:
+            for i in range(100):
+                self.o._monitor_callback(cafloat(i))
+        # Callback didn't sleep, first value went straight through and the
+        # rest are waiting for min_delta to pass with only the latest kept
+        sleep_mock.assert_not_called()
+        assert self.o.attr.value == 0
+        assert self.o.dropped_updates == 98
+        sleep(0.1)
+        assert self.o.attr.value == 99
+
+    def test_disconnect_drops_pending(self):
+        self.o._monitor_callback(cafloat(1))
+        self.o._monitor_callback(cafloat(2))
+        self.o.disconnect()
+        sleep(0.1)
+        assert self.o.attr.value == 1
+        self.o._monitor_callback(cafloat(3))
+        assert self.o.attr.value == 3
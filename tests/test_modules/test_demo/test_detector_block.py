@@ -45,6 +45,7 @@ class TestDetectorBlock(unittest.TestCase):
             "completedSteps",
             "configuredSteps",
             "totalSteps",
+            "hookTimings",
             "validate",
             "configure",
             "run",
@@ -1,12 +1,22 @@
+import os
+import queue
+import shutil
+import socket
+import threading
 import unittest
 from collections import OrderedDict
 
-from mock import Mock, call
+from cothread.cosocket import socket as cosocket
+from mock import Mock
 
+from malcolm.core import Queue
+from malcolm.core.concurrency import Spawned
+from malcolm.modules.builtin.defines import tmp_dir
 from malcolm.modules.pandablocks.pandablocksclient import (
     BlockData,
     FieldData,
     PandABlocksClient,
+    TableFieldData,
 )
 
 
@@ -26,10 +36,25 @@ class PandABoxControlTest(unittest.TestCase):
 
         self.c.start(socket_cls=socket_cls)
 
+    def assert_sent(self, *messages):
+        # Messages may be coalesced into fewer sendall calls
+        sent = b"".join(c[0][0] for c in self.socket.sendall.call_args_list)
+        assert sent == b"".join(messages)
+
     def tearDown(self):
         if self.c.started:
             self.c.stop()
 
+    def test_send_many(self):
+        self.c._socket = Mock()
+        self.c._send_queue = queue.Queue()
+        self.c._response_queues = queue.Queue()
+        response_queues = self.c.send_many(["A?\n", "B?\n", "C?\n"])
+        self.c._send_queue.put((self.c.STOP, None))
+        self.c._send_loop()
+        self.c._socket.sendall.assert_called_once_with(b"A?\nB?\nC?\n")
+        assert [self.c._response_queues.get() for _ in range(3)] == response_queues
+
     def test_multiline_response_good(self):
         messages = ["!TTLIN 6\n", "!OUTENC 4\n!CAL", "C 2\n.\nblah"]
         self.start(messages)
@@ -68,19 +93,19 @@ class PandABoxControlTest(unittest.TestCase):
         self.start(messages)
         block_data = self.c.get_blocks_data()
         self.c.stop()
-        assert self.socket.sendall.call_args_list == [
-            call(b"*BLOCKS?\n"),
-            call(b"*DESC.TTLIN?\n"),
-            call(b"*DESC.TTLOUT?\n"),
-            call(b"TTLIN.*?\n"),
-            call(b"TTLOUT.*?\n"),
-            call(b"*DESC.TTLIN.TERM?\n"),
-            call(b"*DESC.TTLIN.VAL?\n"),
-            call(b"*ENUMS.TTLIN.TERM?\n"),
-            call(b"*ENUMS.TTLIN.VAL.CAPTURE?\n"),
-            call(b"*DESC.TTLOUT.VAL?\n"),
-            call(b"*ENUMS.TTLOUT.VAL?\n"),
-        ]
+        self.assert_sent(
+            b"*BLOCKS?\n",
+            b"*DESC.TTLIN?\n",
+            b"*DESC.TTLOUT?\n",
+            b"TTLIN.*?\n",
+            b"TTLOUT.*?\n",
+            b"*DESC.TTLIN.TERM?\n",
+            b"*DESC.TTLIN.VAL?\n",
+            b"*ENUMS.TTLIN.TERM?\n",
+            b"*ENUMS.TTLIN.VAL.CAPTURE?\n",
+            b"*DESC.TTLOUT.VAL?\n",
+            b"*ENUMS.TTLOUT.VAL?\n",
+        )
         assert list(block_data) == ["TTLIN", "TTLOUT"]
         in_fields = OrderedDict()
         in_fields["TERM"] = FieldData(
@@ -118,10 +143,10 @@ class PandABoxControlTest(unittest.TestCase):
         self.start(messages)
         changes = list(self.c.get_changes(include_errors=True))
         self.c.stop()
-        assert self.socket.sendall.call_args_list == [
-            call(b"*CHANGES?\n"),
-            call(b"SEQ1.TABLE?\n"),
-        ]
+        self.assert_sent(
+            b"*CHANGES?\n",
+            b"SEQ1.TABLE?\n",
+        )
         expected = OrderedDict()
         expected["PULSE0.WIDTH"] = "1.43166e+09"
         expected["PULSE1.WIDTH"] = "1.43166e+09"
@@ -134,6 +159,35 @@ class PandABoxControlTest(unittest.TestCase):
         expected["PULSE3.INP"] = Exception
         assert OrderedDict(changes) == expected
 
+    def test_changes_pipelined(self):
+        messages = [
+            """!PULSE0.WIDTH=1.43166e+09
+!SEQ1.TABLE<
+!PULSE0.INP (error)
+.
+""",
+            """!1
+!2
+!3
+.
+!PULSE0.WIDTH=2
+.
+""",
+        ]
+        self.start(messages)
+        changes, table_fields = self.c.get_changes_pipelined([])
+        assert changes == [("PULSE0.WIDTH", "1.43166e+09")]
+        assert table_fields == ["SEQ1.TABLE"]
+        changes, table_fields = self.c.get_changes_pipelined(table_fields)
+        self.c.stop()
+        # The table is fetched in the same batch as the next *CHANGES?
+        assert [c[0][0] for c in self.socket.sendall.call_args_list] == [
+            b"*CHANGES?\n",
+            b"SEQ1.TABLE?\n*CHANGES?\n",
+        ]
+        assert changes == [("SEQ1.TABLE", ["1", "2", "3"]), ("PULSE0.WIDTH", "2")]
+        assert table_fields == []
+
     def test_get_pcap_bits_fields(self):
         messages = (
             ["!BITS1 1 ext_out bits\n!BITS0 0 ext_out bits\n.\n"]
@@ -150,11 +204,11 @@ class PandABoxControlTest(unittest.TestCase):
         }
         assert self.c.get_pcap_bits_fields() == expected
         self.c.stop()
-        assert self.socket.sendall.call_args_list == [
-            call(b"PCAP.*?\n"),
-            call(b"PCAP.BITS0.BITS?\n"),
-            call(b"PCAP.BITS1.BITS?\n"),
-        ]
+        self.assert_sent(
+            b"PCAP.*?\n",
+            b"PCAP.BITS0.BITS?\n",
+            b"PCAP.BITS1.BITS?\n",
+        )
 
     def test_get_field(self):
         messages = "OK =32\n"
@@ -175,10 +229,10 @@ class PandABoxControlTest(unittest.TestCase):
         self.start(messages)
         self.c.set_fields({"PULSE0.WIDTH": 0, "PULSE0.DELAY": 5})
         self.c.stop()
-        assert sorted(self.socket.sendall.call_args_list) == [
-            call(b"PULSE0.DELAY=5\n"),
-            call(b"PULSE0.WIDTH=0\n"),
-        ]
+        self.assert_sent(
+            b"PULSE0.WIDTH=0\n",
+            b"PULSE0.DELAY=5\n",
+        )
 
     def test_set_table(self):
         messages = "OK\n"
@@ -215,17 +269,193 @@ class PandABoxControlTest(unittest.TestCase):
         self.start(messages)
         fields = self.c.get_table_fields("SEQ1", "TABLE")
         self.c.stop()
-        assert self.socket.sendall.call_args_list == [
-            call(b"SEQ1.TABLE.FIELDS?\n"),
-            call(b"*ENUMS.SEQ1.TABLE[].INPB?\n"),
-            call(b"*DESC.SEQ1.TABLE[].REPEATS?\n"),
-            call(b"*DESC.SEQ1.TABLE[].USE_INPA?\n"),
-            call(b"*DESC.SEQ1.TABLE[].STUFF?\n"),
-            call(b"*DESC.SEQ1.TABLE[].INPB?\n"),
-        ]
+        self.assert_sent(
+            b"SEQ1.TABLE.FIELDS?\n",
+            b"*ENUMS.SEQ1.TABLE[].INPB?\n",
+            b"*DESC.SEQ1.TABLE[].REPEATS?\n",
+            b"*DESC.SEQ1.TABLE[].USE_INPA?\n",
+            b"*DESC.SEQ1.TABLE[].STUFF?\n",
+            b"*DESC.SEQ1.TABLE[].INPB?\n",
+        )
         expected = OrderedDict()
         expected["REPEATS"] = (31, 0, "Repeats", None, False)
         expected["USE_INPA"] = (32, 32, "Use", None, False)
         expected["STUFF"] = (64, 54, "Stuff", None, False)
         expected["INPB"] = (38, 37, "Inp B", ["None", "First", "Second"], False)
         assert fields == expected
+
+    def test_table_fields_memoised(self):
+        fields = OrderedDict(REPEATS=TableFieldData(15, 0, "Repeats", None, False))
+        self.c._get_table_fields = Mock(return_value=fields)
+        assert self.c.get_table_fields("SEQ1", "TABLE") is fields
+        assert self.c.get_table_fields("SEQ1", "TABLE") is fields
+        self.c._get_table_fields.assert_called_once_with("SEQ1", "TABLE")
+
+
+class PandABlocksClientIntrospectionTest(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tmp_dir("config_dir").value
+        self.snapshot = os.path.join(self.config_dir, ".introspection")
+        self.c = self.make_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def make_client(self, idn="PandA SW: 2.1 FPGA: 0.1.9"):
+        c = PandABlocksClient("h", "p")
+        c.send_recv = Mock(return_value="OK =" + idn)
+        fields = OrderedDict()
+        fields["INP"] = FieldData("bit_mux", "", "Input", ["ZERO", "TTLIN1.VAL"])
+        fields["TABLE"] = FieldData("table", "", "Sequencer table", [])
+        blocks_data = OrderedDict(SEQ=BlockData(2, "Sequencer", fields))
+        c._get_blocks_data = Mock(return_value=blocks_data)
+        bits = OrderedDict()
+        bits["PCAP.BITS0.CAPTURE"] = ["TTLIN1.VAL", "TTLIN2.VAL", ""]
+        c._get_pcap_bits_fields = Mock(return_value=bits)
+        table_fields = OrderedDict()
+        table_fields["REPEATS"] = TableFieldData(15, 0, "Repeats", None, False)
+        table_fields["TRIGGER"] = TableFieldData(19, 16, "Trigger", ["Immediate"], True)
+        c._get_table_fields = Mock(return_value=table_fields)
+        return c
+
+    def introspect(self, c):
+        return (
+            c.get_blocks_data(),
+            c.get_pcap_bits_fields(),
+            c.get_table_fields("SEQ1", "TABLE"),
+        )
+
+    def test_snapshot_round_trip(self):
+        expected = self.introspect(self.c)
+        self.c.save_introspection(self.snapshot)
+        assert os.listdir(self.config_dir) == [".introspection"]
+        c = self.make_client()
+        assert c.load_introspection(self.snapshot)
+        assert self.introspect(c) == expected
+        c._get_blocks_data.assert_not_called()
+        c._get_pcap_bits_fields.assert_not_called()
+        c._get_table_fields.assert_not_called()
+        assert not c.refresh_introspection()
+        c._get_table_fields.assert_called_once_with("SEQ1", "TABLE")
+
+    def test_snapshot_different_idn(self):
+        self.introspect(self.c)
+        self.c.save_introspection(self.snapshot)
+        c = self.make_client(idn="PandA SW: 2.1 FPGA: 0.2.0")
+        assert not c.load_introspection(self.snapshot)
+        self.introspect(c)
+        c._get_blocks_data.assert_called_once_with()
+
+    def test_snapshot_missing_or_corrupt(self):
+        assert not self.c.load_introspection(self.snapshot)
+        with open(self.snapshot, "w") as f:
+            f.write('{"idn": "PandA SW: 2.1 FPGA: 0.1.9", "blocks": ')
+        assert not self.c.load_introspection(self.snapshot)
+
+    def test_refresh_changed(self):
+        self.introspect(self.c)
+        self.c.save_introspection(self.snapshot)
+        c = self.make_client()
+        assert c.load_introspection(self.snapshot)
+        self.introspect(c)
+        c._get_pcap_bits_fields.return_value = OrderedDict()
+        assert c.refresh_introspection()
+        assert c.get_pcap_bits_fields() == {}
+
+
+class FakePandA(threading.Thread):
+    """A TCP server that answers introspection and *CHANGES? like a PandA"""
+
+    def __init__(self, num_blocks, num_fields):
+        super().__init__(daemon=True)
+        self.server = socket.socket()
+        self.server.bind(("localhost", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.blocks = "".join(f"!BLOCK{i} 4\n" for i in range(num_blocks)) + ".\n"
+        self.fields = "".join(
+            f"!F{i} {i} param enum\n!O{i} {i} pos_out\n" for i in range(num_fields)
+        )
+        self.fields += ".\n"
+        self.changes = "".join(f"!BLOCK{i}1.O0=1\n" for i in range(num_blocks))
+        self.changes += ".\n"
+        # Every request line received, in order
+        self.requests = []
+
+    def respond(self, line):
+        self.requests.append(line)
+        if line == "*IDN?":
+            return "OK =PandA SW: 2.1 FPGA: 0.1.9\n"
+        elif line == "*BLOCKS?":
+            return self.blocks
+        elif line == "*CHANGES?":
+            return self.changes
+        elif line.startswith("*DESC."):
+            return "OK =Description\n"
+        elif line.startswith("*ENUMS."):
+            return "!ZERO\n!ONE\n.\n"
+        elif line.endswith(".*?"):
+            return self.fields
+        else:
+            return "ERR Unknown request\n"
+
+    def run(self):
+        conn, _ = self.server.accept()
+        buf = b""
+        while True:
+            rx = conn.recv(65536)
+            if not rx:
+                break
+            *lines, buf = (buf + rx).split(b"\n")
+            if lines:
+                resp = "".join(self.respond(line.decode()) for line in lines)
+                conn.sendall(resp.encode())
+        conn.close()
+        self.server.close()
+
+
+class PandABlocksClientFakePandATest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakePandA(num_blocks=40, num_fields=30)
+        self.server.start()
+        # Use cothread like PandAManagerController does
+        self.c = PandABlocksClient("localhost", self.server.port, Queue)
+        self.c.start(lambda func: Spawned(func, (), {}), cosocket)
+
+    def tearDown(self):
+        self.c.stop()
+
+    def test_introspection_batches_requests(self):
+        self.c._socket.sendall = Mock(wraps=self.c._socket.sendall)
+        blocks = self.c._get_blocks_data()
+        assert len(blocks) == 40
+        assert len(blocks["BLOCK0"].fields) == 60
+        # *BLOCKS?, then a batch of block descriptions and one of block fields,
+        # then a batch of field descriptions and one of enums for each block,
+        # rather than one sendall for each of the 3681 requests
+        assert self.c._socket.sendall.call_count == 3 + 2 * 40
+        assert len(self.server.requests) == 3681
+
+    def test_snapshot_only_sends_idn(self):
+        self.c.get_blocks_data()
+        config_dir = tmp_dir("config_dir").value
+        try:
+            snapshot = os.path.join(config_dir, ".introspection")
+            self.c.save_introspection(snapshot)
+            # FakePandA only takes one connection, so share it
+            c = PandABlocksClient("localhost", self.server.port, Queue)
+            c.send_recv = self.c.send_recv
+            self.server.requests.clear()
+            assert c.load_introspection(snapshot)
+            assert len(c.get_blocks_data()) == 40
+        finally:
+            shutil.rmtree(config_dir)
+        # Loading the snapshot only needs *IDN? rather than 2480 requests
+        assert self.server.requests == ["*IDN?"]
+
+    def test_changes_sends_one_request(self):
+        for _ in range(100):
+            changes = list(self.c.get_changes())
+            assert len(changes) == 40
+        # No table fields changed, so each poll is just the *CHANGES?
+        assert self.server.requests == ["*CHANGES?"] * 100
@@ -1,3 +1,4 @@
+import os
 import shutil
 import unittest
 from collections import OrderedDict
@@ -24,6 +25,7 @@ class PandABlocksManagerControllerTest(unittest.TestCase):
         )
         self.client = self.o._client
         self.client.started = False
+        self.client.load_introspection.return_value = False
         blocks_data = OrderedDict()
         fields = OrderedDict()
         fields["INP"] = FieldData("pos_mux", "", "Input A", ["ZERO", "COUNTER.OUT"])
@@ -68,6 +70,73 @@ class PandABlocksManagerControllerTest(unittest.TestCase):
         self.process.stop()
         shutil.rmtree(self.config_dir.value)
 
+    def test_introspection_snapshot_saved(self):
+        snapshot = os.path.join(self.config_dir.value, "P", ".introspection")
+        self.client.load_introspection.assert_called_once_with(snapshot)
+        self.client.save_introspection.assert_called_once_with(snapshot)
+        self.client.refresh_introspection.assert_not_called()
+        assert self.process.block_view("P").design.meta.choices == [""]
+
+    def test_introspection_snapshot_changed(self):
+        snapshot = os.path.join(self.config_dir.value, "P", ".introspection")
+        self.client.refresh_introspection.return_value = False
+        self.o._check_introspection(snapshot)
+        health = self.process.block_view("P").health
+        assert health.alarm.severity == AlarmSeverity.NO_ALARM
+        self.client.refresh_introspection.return_value = True
+        self.o._check_introspection(snapshot)
+        assert self.client.save_introspection.call_count == 2
+        assert health.value == (
+            "PandA has changed since the Blocks were created, restart to update"
+        )
+        assert health.alarm.severity == AlarmSeverity.MAJOR_ALARM
+
+    def test_adapt_poll_period(self):
+        # Speeds up while changes are flowing, down to a tenth of poll_period
+        assert self.o._adapt_poll_period(1000, True) == 500
+        assert self.o._adapt_poll_period(150, True) == 100
+        # Backs off when idle, up to ten times poll_period
+        assert self.o._adapt_poll_period(1000, False) == 2000
+        assert self.o._adapt_poll_period(8000, False) == 10000
+
+    @patch(
+        "malcolm.modules.pandablocks.controllers."
+        "pandamanagercontroller.POLL_PERIOD_REPORT",
+        0,
+    )
+    def test_adaptive_poll_loop(self):
+        self.o.stop_poll_loop()
+        self.o._adaptive_poll = True
+        self.o._poll_period = 0.01
+        polls = [
+            ([("PCOMP.STEP", "5")], ["PCOMP.TABLE"]),
+            ([("PCOMP.START", "3"), ("PCOMP.STEP", "6")], []),
+            ([], []),
+        ]
+
+        def get_changes_pipelined(table_fields):
+            if len(polls) == 1:
+                self.o._stop_queue.put(None)
+            return polls.pop(0)
+
+        self.client.get_changes_pipelined.side_effect = get_changes_pipelined
+        self.o._poll_spawned = self.process.spawn(self.o._poll_loop)
+        self.o._poll_spawned.wait(timeout=5)
+        self.o._poll_spawned = None
+        # Tables that changed are fetched with the next poll
+        assert [c[0][0] for c in self.client.get_changes_pipelined.call_args_list] == [
+            [],
+            ["PCOMP.TABLE"],
+            [],
+        ]
+        self.client.get_changes.assert_called_once_with()
+        b = self.process.block_view("P")
+        assert self.process.block_view("P:PCOMP").step.value == 6
+        assert b.lastPollChanges.value == 0
+        assert 0 < b.lastPollLatency.value < 1
+        # Went faster after changes
+        assert b.lastPollPeriod.value < 0.01
+
     def test_no_connection(self):
         o = PandAManagerController(
             mri="MRI",
@@ -1,6 +1,8 @@
 import unittest
 from collections import OrderedDict
 
+import numpy as np
+from annotypes import Array
 from mock import Mock
 
 from malcolm.core import BooleanArrayMeta, ChoiceArrayMeta, NumberArrayMeta, TableMeta
@@ -143,6 +145,78 @@ class PandABoxTablePartTest(unittest.TestCase):
         assert table.time2 == [4097, 200, 200]
         assert table.outa2 == [False, True, False]
 
+    def test_table_from_list_bad_value(self):
+        with self.assertRaises(ValueError):
+            self.o.table_from_list(["1", "2", "x", "4"])
+
+    def test_list_from_table_bad_label(self):
+        table = self.meta.validate(
+            self.meta.table_cls.from_rows([[32, "b", -1, 4096, True, 4097, False]])
+        )
+        table.trigger = Array[str](["d"])
+        with self.assertRaises(ValueError):
+            self.o.list_from_table(table)
+
+    def test_set_field(self):
+        table = self.meta.validate(
+            self.meta.table_cls.from_rows([[32, "b", -1, 4096, True, 4097, False]])
+        )
+        self.o.set_field(table)
+        self.client.set_table.assert_called_once_with(
+            "SEQ1", "TABLE", [0x00110020, 4294967295, 4096, 4097]
+        )
+
+
+SEQ_TRIGGERS = [
+    "Immediate",
+    "BITA=0",
+    "BITA=1",
+    "BITB=0",
+    "BITB=1",
+    "BITC=0",
+    "BITC=1",
+    "POSA>=POSITION",
+    "POSA<=POSITION",
+    "POSB>=POSITION",
+    "POSB<=POSITION",
+    "POSC>=POSITION",
+    "POSC<=POSITION",
+]
+
+
+class PandABoxTablePartSeqTableTest(unittest.TestCase):
+    def setUp(self):
+        # The fields of a real SEQ table
+        fields = OrderedDict()
+        fields["REPEATS"] = TableFieldData(15, 0, "Repeats", None, False)
+        fields["TRIGGER"] = TableFieldData(19, 16, "Trigger", SEQ_TRIGGERS, False)
+        fields["POSITION"] = TableFieldData(63, 32, "Position", None, True)
+        fields["TIME1"] = TableFieldData(95, 64, "Time Phase A", None, False)
+        fields["TIME2"] = TableFieldData(127, 96, "Time Phase B", None, False)
+        for phase, bits_lo in (("1", 20), ("2", 26)):
+            for i, out in enumerate("ABCDEF"):
+                bit = bits_lo + i
+                fields[f"OUT{out}{phase}"] = TableFieldData(bit, bit, "", None, False)
+        client = Mock()
+        client.get_table_fields.return_value = fields
+        self.meta = TableMeta("Seq table", writeable=True)
+        self.o = PandATablePart(client, self.meta, "SEQ1", "TABLE")
+        # 4096 rows of random values with valid triggers
+        rng = np.random.RandomState(0)
+        int_matrix = rng.randint(0, 2**32, (4096, 4), dtype=np.uint64)
+        int_matrix[:, 0] &= 0xFFF0FFFF
+        triggers = rng.randint(0, len(SEQ_TRIGGERS), 4096).astype(np.uint64)
+        int_matrix[:, 0] |= triggers << np.uint64(16)
+        self.int_values = int_matrix.astype(np.uint32).ravel()
+
+    def test_4096_row_round_trip(self):
+        str_values = [str(x) for x in self.int_values]
+        table = self.o.table_from_list(str_values)
+        assert len(table.trigger) == 4096
+        assert set(table.trigger) <= set(SEQ_TRIGGERS)
+        int_values = self.o.list_from_table(table)
+        assert (int_values == self.int_values).all()
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -1,6 +1,9 @@
+import os
+import time
 import unittest
 from collections import OrderedDict
 
+import pytest
 from mock import MagicMock, call
 
 from malcolm.core import TimeStamp
@@ -160,6 +163,28 @@ class PandABussesPartTest(unittest.TestCase):
         assert list(self.o.bits.value.rows())[2] == ["B1.B2", False, False]
         assert list(self.o.bits.value.rows())[3] == ["B1.B3", True, False]
 
+    def test_unchanged_rows_not_published(self):
+        ts = TimeStamp()
+        changes = {"B1.B1": True, "B1.P0": "100", "B1.P0.UNITS": "mm"}
+        self.o.handle_changes(changes, ts)
+        bits_value = self.o.bits.value
+        positions_value = self.o.positions.value
+        self.o.handle_changes(changes, TimeStamp())
+        assert self.o.bits.value is bits_value
+        assert self.o.positions.value is positions_value
+        assert self.o.bits.timeStamp is ts
+        assert self.o.positions.timeStamp is ts
+
+    def test_only_changed_columns_copied(self):
+        old_value = self.o.positions.value
+        self.o.handle_changes({"B1.P1.UNITS": "mm"}, TimeStamp())
+        new_value = self.o.positions.value
+        assert new_value.units == ["", "mm", "", ""]
+        assert old_value.units == [""] * 4
+        # Value is recalculated, but hasn't changed
+        for column in ("name", "value", "scale", "offset", "capture"):
+            assert new_value[column] is old_value[column]
+
     def test_bit_capture_change(self):
         ts = TimeStamp()
         changes = {"PCAP.BITS0.CAPTURE": "Value"}
@@ -175,3 +200,37 @@ class PandABussesPartTest(unittest.TestCase):
         self.o._client.set_fields.assert_called_once_with(
             {"PCAP.BITS0.CAPTURE": "Value"}
         )
+
+
+class PandABussesPartBenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        self.o = PandABussesPart("busses", MagicMock())
+        self.o.setup(MagicMock())
+        # 128 bits and 32 positions, like a real PandA
+        pcap_bits_fields = OrderedDict()
+        for i in range(4):
+            pcap_bits_fields[f"PCAP.BITS{i}.CAPTURE"] = [
+                f"B{i}.B{j}" for j in range(32)
+            ]
+        self.pos_names = [f"P{i // 4}.VAL{i % 4}" for i in range(32)]
+        self.o.create_busses(pcap_bits_fields, self.pos_names)
+
+    def test_poll_loop(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in os.environ:
+            pytest.skip("performance test only")
+
+        # Every position and a quarter of the bits change at each poll
+        polls = []
+        for i in range(1000):
+            changes = {name: str(i * j) for j, name in enumerate(self.pos_names)}
+            for j in range(32):
+                changes[f"B{j % 4}.B{j}"] = bool((i + j) % 2)
+            polls.append(changes)
+        start = time.time()
+        for changes in polls:
+            self.o.handle_changes(changes, TimeStamp())
+        elapsed = time.time() - start
+        assert self.o.positions.value.value[31] == 999 * 31
+        assert not self.o.bits.value.value[1]
+        assert elapsed < 0.5
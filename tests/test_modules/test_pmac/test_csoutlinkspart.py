@@ -4,6 +4,7 @@ from mock import patch
 
 from malcolm.core import Process
 from malcolm.modules.builtin.controllers import StatefulController
+from malcolm.modules.ca.util import CA_CONNECT_BATCH_TIMEOUT
 from malcolm.modules.pmac.parts import CSSourcePortsPart
 
 
@@ -31,7 +32,8 @@ class TestCSOutlinksPart(unittest.TestCase):
             ["PV:PRE:Port"],
             datatype=self.catools.DBR_STRING,
             format=self.catools.FORMAT_CTRL,
-            throw=True,
+            timeout=CA_CONNECT_BATCH_TIMEOUT,
+            throw=False,
         )
         assert list(self.b) == [
             "meta",
@@ -1186,8 +1186,9 @@ class TestPMACChildPart(ChildTestCase):
             velocityMode=pytest.approx(vm),
         )
 
-    def long_configure(self, row_gate=False):
-        # test 4,000,000 points configure - used to check performance
+    def long_configure(self, row_gate=False, x_steps=4000, y_steps=1000, budget=3.0):
+        # test an x_steps * y_steps points configure - used to check performance
+        # against a budget in seconds
         if row_gate:
             infos = [
                 MotionTriggerInfo(MotionTrigger.ROW_GATE),
@@ -1204,7 +1205,6 @@ class TestPMACChildPart(ChildTestCase):
             y_acceleration=30,
         )
         axes_to_scan = ["x", "y"]
-        x_steps, y_steps = 4000, 1000
         steps_to_do = x_steps * y_steps
         xs = LineGenerator("x", "mm", 0.0, 10, x_steps, alternate=True)
         ys = LineGenerator("y", "mm", 0.0, 8, y_steps)
@@ -1216,18 +1216,29 @@ class TestPMACChildPart(ChildTestCase):
             self.context, 0, steps_to_do, {"part": infos}, generator, axes_to_scan
         )
         elapsed = datetime.now() - start
-        # todo goal was sub 1 second but we achieved sub 3 secs
-        assert elapsed.total_seconds() < 3.0
+        assert elapsed.total_seconds() < budget
 
     def test_configure_long_trajectory(self):
         # Skip on GitHub Actions and GitLab CI
         if "CI" in environ:
             pytest.skip("performance test only")
+        # 4,000,000 points, todo goal was sub 1 second but we achieved sub 3 secs
         # brick triggered
         self.long_configure(False)
         # 'sparse' trajectory linear point removal
         self.long_configure(True)
 
+    def test_configure_10M_point_trajectory(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in environ:
+            pytest.skip("performance test only")
+        # 10,000,000 points is 2.5 times the work, so 2.5 times the budget.
+        # Takes ~0.9s with row gating
+        # brick triggered
+        self.long_configure(False, x_steps=10000, budget=7.5)
+        # 'sparse' trajectory linear point removal
+        self.long_configure(True, x_steps=10000, budget=7.5)
+
     def test_long_turnaround(self):
         """
         Verify that if the turnaround time exceeds maximum time between PVT
@@ -1398,6 +1409,14 @@ class TestPMACChildPart(ChildTestCase):
             len(failed_list) == 0
         ), f"Failed with tweaking a second time on following inputs: {failed_list}"
 
+    def test_time_array_to_ticks_carries_overflow(self):
+        # 1.3 ticks each, so 10 chunks of 7 should total 91 ticks
+        chunks = [self.o.time_array_to_ticks(np.full(7, 1.3e-6)) for _ in range(10)]
+        ticks = np.concatenate(chunks)
+        assert ticks.dtype == np.int32
+        assert set(ticks) == {1, 2}
+        assert ticks.sum() == 91
+
     def test_add_sparse_point(self):
         # Set up the part
         self.o.output_triggers = MotionTrigger.ROW_GATE
@@ -1,5 +1,6 @@
 import unittest
 
+from mock import patch
 from scanpointgenerator import Point
 
 from malcolm.modules.pmac.infos import MotorInfo
@@ -116,3 +117,49 @@ class ProfileBetweenPoints(unittest.TestCase):
         }
         self.assertEqual(time_arrays, expected_time_arrays)
         self.assertEqual(velocity_arrays, expected_velocity_arrays)
+
+    def make_point(self, x, y):
+        position = {"sample_y": y, "sample_x": x}
+        point = Point()
+        point.lower = position
+        point.positions = position
+        point.upper = position
+        point.duration = 0.1
+        return point
+
+    def test_cache_reuses_identical_turnarounds(self):
+        cache = {}
+        with patch.object(
+            MotorInfo,
+            "make_velocity_profile",
+            side_effect=MotorInfo.make_velocity_profile,
+            autospec=True,
+        ) as make_velocity_profile:
+            first = profile_between_points(
+                self.axis_mapping,
+                self.make_point(1.5, 1.0),
+                self.make_point(1.0, 1.0),
+                cache=cache,
+            )
+            calls = make_velocity_profile.call_count
+            # Same shape of turnaround, somewhere else, with rounding errors
+            second = profile_between_points(
+                self.axis_mapping,
+                self.make_point(2.5, 2.0000000000000004),
+                self.make_point(2.0000000000000004, 2.0000000000000004),
+                cache=cache,
+            )
+            assert make_velocity_profile.call_count == calls
+            # A different one is calculated
+            profile_between_points(
+                self.axis_mapping,
+                self.make_point(2.5, 2.0),
+                self.make_point(1.0, 2.0),
+                cache=cache,
+            )
+            assert make_velocity_profile.call_count == 2 * calls
+        assert len(cache) == 2
+        assert second == first
+        assert first == profile_between_points(
+            self.axis_mapping, self.make_point(1.5, 1.0), self.make_point(1.0, 1.0)
+        )
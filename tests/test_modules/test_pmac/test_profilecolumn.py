@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import numpy as np
+
+from malcolm.modules.pmac.util import ProfileColumn
+
+
+class TestProfileColumn(TestCase):
+    def setUp(self):
+        self.o = ProfileColumn(np.float64, capacity=4)
+
+    def test_append_and_index(self):
+        self.o.append(1.0)
+        self.o.append(2.0)
+        assert len(self.o) == 2
+        assert self.o[-1] == 2.0
+        self.o[-1] = 3.0
+        assert self.o[:].tolist() == [1.0, 3.0]
+
+    def test_take_leaves_remnant(self):
+        self.o.extend([1.0, 2.0, 3.0])
+        assert self.o.take(2).tolist() == [1.0, 2.0]
+        assert len(self.o) == 1
+        assert self.o[0] == 3.0
+        assert self.o.take(2).tolist() == [3.0]
+        assert not self.o
+
+    def test_extend_reuses_storage(self):
+        self.o.extend([1.0, 2.0, 3.0])
+        taken = self.o.take(2)
+        data = self.o._data
+        self.o.extend([4.0, 5.0, 6.0])
+        assert self.o._data is data
+        assert self.o[:].tolist() == [3.0, 4.0, 5.0, 6.0]
+        # The copy we took has not been overwritten
+        assert taken.tolist() == [1.0, 2.0]
+
+    def test_extend_grows(self):
+        self.o.extend(np.arange(10))
+        self.o.append(10)
+        assert self.o[:].tolist() == list(range(11))
+        assert len(self.o._data) == 16
+
+    def test_repr(self):
+        self.o.extend([1.0, 2.0])
+        assert repr(self.o) == "[1.0, 2.0]"
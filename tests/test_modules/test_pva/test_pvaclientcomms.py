@@ -0,0 +1,35 @@
+import unittest
+
+from mock import MagicMock
+from p4p.client.raw import RemoteError
+
+from malcolm.core import Queue, TimeoutError
+from malcolm.modules.pva.controllers import PvaClientComms
+
+
+class TestPvaClientComms(unittest.TestCase):
+    def setUp(self):
+        self.o = PvaClientComms(mri="mri")
+        self.o._ctxt = MagicMock(name="ctxt_mock")
+        self.o._queues = {"block": Queue()}
+
+    def test_send_batch_put(self):
+        self.o.send_batch_put("block", dict(attr1=32, attr2="hello"))
+        self.o._ctxt.put.assert_called_once_with(
+            "block",
+            {"attr1.value": 32, "attr2.value": "hello"},
+            "attr1.value,attr2.value",
+        )
+
+    def test_send_batch_put_exports_waits_for_reconnect(self):
+        self.o._ctxt.put.side_effect = RemoteError("Structure changed")
+        self.o._queues["block"].put(None)
+        self.o.send_batch_put("block", dict(exports=[], attr1=32))
+        # Consumed the reconnect
+        with self.assertRaises(TimeoutError):
+            self.o._queues["block"].get(timeout=0)
+
+    def test_send_batch_put_raises_remote_error(self):
+        self.o._ctxt.put.side_effect = RemoteError("Bad value")
+        with self.assertRaises(RemoteError):
+            self.o.send_batch_put("block", dict(attr1=32, attr2="hello"))
@@ -3,7 +3,7 @@ from collections import OrderedDict
 
 from mock import MagicMock, call, patch
 
-from malcolm.core import Error, Method
+from malcolm.core import BatchPut, Error, Method, Return
 from malcolm.modules.pva.controllers import BlockHandler, PvaServerComms
 
 
@@ -131,6 +131,48 @@ class TestBlockHandler(unittest.TestCase):
 
         self.op_mock.done.assert_called_once_with(error=f"str: {error_message}")
 
+    def _batch_put_with_response(self, response):
+        # Put to two attributes of the Block at once
+        self.value_mock.changedSet.return_value = {
+            "attr1",
+            "attr1.value",
+            "attr2",
+            "attr2.value",
+        }
+        self.block_handler.put_paths = {"attr1.value", "attr2.value", "attr3.value"}
+        values = dict(attr1=32, attr2="hello")
+        self.value_mock.__getitem__.side_effect = lambda k: dict(value=values[k])
+
+        def mock_handle_request(request, external):
+            assert external
+            request.callback(response)
+            return MagicMock(name="future_mock")
+
+        self.controller_mock.mri = "block"
+        self.controller_mock.handle_request.side_effect = mock_handle_request
+
+        with patch(
+            "malcolm.modules.pva.controllers.pvaservercomms.convert_value_to_dict",
+            lambda v: v,
+        ):
+            self.block_handler.put(self.pv_mock, self.op_mock)
+
+        self.controller_mock.handle_request.assert_called_once()
+        batch_put = self.controller_mock.handle_request.call_args[0][0]
+        assert isinstance(batch_put, BatchPut)
+        assert batch_put.path == ["block"]
+        assert batch_put.values == values
+
+    def test_put_to_many_attributes_sends_batch_put(self):
+        self._batch_put_with_response(Return())
+
+        self.op_mock.done.assert_called_once_with()
+
+    def test_batch_put_handles_Error(self):
+        self._batch_put_with_response(Error(message=ValueError("Bad value")))
+
+        self.op_mock.done.assert_called_once_with(error="ValueError: Bad value")
+
 
 class TestPvaServerComms(unittest.TestCase):
     def setUp(self):
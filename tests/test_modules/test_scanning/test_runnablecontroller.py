@@ -1,3 +1,4 @@
+import json
 import shutil
 import unittest
 from typing import Optional
@@ -6,6 +7,7 @@ import cothread
 import numpy as np
 import pytest
 from annotypes import Anno, add_call_types
+from mock import Mock
 from scanpointgenerator import (
     CompoundGenerator,
     ConcatGenerator,
@@ -19,8 +21,12 @@ from malcolm.core import (
     AlarmSeverity,
     AlarmStatus,
     Context,
+    Info,
     PartRegistrar,
+    Post,
     Process,
+    Queue,
+    Return,
 )
 from malcolm.modules import builtin, scanning
 from malcolm.modules.builtin.defines import tmp_dir
@@ -28,6 +34,7 @@ from malcolm.modules.demo.blocks import detector_block, motion_block
 from malcolm.modules.demo.parts import MotionChildPart
 from malcolm.modules.demo.parts.motionchildpart import AExceptionStep
 from malcolm.modules.scanning.controllers import RunnableController
+from malcolm.modules.scanning.controllers.runnablecontroller import HOOK_TIMINGS_LENGTH
 from malcolm.modules.scanning.hooks import (
     AAxesToMove,
     ABreakpoints,
@@ -36,6 +43,7 @@ from malcolm.modules.scanning.hooks import (
     AGenerator,
     AStepsToDo,
     PreRunHook,
+    ReportStatusHook,
     UInfos,
     ValidateHook,
 )
@@ -56,6 +64,11 @@ class MisbehavingPauseException(Exception):
     pass
 
 
+class StatusInfo(Info):
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
 class MisbehavingPart(MotionChildPart):
     def __init__(
         self,
@@ -69,12 +82,19 @@ class MisbehavingPart(MotionChildPart):
             name, mri, initial_visibility=initial_visibility, stateful=stateful
         )
         self.validate_duration = validate_duration
+        # A live value reported to other parts
+        self.status = StatusInfo(0)
 
     def setup(self, registrar):
         super(MisbehavingPart, self).setup(registrar)
+        self.register_hooked(ReportStatusHook, self.on_report_status)
         self.register_hooked(ValidateHook, self.validate)
         self.register_hooked(PreRunHook, self.on_pre_run)
 
+    @add_call_types
+    def on_report_status(self) -> UInfos:
+        return self.status
+
     @add_call_types
     def validate(self, generator: AGenerator) -> UInfos:
         # Always tweak to the same value
@@ -363,6 +383,69 @@ class TestRunnableController(unittest.TestCase):
         self.b.run()
         self.checkState(self.ss.FINISHED)
 
+    def test_hook_timings(self):
+        self.prepare_half_run()
+        table = self.b.hookTimings.value
+        rows = [row for row in table.rows() if row[1] == "part"]
+        hooks = [row[0] for row in rows]
+        assert hooks == [
+            "InitHook",
+            "LayoutHook",
+            "ReportStatusHook",
+            "ValidateHook",
+            "ValidateHook",
+            "PreConfigureHook",
+            "ReportStatusHook",
+            "ConfigureHook",
+        ]
+        for _, _, start, end in rows:
+            assert start <= end
+        assert list(table.start) == sorted(table.start)
+        dumped = json.loads(self.c.dump_hook_timings())
+        assert dumped["hook"] == list(table.hook)
+        assert dumped["end"] == list(table.end)
+
+    def test_validate_cache(self):
+        compound = CompoundGenerator([LineGenerator("x", "mm", 0, 2, 3)], [], [], 0.1)
+        first = self.b.validate(generator=compound, axesToMove=["x"])
+        hooks_run = len(self.c.hook_timings.value.hook)
+        second = self.b.validate(generator=compound, axesToMove=["x"])
+        assert (self.c.validate_cache_misses, self.c.validate_cache_hits) == (1, 1)
+        assert second.to_dict() == first.to_dict()
+        # The parts reported their status, but were not asked to validate again
+        assert self.c.hook_timings.value.hook[hooks_run:] == ["ReportStatusHook"]
+        # Different params are a miss
+        self.b.validate(generator=compound, axesToMove=["x"], exceptionStep=1)
+        assert (self.c.validate_cache_misses, self.c.validate_cache_hits) == (2, 1)
+        # As is anything after a part is modified
+        self.c.update_modified()
+        self.b.validate(generator=compound, axesToMove=["x"])
+        assert (self.c.validate_cache_misses, self.c.validate_cache_hits) == (3, 1)
+        # Or when a part reports a different status
+        self.part.status = StatusInfo(1)
+        self.b.validate(generator=compound, axesToMove=["x"])
+        assert (self.c.validate_cache_misses, self.c.validate_cache_hits) == (4, 1)
+        # And configure can use what validate worked out
+        self.b.configure(generator=compound, axesToMove=["x"])
+        assert (self.c.validate_cache_misses, self.c.validate_cache_hits) == (4, 2)
+        self.checkState(self.ss.ARMED)
+
+    def test_hook_timings_ring_buffer(self):
+        hooks = []
+        for i in range(HOOK_TIMINGS_LENGTH + 5):
+            hook = Mock(start_time=float(i), end_time=i + 0.5)
+            hook.name = "RunHook"
+            hook.child.name = f"part{i}"
+            hooks.append(hook)
+        # A hook that never got started is not recorded
+        hooks.append(Mock(start_time=None, end_time=None))
+        self.c.update_hook_timings(hooks)
+        table = self.c.hook_timings.value
+        assert len(table.part) == HOOK_TIMINGS_LENGTH
+        assert table.part[0] == "part5"
+        assert table.start[-1] == HOOK_TIMINGS_LENGTH + 4
+        assert table.end[-1] == HOOK_TIMINGS_LENGTH + 4.5
+
     def test_abort_during_run(self):
         self.prepare_half_run()
         self.b.run()
@@ -587,6 +670,39 @@ class TestRunnableController(unittest.TestCase):
         assert self.part.pre_run_test
 
 
+class TestRunnableControllerRequestWorkers(unittest.TestCase):
+    def setUp(self):
+        # A single worker for requests from outside the Process
+        self.p = Process("process", request_workers=1)
+        self.config_dir = tmp_dir("config_dir")
+        for c in motion_block(mri="childBlock", config_dir=self.config_dir.value):
+            self.p.add_controller(c)
+        self.c = RunnableController(mri="mainBlock", config_dir=self.config_dir.value)
+        self.c.add_part(MotionChildPart(mri="childBlock", name="part"))
+        self.p.add_controller(self.c)
+        self.p.start()
+
+    def tearDown(self):
+        self.p.stop(timeout=1)
+        shutil.rmtree(self.config_dir.value)
+
+    def test_configure_hook_puts_to_child(self):
+        # The ConfigureHook moves the child to the first point, which must not
+        # wait for the worker that is running configure
+        line = LineGenerator("x", "mm", 1, 2, 2)
+        generator = CompoundGenerator([line], [], [], 0.1)
+        q = Queue()
+        post = Post(
+            path=["mainBlock", "configure"],
+            parameters=dict(generator=generator.to_dict(), axesToMove=["x"]),
+        )
+        post.set_callback(q.put)
+        self.c.handle_request(post, external=True)
+        response = q.get(timeout=5)
+        assert isinstance(response, Return), response
+        assert self.c.state.value == "Armed"
+
+
 class TestRunnableControllerBreakpoints(unittest.TestCase):
     def setUp(self):
         self.p = Process("process1")
@@ -1438,6 +1554,32 @@ class TestRunnableControllerValidation(unittest.TestCase):
         assert actual["axesToMove"] == ["x"]
         assert actual["detectors"].to_dict() == detectors.to_dict()
 
+    def test_validate_cache_returns_fresh_tweaked_generator(self):
+        self._add_detector_block_and_part(
+            self.detector_one_mri, self.detector_one_part_name
+        )
+        self._start_process()
+        compound_generator = self._get_compound_generator(0.0)
+        detectors = self._get_detector_table(0.89995)
+
+        first = self.b.validate(
+            generator=compound_generator,
+            axesToMove=["x"],
+            fileDir="/tmp",
+            detectors=detectors,
+        )
+        first["generator"].duration = 0.0
+        second = self.b.validate(
+            generator=compound_generator,
+            axesToMove=["x"],
+            fileDir="/tmp",
+            detectors=detectors,
+        )
+
+        assert self.c.validate_cache_hits == 1
+        assert np.isclose(second["generator"].duration, 1.0)
+        assert second["detectors"].to_dict() == detectors.to_dict()
+
     def test_validate_single_detector_succeeds_with_both_duration_and_exposure(self):
         # Set up a single detector
         self._add_detector_block_and_part(
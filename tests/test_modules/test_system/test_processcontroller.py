@@ -7,9 +7,10 @@ from math import floor
 
 import cothread
 from cothread import catools
+from mock import Mock
 
 from malcolm import __version__
-from malcolm.core import Process
+from malcolm.core import Get, Process, Subscribe
 from malcolm.modules.builtin.defines import tmp_dir
 from malcolm.modules.system.controllers import ProcessController
 from malcolm.modules.system.defines import redirector_iocs
@@ -37,6 +38,46 @@ class TestProcessController(unittest.TestCase):
         hostname = hostname if len(hostname) < 39 else hostname[:35] + "..."
         assert self.b.hostname.value == hostname
 
+    def test_request_stats(self):
+        self.process.get_controller("MyMRI").handle_request(
+            Get(path=["MyMRI", "hostname", "value"])
+        ).wait(1)
+        self.o.update_request_stats()
+        table = self.b.requestStats.value
+        i = table.mri.index("MyMRI")
+        assert table.queued[i] == 0
+        assert table.active[i] == 0
+        assert table.completed[i] > 0
+        assert table.completed[i] == (
+            table.under1ms[i]
+            + table.under10ms[i]
+            + table.under100ms[i]
+            + table.under1s[i]
+            + table.over1s[i]
+        )
+
+    def test_request_stats_frozen(self):
+        controller = self.process.get_controller("MyMRI")
+        # The first subscribe freezes the attribute, the second reuses it
+        for _ in range(2):
+            subscribe = Subscribe(path=["MyMRI", "hostname"])
+            subscribe.set_callback(Mock())
+            controller.handle_request(subscribe).wait(1)
+        self.o.update_request_stats()
+        table = self.b.requestStats.value
+        i = table.mri.index("MyMRI")
+        assert table.frozenHits[i] == controller.frozen_hits > 0
+        assert table.frozenMisses[i] == controller.frozen_misses > 0
+
+    def test_request_stats_unchanged(self):
+        self.o.update_request_stats()
+        table = self.o.request_stats.value
+        ts = self.o.request_stats.timeStamp
+        # Nothing handled a request, so nothing to publish
+        self.o.update_request_stats()
+        assert self.o.request_stats.value is table
+        assert self.o.request_stats.timeStamp is ts
+
     def test_starts_ioc(self):
         if os.getenv("EPICS_BASE"):
             cothread.Sleep(5)
@@ -1,6 +1,8 @@
 import unittest
 
-from malcolm.core import Process
+from mock import patch
+
+from malcolm.core import BatchPut, Error, Process, Return
 from malcolm.modules.web.controllers import WebsocketClientComms
 
 
@@ -14,3 +16,33 @@ class TestWebsocketClientComms(unittest.TestCase):
         assert self.o.port == 8008
         assert self.o.connect_timeout == 10.0
         assert self.o.mri == "mri"
+
+    def respond_with(self, response):
+        # Instead of sending the request to the server, respond to it
+        # straight away
+        def call(func, request):
+            assert func == self.o._send_request
+            self.requests.append(request)
+            request.callback(response)
+
+        self.requests = []
+        patcher = patch(
+            "malcolm.modules.web.controllers.websocketclientcomms.IOLoopHelper.call",
+            call,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_send_batch_put(self):
+        self.respond_with(Return())
+        self.o.send_batch_put("block", dict(attr1=32, attr2="hello"))
+        assert len(self.requests) == 1
+        request = self.requests[0]
+        assert isinstance(request, BatchPut)
+        assert request.path == ["block"]
+        assert request.values == dict(attr1=32, attr2="hello")
+
+    def test_send_batch_put_error(self):
+        self.respond_with(Error(message=ValueError("Bad value")))
+        with self.assertRaises(ValueError):
+            self.o.send_batch_put("block", dict(attr1=32))
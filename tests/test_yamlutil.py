@@ -1,14 +1,20 @@
 import os
+import shutil
 import sys
+import tempfile
+import time
 import unittest
 
+import pytest
 from annotypes import Anno, Any, add_call_types
 from mock import ANY, Mock, mock_open, patch
 
+from malcolm.core import YamlError
 from malcolm.modules.builtin.controllers import BasicController
 from malcolm.modules.builtin.parts import StringPart
 from malcolm.yamlutil import (
     Section,
+    _yaml_cache_path,
     check_yaml_names,
     make_block_creator,
     make_include_creator,
@@ -63,9 +69,11 @@ class TestYamlUtil(unittest.TestCase):
             "malcolm.yamlutil.open", mock_open(read_data=include_yaml), create=True
         ) as m:
             include_creator = make_include_creator("/tmp/__init__.py", "include.yaml")
-        assert include_creator.__name__ == "include"
+            assert include_creator.__name__ == "include"
+            # The YAML is only read when the creator is first used
+            m.assert_not_called()
+            controllers, parts = include_creator()
         m.assert_called_once_with("/tmp/include.yaml")
-        controllers, parts = include_creator()
         assert len(controllers) == 0
         assert len(parts) == 1
         part = parts[0]
@@ -78,7 +86,9 @@ class TestYamlUtil(unittest.TestCase):
             "malcolm.yamlutil.open", mock_open(read_data=block_yaml), create=True
         ) as m:
             block_creator = make_block_creator("/tmp/__init__.py", "block.yaml")
-        assert block_creator.__name__ == "block"
+            assert block_creator.__name__ == "block"
+            m.assert_not_called()
+            assert list(block_creator.call_types) == ["something"]
         m.assert_called_once_with("/tmp/block.yaml")
         controllers = block_creator(something="blah")
         assert len(controllers) == 1
@@ -118,6 +128,23 @@ class TestYamlUtil(unittest.TestCase):
         mock_import.assert_called_once_with("malcolm.modules.mymodule.parts")
         assert result == (2, "my name", "thing")
 
+    @patch("importlib.import_module")
+    def test_instantiate_nested_block_bad_param(self, mock_import):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        inner_path = os.path.join(tmpdir, "inner.yaml")
+        with open(inner_path, "w") as f:
+            f.write(block_yaml)
+        mock_import.return_value = Mock(inner=make_block_creator(inner_path))
+        section = Section(
+            "/tmp/outer.yaml", 3, "mymodule.blocks.inner", dict(bad="param")
+        )
+        with self.assertRaises(YamlError) as cm:
+            section.instantiate({})
+        message = str(cm.exception)
+        assert "/tmp/outer.yaml:3:" in message
+        assert f"{inner_path}:1:" in message
+
     def test_split_into_sections(self):
         filename = "/tmp/yamltest.yaml"
         with open(filename, "w") as f:
@@ -142,6 +169,51 @@ class TestYamlUtil(unittest.TestCase):
         assert sections[0][2].name == "builtin.defines.docstring"
         assert sections[0][2].param_dict == dict(value="My special docstring")
 
+    def test_parsed_yaml_cached(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        filename = os.path.join(tmpdir, "cached.yaml")
+        with open(filename, "w") as f:
+            f.write(block_yaml)
+        # Make it look like it was written a while ago so its mtime is trusted
+        os.utime(filename, (time.time() - 10, time.time() - 10))
+        sections, _, _ = Section.from_yaml(filename)
+        assert os.path.isfile(_yaml_cache_path(filename))
+        with patch("malcolm.yamlutil._parse_yaml") as parse:
+            cached_sections, _, _ = Section.from_yaml(filename)
+        parse.assert_not_called()
+        assert repr(cached_sections) == repr(sections)
+        assert cached_sections[0].lineno == 2
+        # An edit to the file means it is parsed again
+        with open(filename, "w") as f:
+            f.write(include_yaml)
+        os.utime(filename, (time.time() - 5, time.time() - 5))
+        sections, _, _ = Section.from_yaml(filename)
+        assert [s.section for s in sections] == ["parameters", "parts"]
+
+    def test_parse_all_yaml_benchmark(self):
+        # Skip on GitHub Actions and GitLab CI
+        if "CI" in os.environ:
+            pytest.skip("performance test only")
+        import malcolm.modules
+
+        modules_dir = os.path.dirname(malcolm.modules.__file__)
+        yaml_paths = [
+            os.path.join(dirpath, f)
+            for dirpath, _, filenames in os.walk(modules_dir)
+            for f in filenames
+            if f.endswith(".yaml")
+        ]
+        # First pass fills the cache
+        for yaml_path in yaml_paths:
+            Section.from_yaml(yaml_path)
+        start = time.time()
+        for yaml_path in yaml_paths:
+            Section.from_yaml(yaml_path)
+        end = time.time()
+        # Parsing them all with ruamel takes about 0.1s, from cache is <0.01s
+        assert end - start < 0.05, f"Took {end - start:.3f}s"
+
     def test_substitute_params(self):
         section = Section(
             "f", 1, "module.parts.name", {"name": "$(name):pos", "exposure": 1.0}